@@ -1,3 +1,31 @@
 """skill-quiver: CLI tool for managing curated skill collections."""
 
 __version__ = "0.1.0"
+
+# Library API, imported lazily so the CLI starts without loading the engine
+_LAZY = {
+    "parse_manifest": "skill_quiver.manifest",
+    "sync_async": "skill_quiver.sync",
+    "sync_report": "skill_quiver.sync",
+    "SyncOptions": "skill_quiver.report",
+    "SyncReport": "skill_quiver.report",
+    "SourceReport": "skill_quiver.report",
+}
+
+__all__ = [
+    "__version__",
+    "parse_manifest",
+    "sync_async",
+    "sync_report",
+    "SyncOptions",
+    "SyncReport",
+    "SourceReport",
+]
+
+
+def __getattr__(name: str) -> object:
+    if name in _LAZY:
+        import importlib
+
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module 'skill_quiver' has no attribute {name!r}")
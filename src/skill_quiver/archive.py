@@ -0,0 +1,183 @@
+"""Seekable archive cache: uncompressed tarballs with a member-offset index."""
+
+import bisect
+import functools
+import gzip
+import hashlib
+import os
+import tarfile
+import tempfile
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from skill_quiver.errors import SyncError
+from skill_quiver.locking import write_atomic
+
+INDEX_VERSION = 2
+INDEX_SUFFIX = ".index.json"
+
+
+class ArchiveIndex(BaseModel):
+    """Byte ranges of the regular files in an uncompressed tarball.
+
+    Member names are stored without the archive's top-level directory
+    and sorted, so every file below a path is one contiguous range.
+    """
+
+    version: int = INDEX_VERSION
+    top: str
+    size: int
+    sha256: str
+    # (name, data offset, data size), sorted by name
+    members: list[tuple[str, int, int]]
+    # Names of members with the owner's execute bit set
+    executable: list[str] = []
+
+    @functools.cached_property
+    def names(self) -> list[str]:
+        return [name for name, _, _ in self.members]
+
+    @functools.cached_property
+    def executable_names(self) -> frozenset[str]:
+        return frozenset(self.executable)
+
+    def under(self, prefix: str) -> list[tuple[str, int, int]]:
+        """Members whose names start with prefix, e.g. ``"skills/pdf/"``."""
+        names = self.names
+        lo = bisect.bisect_left(names, prefix)
+        hi = lo
+        while hi < len(names) and names[hi].startswith(prefix):
+            hi += 1
+        return self.members[lo:hi]
+
+
+def index_path(archive: Path) -> Path:
+    """Path of the index stored next to a cached tarball."""
+    return archive.with_name(archive.name + INDEX_SUFFIX)
+
+
+def build_index(tar_path: Path, size: int, digest: str) -> ArchiveIndex:
+    """Scan an uncompressed tarball's headers for member offsets.
+
+    Only headers are read; file data is skipped by seeking.
+
+    Raises:
+        SyncError: If the tarball is malformed or empty.
+    """
+    members: list[tuple[str, int, int]] = []
+    executable: list[str] = []
+    top = ""
+    try:
+        with tarfile.open(tar_path, "r:") as tar:
+            for member in tar:
+                if not top:
+                    top = member.name.split("/")[0]
+                if not member.isfile():
+                    continue
+                _, _, rest = member.name.partition("/")
+                if rest:
+                    members.append((rest, member.offset_data, member.size))
+                    if member.mode & 0o100:
+                        executable.append(rest)
+    except tarfile.TarError as e:
+        raise SyncError(f"Cannot index archive {tar_path}: {e}") from e
+    if not top:
+        raise SyncError(f"Cannot index empty archive {tar_path}")
+    members.sort()
+    return ArchiveIndex(
+        top=top,
+        size=size,
+        sha256=digest,
+        members=members,
+        executable=sorted(executable),
+    )
+
+
+def store_gzip_tarball(gz_path: Path, archive: Path) -> ArchiveIndex:
+    """Decompress a .tar.gz into a seekable cached tarball plus its index.
+
+    Both files are written atomically, the index last, so an archive with
+    an index is always complete.
+
+    Raises:
+        SyncError: If the download is not a valid gzip tarball.
+    """
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=archive.parent, prefix=".tmp-")
+    tmp = Path(tmp_name)
+    try:
+        hasher = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, "wb") as out, gzip.open(gz_path, "rb") as src:
+            while chunk := src.read(1 << 20):
+                hasher.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        index = build_index(tmp, size, hasher.hexdigest())
+        os.replace(tmp, archive)
+    except (OSError, EOFError) as e:
+        tmp.unlink(missing_ok=True)
+        raise SyncError(f"Downloaded archive is corrupt: {e}") from e
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    write_atomic(index_path(archive), index.model_dump_json())
+    return index
+
+
+@functools.lru_cache(maxsize=16)
+def _load_index(path: Path, mtime_ns: int) -> ArchiveIndex | None:
+    try:
+        index = ArchiveIndex.model_validate_json(path.read_bytes())
+    except (OSError, ValidationError):
+        return None
+    return index if index.version == INDEX_VERSION else None
+
+
+def load_index(archive: Path) -> ArchiveIndex | None:
+    """Return a cached tarball's index, or None if it is missing or stale.
+
+    Parsed indexes are memoized, so extracting several sources from one
+    archive parses its index once.
+    """
+    path = index_path(archive)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    return _load_index(path, mtime_ns)
+
+
+def is_cached(archive: Path) -> bool:
+    """Whether a tarball and a readable index for it are both present."""
+    return archive.is_file() and load_index(archive) is not None
+
+
+def verify_archive(archive: Path) -> bool:
+    """Check a cached tarball against the size and digest in its index."""
+    index = load_index(archive)
+    if index is None:
+        return False
+    try:
+        if archive.stat().st_size != index.size:
+            return False
+        with open(archive, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest() == index.sha256
+    except OSError:
+        return False
+
+
+def remove_archive(archive: Path) -> None:
+    """Delete a cached tarball and its index."""
+    archive.unlink(missing_ok=True)
+    index_path(archive).unlink(missing_ok=True)
+
+
+def read_range(fd: int, offset: int, size: int) -> bytes:
+    """Read size bytes at offset from an open file descriptor."""
+    data = os.pread(fd, size, offset)
+    if len(data) != size:
+        raise SyncError("Cached archive is truncated")
+    return data
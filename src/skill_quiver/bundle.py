@@ -0,0 +1,335 @@
+"""Portable bundles: everything a manifest needs, installable offline."""
+
+import contextlib
+import hashlib
+import io
+import os
+import tarfile
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO
+
+from pydantic import BaseModel, ValidationError
+
+from skill_quiver.cache import blob_store, enforce_budget
+from skill_quiver.catalog import recording, update_catalog
+from skill_quiver.errors import SyncError
+from skill_quiver.locking import project_lock
+from skill_quiver.manifest import Manifest, Source, check_expanded_skills
+from skill_quiver.sync import (
+    _is_forge,
+    _make_client,
+    _matches_any,
+    describe_pending,
+    expand_source,
+    extract_tarball,
+    find_stale_skills,
+    forge_archive,
+    generate_license_file,
+    record_provenance,
+    remove_skills,
+    resolve_source_sha,
+    skill_repo_path,
+    sparse_checkout,
+)
+
+BUNDLE_VERSION = 1
+BUNDLE_INDEX = "bundle.json"
+
+
+class BundleSource(BaseModel):
+    """A manifest source as resolved when the bundle was written."""
+
+    name: str
+    repo: str
+    path: str
+    ref: str
+    sha: str
+    skills: list[str]
+    archive: str
+
+
+class BundleIndex(BaseModel):
+    """Contents of bundle.json, the first member of every bundle."""
+
+    version: int = BUNDLE_VERSION
+    created: datetime
+    sources: list[BundleSource]
+    # Archive member name -> SHA-256 of its bytes
+    archives: dict[str, str]
+
+
+def _archive_member(repo: str, sha: str) -> str:
+    """Bundle member name for the archive of repo at sha."""
+    repo_key = hashlib.sha256(repo.encode()).hexdigest()[:16]
+    return f"archives/{repo_key}-{sha}.tar"
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _pack_checkout(sources: list[Source], work_dir: Path) -> Path:
+    """Sparse-checkout a git repository and pack the skills as a tarball.
+
+    The tarball has the same shape as a GitHub archive (one top-level
+    directory), so it extracts with ``extract_tarball``.
+    """
+    first = sources[0]
+    sparse_paths = sorted(
+        {
+            skill_repo_path(source, skill_name)
+            for source in sources
+            for skill_name in source.skills
+        }
+    )
+    repo_dir = sparse_checkout(first, sparse_paths, work_dir)
+    packed = work_dir / "checkout.tar"
+    with tarfile.open(packed, "w") as tar:
+        for sparse_path in sparse_paths:
+            if (repo_dir / sparse_path).is_dir():
+                tar.add(repo_dir / sparse_path, arcname=f"repo/{sparse_path}")
+    return packed
+
+
+def write_bundle(manifest: Manifest, out: Path) -> BundleIndex:
+    """Resolve a manifest and pack every archive it needs into one tar.
+
+    The bundle is an uncompressed tar holding ``bundle.json`` followed by
+    one tarball per distinct (repo, SHA). Forge archives come from the
+    quiv cache. Git sources are sparse-checked out and packed.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        out: Bundle file to write. Replaced atomically.
+
+    Returns:
+        The bundle index that was written.
+
+    Raises:
+        ManifestError: If two sources provide the same skill.
+        SyncError: If resolving or downloading fails.
+    """
+    groups: dict[tuple[str, str], list[Source]] = {}
+    entries: list[BundleSource] = []
+
+    with _make_client() as client, tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        for source in manifest.sources:
+            sha = resolve_source_sha(client, source)
+            source = expand_source(client, source, sha)
+            groups.setdefault((str(source.repo), sha), []).append(source)
+            entries.append(
+                BundleSource(
+                    name=source.name,
+                    repo=str(source.repo),
+                    path=source.path,
+                    ref=source.ref,
+                    sha=sha,
+                    skills=source.skills,
+                    archive=_archive_member(str(source.repo), sha),
+                )
+            )
+        check_expanded_skills([s for sources in groups.values() for s in sources])
+
+        archives: dict[str, Path] = {}
+        for i, ((repo, sha), sources) in enumerate(groups.items()):
+            print(f"Fetching {repo} at {sha[:8]}...")
+            if _is_forge(sources[0]):
+                path = forge_archive(client, sources[0], sha)
+            else:
+                work_dir = tmp_dir / str(i)
+                work_dir.mkdir()
+                path = _pack_checkout(sources, work_dir)
+            archives[_archive_member(repo, sha)] = path
+
+        index = BundleIndex(
+            created=datetime.now(timezone.utc),
+            sources=entries,
+            archives={member: _file_digest(path) for member, path in archives.items()},
+        )
+
+        out.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=out.parent, prefix=f".tmp-{out.name}-")
+        os.close(fd)
+        try:
+            with tarfile.open(tmp_name, "w") as tar:
+                data = index.model_dump_json(indent=2).encode()
+                info = tarfile.TarInfo(BUNDLE_INDEX)
+                info.size = len(data)
+                info.mtime = int(index.created.timestamp())
+                tar.addfile(info, io.BytesIO(data))
+                for member, path in archives.items():
+                    tar.add(path, arcname=member)
+            os.replace(tmp_name, out)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    print(f"Wrote {out} ({len(entries)} source(s), {len(archives)} archive(s))")
+    return index
+
+
+class Bundle:
+    """A bundle opened for reading in place.
+
+    Archives are read straight out of the uncompressed outer tar, so
+    nothing is unpacked to disk besides the skills themselves. Each
+    archive's digest is checked the first time it is used.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            self._tar = tarfile.open(path, "r:")
+        except (OSError, tarfile.TarError) as e:
+            raise SyncError(f"Cannot open bundle {path}: {e}") from e
+        self._verified: set[str] = set()
+        try:
+            self.index = self._read_index()
+        except SyncError:
+            self._tar.close()
+            raise
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._tar.close()
+
+    def _member(self, name: str) -> IO[bytes]:
+        try:
+            f = self._tar.extractfile(name)
+        except KeyError:
+            f = None
+        if f is None:
+            raise SyncError(f"Bundle {self.path} has no member {name}")
+        return f
+
+    def _read_index(self) -> BundleIndex:
+        try:
+            index = BundleIndex.model_validate_json(self._member(BUNDLE_INDEX).read())
+        except ValidationError as e:
+            raise SyncError(f"Invalid {BUNDLE_INDEX} in {self.path}: {e}") from e
+        if index.version != BUNDLE_VERSION:
+            raise SyncError(
+                f"Unsupported bundle version {index.version} in {self.path}"
+            )
+        return index
+
+    def entry_for(self, source: Source) -> BundleSource:
+        """Find the bundled resolution of a manifest source.
+
+        Raises:
+            SyncError: If the bundle was not written for this source.
+        """
+        for entry in self.index.sources:
+            if (
+                entry.name == source.name
+                and entry.repo == str(source.repo)
+                and entry.path == source.path
+                and entry.ref == source.ref
+            ):
+                return entry
+        raise SyncError(
+            f"Bundle {self.path} has no entry for {source.name} "
+            f"({source.repo}@{source.ref}); re-run 'quiv fetch --bundle'"
+        )
+
+    def archive(self, member: str) -> IO[bytes]:
+        """Open an archive member, verifying its digest on first use.
+
+        Raises:
+            SyncError: If the member is missing or corrupt.
+        """
+        expected = self.index.archives.get(member)
+        if expected is None:
+            raise SyncError(f"Bundle {self.path} does not list archive {member}")
+        f = self._member(member)
+        if member not in self._verified:
+            actual = hashlib.file_digest(f, "sha256").hexdigest()
+            if actual != expected:
+                raise SyncError(f"Archive {member} in {self.path} is corrupt")
+            self._verified.add(member)
+            f.seek(0)
+        return f
+
+
+def bundled_source(source: Source, entry: BundleSource) -> Source:
+    """Narrow a manifest source to the concrete skills recorded in a bundle.
+
+    Raises:
+        SyncError: If the source lists skills the bundle does not carry.
+    """
+    if source.is_wildcard:
+        names = entry.skills
+    else:
+        missing = [s for s in source.skills if s not in entry.skills]
+        if missing:
+            raise SyncError(
+                f"Bundle has no {', '.join(missing)} for {source.name}; "
+                "re-run 'quiv fetch --bundle'"
+            )
+        names = source.skills
+    if source.only_skills:
+        names = [n for n in names if _matches_any(n, source.only_skills)]
+    return source.model_copy(
+        update={"skills": names, "exclude_skills": [], "only_skills": []}
+    )
+
+
+def sync_from_bundle(
+    manifest: Manifest,
+    bundle_path: Path,
+    dry_run: bool = False,
+    sources: list[Source] | None = None,
+) -> None:
+    """Make skills/ match the manifest using only a bundle, with no network.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        bundle_path: Bundle written by ``quiv fetch --bundle``.
+        dry_run: If True, report what would change without writing files.
+        sources: Sync only these sources (see ``select_sources``).
+
+    Raises:
+        SyncError: If the bundle is unreadable, corrupt, or out of date.
+    """
+    if sources is None:
+        sources = manifest.sources
+    skills_dir = manifest.root / "skills"
+
+    store = blob_store()
+    writing = contextlib.nullcontext() if dry_run else project_lock(manifest.root)
+
+    with writing, recording() as recorder, Bundle(bundle_path) as bundle:
+        for source in sources:
+            entry = bundle.entry_for(source)
+            source = bundled_source(source, entry)
+            stale_skills = find_stale_skills(source, entry.sha, skills_dir)
+
+            if not stale_skills:
+                print(f"{source.name}: up to date")
+                continue
+
+            if dry_run:
+                print(describe_pending(source, entry.sha, stale_skills, skills_dir))
+                continue
+
+            remove_skills(skills_dir, stale_skills)
+            print(f"Syncing {source.name}...")
+            extracted = extract_tarball(
+                bundle.archive(entry.archive), source, skills_dir, store
+            )
+            for skill_name in record_provenance(source, entry.sha, extracted):
+                print(f"  {skill_name}")
+
+        if not dry_run:
+            generate_license_file(manifest, manifest.root)
+            update_catalog(skills_dir, recorder.take(skills_dir))
+            enforce_budget(skills_dir)
@@ -0,0 +1,598 @@
+"""On-disk quiv cache: blob store, archives, listings, and LRU bookkeeping."""
+
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from skill_quiver.archive import index_path
+from skill_quiver.errors import QuivError, SyncError
+from skill_quiver.locking import locked, try_locked, write_atomic
+from skill_quiver.provenance import read_provenance
+
+# Linux ioctl request number for FICLONE (reflink a whole file).
+FICLONE = 0x40049409
+
+LINK_MODES = ("auto", "hardlink", "copy")
+
+INDEX_FILENAME = "index.log"
+
+# Flush buffered access records once this many are pending.
+INDEX_FLUSH_THRESHOLD = 512
+
+SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def cache_dir() -> Path:
+    """Return the root of the quiv cache.
+
+    Honours ``QUIV_CACHE_DIR``, then ``XDG_CACHE_HOME``, then ``~/.cache``.
+    """
+    override = os.environ.get("QUIV_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "quiv"
+
+
+def _link_mode() -> str:
+    """Return the configured materialization mode from ``QUIV_LINK_MODE``."""
+    mode = os.environ.get("QUIV_LINK_MODE", "auto")
+    if mode not in LINK_MODES:
+        raise SyncError(
+            f"Invalid QUIV_LINK_MODE '{mode}': expected one of {', '.join(LINK_MODES)}"
+        )
+    return mode
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    """Clone src to dest with FICLONE. Returns False if unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _hardlink(src: Path, dest: Path) -> bool:
+    """Hardlink dest to src. Returns False if not possible (e.g. across devices)."""
+    try:
+        os.link(src, dest)
+    except OSError:
+        return False
+    return True
+
+
+def _write_new(dest: str | Path, data: bytes, executable: bool) -> None:
+    """Write data to a new file at dest, replacing any file already there.
+
+    The existing file is unlinked rather than truncated, since it may be
+    hardlinked to a blob.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    perms = 0o777 if executable else 0o666
+    try:
+        fd = os.open(dest, flags, perms)
+    except FileExistsError:
+        os.unlink(dest)
+        fd = os.open(dest, flags, perms)
+    with open(fd, "wb") as f:
+        f.write(data)
+
+
+class BlobStore:
+    """Content-addressed file store keyed by SHA-256.
+
+    Blobs are immutable and read-only once written. Files in ``skills/``
+    are materialized from the store as reflinks where the filesystem
+    supports them, so identical files across skills and projects share
+    one copy on disk. Where it does not, or with ``QUIV_LINK_MODE=copy``,
+    files are written directly and the store is skipped, since a copy
+    would only write every file twice. ``QUIV_LINK_MODE=hardlink`` links
+    files to their blobs instead: they share one copy on any filesystem
+    but are read-only, for consumers that never edit vendored skills.
+    """
+
+    def __init__(self, root: Path, index: "CacheIndex | None" = None) -> None:
+        self.root = root
+        self.index = index
+        self._can_reflink = True
+
+    def path(self, digest: str) -> Path:
+        """Return the on-disk path for a blob digest."""
+        return self.root / digest[:2] / digest[2:]
+
+    def put_bytes(self, data: bytes) -> str:
+        """Store bytes and return their digest. No-op if already stored."""
+        digest = hashlib.sha256(data).hexdigest()
+        self._put(digest, data)
+        return digest
+
+    def put_file(self, src: Path) -> str:
+        """Store the contents of a file and return their digest."""
+        return self.put_bytes(src.read_bytes())
+
+    def place_bytes(
+        self, data: bytes, dest: str | Path, executable: bool = False
+    ) -> str:
+        """Write bytes at dest through the store, returning their digest.
+
+        If the file would be a copy of its blob anyway, it is written
+        directly and nothing is stored. Callers hold ``in_use`` so that
+        another process's ``prune`` cannot delete the blob between storing
+        and materializing it.
+
+        Raises:
+            SyncError: If the blob or dest cannot be written.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        mode = _link_mode()
+        if mode == "copy" or (mode == "auto" and not self._can_reflink):
+            try:
+                _write_new(dest, data, executable)
+            except OSError as e:
+                raise SyncError(f"Cannot write {dest}: {e}") from e
+            return digest
+        self._put(digest, data)
+        self.materialize(digest, Path(dest), executable)
+        return digest
+
+    def in_use(self) -> contextlib.AbstractContextManager[None]:
+        """Shared lock on the whole store, held for the length of an extraction.
+
+        Eviction only removes blobs while this lock is free, so blobs are
+        never deleted under a running extraction. One lock per extraction
+        keeps locking out of the per-file path.
+        """
+        lock = lock_path(self.root, self.root.parent)
+        return locked(lock, "the blob store", shared=True)
+
+    def _put(self, digest: str, data: bytes) -> None:
+        blob = self.path(digest)
+        if not blob.exists():
+            self._write_atomic(blob, data)
+        if self.index is not None:
+            self.index.record(self.index.key_for(blob), len(data))
+
+    def materialize(self, digest: str, dest: Path, executable: bool = False) -> None:
+        """Place a blob at dest as a reflink or hardlink if possible, else a copy.
+
+        Reflinks and copies get the default mode for new files, plus
+        execute bits where they are readable if executable is set.
+        Hardlinks share the blob's read-only mode, so executable files are
+        always copied.
+
+        Args:
+            digest: Digest of a blob already in the store.
+            dest: Destination file path. Its parent must exist.
+            executable: Whether the file should be executable.
+
+        Raises:
+            SyncError: If the blob is missing or cannot be written.
+        """
+        blob = self.path(digest)
+        dest.unlink(missing_ok=True)
+        mode = _link_mode()
+
+        try:
+            linked = False
+            if mode == "auto" and self._can_reflink:
+                linked = _reflink(blob, dest)
+                self._can_reflink = linked
+            elif mode == "hardlink" and not executable:
+                linked = _hardlink(blob, dest)
+            if not linked:
+                # Copies data only; the blob's read-only mode is not copied
+                shutil.copyfile(blob, dest)
+            if executable:
+                current = os.stat(dest).st_mode
+                os.chmod(dest, current | (current & 0o444) >> 2)
+        except OSError as e:
+            raise SyncError(f"Cannot materialize {dest}: {e}") from e
+
+    def _write_atomic(self, blob: Path, data: bytes) -> None:
+        """Write a blob via a temp file and rename it into place."""
+        try:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=blob.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.chmod(tmp_name, 0o444)
+                os.replace(tmp_name, blob)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            raise SyncError(f"Cannot write to blob store {self.root}: {e}") from e
+
+
+class CacheIndex:
+    """Append-only access log for LRU bookkeeping of cache entries.
+
+    Each line of ``index.log`` is ``<atime> <size> <key>``, or
+    ``<atime> - <key>`` for a removal, where key is the entry's path
+    relative to the cache root. Records are buffered and appended in one
+    write. Loading folds the log into one record per key, so bookkeeping
+    is O(entries) and never reads entry contents. Git mirrors are
+    directories and count as a single entry.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.path = root / INDEX_FILENAME
+        self._pending: list[str] = []
+        self._lock = threading.Lock()
+
+    def key_for(self, path: Path) -> str:
+        """Index key for a path inside the cache."""
+        return path.relative_to(self.root).as_posix()
+
+    def record(self, key: str, size: int) -> None:
+        """Note that an entry was written or read."""
+        with self._lock:
+            self._pending.append(f"{time.time():.3f} {size} {key}\n")
+            full = len(self._pending) >= INDEX_FLUSH_THRESHOLD
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered records to the log. Failures are ignored."""
+        with self._lock:
+            if not self._pending:
+                return
+            lines = "".join(self._pending)
+            self._pending.clear()
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            pass
+
+    def entries(self) -> dict[str, tuple[float, int]]:
+        """Fold the log into ``{key: (atime, size)}``.
+
+        If there is no log yet, it is rebuilt from file metadata (stat
+        only) so caches that predate the index are still accounted for.
+        """
+        self.flush()
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            entries = self._scan()
+            self._rewrite(entries)
+            return entries
+        except OSError as e:
+            raise QuivError(f"Cannot read cache index {self.path}: {e}") from e
+
+        entries: dict[str, tuple[float, int]] = {}
+        for line in lines:
+            parts = line.split(" ", 2)
+            if len(parts) != 3:
+                continue
+            atime_str, size_str, key = parts
+            try:
+                atime = float(atime_str)
+            except ValueError:
+                continue
+            if size_str == "-":
+                entries.pop(key, None)
+            elif size_str.isdigit():
+                entries[key] = (atime, int(size_str))
+        if len(lines) > 2 * len(entries) + INDEX_FLUSH_THRESHOLD:
+            self._rewrite(entries)
+        return entries
+
+    def prune(
+        self,
+        max_size: int | None = None,
+        older_than: float | None = None,
+        pinned: frozenset[str] = frozenset(),
+    ) -> tuple[int, int]:
+        """Evict entries least recently used first.
+
+        Args:
+            max_size: Evict until the cache totals at most this many bytes.
+            older_than: Evict entries not accessed for this many seconds.
+            pinned: Keys that are never evicted.
+
+        Returns:
+            Tuple of (entries removed, bytes freed).
+        """
+        entries = self.entries()
+        candidates = sorted(
+            (atime, key) for key, (atime, _) in entries.items() if key not in pinned
+        )
+        total = sum(size for _, size in entries.values())
+
+        doomed: list[str] = []
+        if older_than is not None:
+            cutoff = time.time() - older_than
+            for atime, key in candidates:
+                if atime < cutoff:
+                    doomed.append(key)
+                    total -= entries[key][1]
+        if max_size is not None:
+            already = set(doomed)
+            for _, key in candidates:
+                if total <= max_size:
+                    break
+                if key not in already:
+                    doomed.append(key)
+                    total -= entries[key][1]
+
+        freed = 0
+        removed = 0
+        for key in doomed:
+            path = self.root / key
+            with try_locked(lock_path(path, self.root)) as free:
+                if not free:
+                    # Being written by another process right now
+                    continue
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+            freed += entries.pop(key)[1]
+            removed += 1
+        if removed:
+            self._rewrite(entries)
+        return removed, freed
+
+    def _scan(self) -> dict[str, tuple[float, int]]:
+        """Build entries from file metadata under the cache root."""
+        entries: dict[str, tuple[float, int]] = {}
+        if not self.root.is_dir():
+            return entries
+        mirrors = self.root / "mirrors"
+        if mirrors.is_dir():
+            for mirror in mirrors.iterdir():
+                if mirror.is_dir() and not mirror.name.startswith(".tmp-"):
+                    entries[self.key_for(mirror)] = (
+                        mirror.stat().st_mtime,
+                        tree_size(mirror),
+                    )
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            if Path(dirpath) == self.root:
+                dirnames[:] = [
+                    d
+                    for d in dirnames
+                    if d not in ("mirrors", "locks", "stamps", "history")
+                ]
+            for name in filenames:
+                path = Path(dirpath) / name
+                if path == self.path or name.startswith(".tmp-"):
+                    continue
+                st = path.stat()
+                entries[self.key_for(path)] = (st.st_mtime, st.st_size)
+        return entries
+
+    def _rewrite(self, entries: dict[str, tuple[float, int]]) -> None:
+        """Replace the log with one line per live entry."""
+        try:
+            write_atomic(
+                self.path,
+                "".join(
+                    f"{atime:.3f} {size} {key}\n"
+                    for key, (atime, size) in entries.items()
+                ),
+            )
+        except OSError:
+            pass
+
+
+_indexes: dict[Path, CacheIndex] = {}
+
+
+def cache_index() -> CacheIndex:
+    """Return the process-wide index for the current cache root."""
+    root = cache_dir()
+    index = _indexes.get(root)
+    if index is None:
+        index = _indexes[root] = CacheIndex(root)
+    return index
+
+
+@atexit.register
+def _flush_indexes() -> None:
+    for index in _indexes.values():
+        index.flush()
+
+
+def blob_store() -> BlobStore:
+    """Return the blob store under the quiv cache."""
+    return BlobStore(cache_dir() / "blobs", cache_index())
+
+
+def tree_size(root: Path) -> int:
+    """Total size of the files below a directory, from metadata only."""
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            total += os.lstat(os.path.join(dirpath, name)).st_size
+    return total
+
+
+def mirror_path(repo: str) -> Path:
+    """Cache path for the bare git mirror of repo."""
+    repo_key = hashlib.sha256(repo.encode()).hexdigest()[:16]
+    return cache_dir() / "mirrors" / f"{repo_key}.git"
+
+
+def lock_path(entry: Path, root: Path | None = None) -> Path:
+    """Lock file guarding a cache entry (an archive, a mirror, ...).
+
+    Locks live under ``locks/`` rather than next to their entry, so
+    eviction and size accounting never see them. Every blob shares the
+    lock of the whole store (see ``BlobStore.in_use``).
+
+    Args:
+        entry: Path of the entry inside the cache.
+        root: Cache root (default: ``cache_dir()``).
+    """
+    if root is None:
+        root = cache_dir()
+    rel_path = entry.relative_to(root)
+    if rel_path.parts[:1] == ("blobs",):
+        rel_path = Path("blobs")
+    key = hashlib.sha256(rel_path.as_posix().encode()).hexdigest()
+    return root / "locks" / f"{key[:32]}.lock"
+
+
+def archive_path(repo: str, sha: str) -> Path:
+    """Cache path for the tarball of repo at sha."""
+    repo_key = hashlib.sha256(repo.encode()).hexdigest()[:16]
+    return cache_dir() / "archives" / repo_key / f"{sha}.tar"
+
+
+def pinned_keys(skills_dir: Path) -> frozenset[str]:
+    """Index keys of archives and mirrors a project's provenance points at.
+
+    These are kept by eviction so the project can always be re-extracted
+    without a download.
+    """
+    if not skills_dir.is_dir():
+        return frozenset()
+    index = cache_index()
+    keys: set[str] = set()
+    for skill_dir in skills_dir.iterdir():
+        if not skill_dir.is_dir():
+            continue
+        try:
+            prov = read_provenance(skill_dir)
+        except SyncError:
+            continue
+        if prov is not None:
+            archive = archive_path(prov.repo, prov.sha)
+            keys.add(index.key_for(archive))
+            keys.add(index.key_for(index_path(archive)))
+            keys.add(index.key_for(mirror_path(prov.repo)))
+    return frozenset(keys)
+
+
+def parse_size(text: str) -> int:
+    """Parse a size like ``500M``, ``2G``, or ``1.5GB`` into bytes.
+
+    Raises:
+        QuivError: If the size is malformed.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*", text.lower())
+    if match is None:
+        raise QuivError(f"Invalid size '{text}': expected e.g. 500M or 2G")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_duration(text: str) -> float:
+    """Parse a duration like ``30d``, ``12h``, or ``90m`` into seconds.
+
+    Raises:
+        QuivError: If the duration is malformed.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*", text.lower())
+    if match is None:
+        raise QuivError(f"Invalid duration '{text}': expected e.g. 30d or 12h")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for humans."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def enforce_budget(*skills_dirs: Path) -> tuple[int, int]:
+    """Evict LRU entries if the cache exceeds ``QUIV_CACHE_MAX_SIZE``.
+
+    Args:
+        skills_dirs: skills/ directories whose provenance pins archives.
+
+    Returns:
+        Tuple of (entries removed, bytes freed).
+    """
+    index = cache_index()
+    index.flush()
+    budget_text = os.environ.get("QUIV_CACHE_MAX_SIZE")
+    if not budget_text:
+        return 0, 0
+    budget = parse_size(budget_text)
+    entries = index.entries()
+    if sum(size for _, size in entries.values()) <= budget:
+        return 0, 0
+    pinned = frozenset().union(*(pinned_keys(d) for d in skills_dirs))
+    return index.prune(max_size=budget, pinned=pinned)
+
+
+def cache_stats() -> dict[str, tuple[int, int]]:
+    """Summarize the cache as ``{kind: (entries, bytes)}``."""
+    stats: dict[str, tuple[int, int]] = {}
+    for key, (_, size) in cache_index().entries().items():
+        kind = key.split("/", 1)[0]
+        count, total = stats.get(kind, (0, 0))
+        stats[kind] = (count + 1, total + size)
+    return stats
+
+
+def clear_cache() -> None:
+    """Delete the whole quiv cache."""
+    root = cache_dir()
+    _indexes.pop(root, None)
+    if root.exists():
+        shutil.rmtree(root)
+
+
+def _listing_path(repo: str, sha: str, path: str) -> Path:
+    """Cache path for the skill listing of repo/path at sha."""
+    key = hashlib.sha256(f"{repo}\0{sha}\0{path}".encode()).hexdigest()
+    return cache_dir() / "listings" / f"{key}.json"
+
+
+def read_listing(repo: str, sha: str, path: str) -> list[str] | None:
+    """Return the cached skill names under repo/path at sha, if any."""
+    listing = _listing_path(repo, sha, path)
+    try:
+        content = listing.read_text(encoding="utf-8")
+        data = json.loads(content)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, list) or not all(isinstance(n, str) for n in data):
+        return None
+    index = cache_index()
+    index.record(index.key_for(listing), len(content))
+    return data
+
+
+def write_listing(repo: str, sha: str, path: str, names: list[str]) -> None:
+    """Record the skill names under repo/path at sha.
+
+    Listings are keyed by commit, so they never go stale. Failures to
+    write are ignored; the listing is simply fetched again next time.
+    """
+    target = _listing_path(repo, sha, path)
+    content = json.dumps(names)
+    try:
+        write_atomic(target, content)
+    except OSError:
+        return
+    index = cache_index()
+    index.record(index.key_for(target), len(content))
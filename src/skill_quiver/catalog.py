@@ -0,0 +1,335 @@
+"""Skill catalog: ``skills/index.json``, one file describing every skill.
+
+Consumers that would otherwise walk ``skills/`` and parse each SKILL.md
+can load the catalog instead. It lists each skill's SKILL.md frontmatter,
+its files, and a Merkle hash over them.
+
+Entries come from the writer stage: while ``recording`` is active, every
+``SkillWriter`` reports the files it wrote, with the blob digests it
+already computed, and the SKILL.md it saw. ``update_catalog`` then
+replaces just those entries. Skills it has no entry for (e.g. synced
+before the catalog existed) are read from disk once.
+
+Alongside the catalog, the size and mtime each file had when its digest
+was taken are kept as stamps in the quiv cache. They are local to this
+checkout, and let ``quiv status`` skip re-reading files nobody touched
+(see ``skill_quiver.status``).
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterator, Mapping
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import yaml
+from pydantic import BaseModel, ValidationError
+
+from skill_quiver.cache import cache_dir
+from skill_quiver.locking import write_atomic
+from skill_quiver.provenance import PROVENANCE_FILENAME
+
+CATALOG_FILENAME = "index.json"
+CATALOG_VERSION = 1
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class CatalogEntry(BaseModel):
+    """One skill as listed in the catalog."""
+
+    # Skill directory name
+    name: str
+    # Frontmatter description, or "" if it has none
+    description: str = ""
+    # Every SKILL.md frontmatter field, as parsed
+    frontmatter: dict[str, Any] = {}
+    # Merkle hash over the skill's file paths and contents (see tree_hash)
+    hash: str
+    # Files relative to the skill directory, sorted
+    files: list[str]
+
+
+class Catalog(BaseModel):
+    """Contents of ``skills/index.json``."""
+
+    version: int = CATALOG_VERSION
+    skills: dict[str, CatalogEntry] = {}
+
+
+class FileStamp(NamedTuple):
+    """A file's SHA-256, with the size and mtime it had when hashed."""
+
+    digest: str
+    size: int
+    mtime_ns: int
+
+
+class SkillStamps(BaseModel):
+    """Stamps of one skill's files, valid while its catalog hash is."""
+
+    hash: str
+    files: dict[str, FileStamp]
+
+
+class Stamps(BaseModel):
+    """Local stamps for every skill of one skills/ directory."""
+
+    skills: dict[str, SkillStamps] = {}
+
+
+class RecordedSkill(NamedTuple):
+    """A skill's catalog entry, and its file stamps if they are known."""
+
+    entry: CatalogEntry
+    stamps: SkillStamps | None
+
+
+def catalog_path(skills_dir: Path) -> Path:
+    """Where the catalog of a skills/ directory is kept."""
+    return skills_dir / CATALOG_FILENAME
+
+
+def read_catalog(skills_dir: Path) -> Catalog | None:
+    """Load the catalog, or None if it is missing or unreadable."""
+    try:
+        catalog = Catalog.model_validate_json(catalog_path(skills_dir).read_bytes())
+    except (OSError, ValidationError):
+        return None
+    return catalog if catalog.version == CATALOG_VERSION else None
+
+
+def parse_frontmatter(data: bytes) -> dict[str, Any]:
+    """Parse the YAML frontmatter at the top of a SKILL.md.
+
+    Returns an empty dict if there is none or it is not a YAML mapping;
+    a malformed upstream SKILL.md never fails a sync.
+    """
+    text = data.decode("utf-8", errors="replace").lstrip("\ufeff")
+    lines = text.splitlines()
+    if not lines or lines[0].rstrip() != "---":
+        return {}
+    for end, line in enumerate(lines[1:], start=1):
+        if line.rstrip() in ("---", "..."):
+            break
+    else:
+        return {}
+    try:
+        fields = yaml.load("\n".join(lines[1:end]), Loader=_Loader)
+    except yaml.YAMLError:
+        return {}
+    if not isinstance(fields, dict):
+        return {}
+    # Keys must be strings in JSON; values like dates become strings too
+    return json.loads(json.dumps({str(k): v for k, v in fields.items()}, default=str))
+
+
+def _node_hash(node: dict[str, Any]) -> str:
+    h = hashlib.sha256()
+    for name in sorted(node):
+        child = node[name]
+        if isinstance(child, dict):
+            h.update(f"tree {_node_hash(child)} {name}\n".encode())
+        else:
+            h.update(f"blob {child} {name}\n".encode())
+    return h.hexdigest()
+
+
+def tree_hash(files: Mapping[str, str]) -> str:
+    """Merkle hash of a skill from its files' relative paths and digests.
+
+    As in a git tree, each directory hashes the sorted names and hashes of
+    its entries, so any change to a file changes every hash above it.
+    """
+    root: dict[str, Any] = {}
+    for rel_path, digest in files.items():
+        *dirs, name = rel_path.split("/")
+        node = root
+        for part in dirs:
+            node = node.setdefault(part, {})
+        node[name] = digest
+    return _node_hash(root)
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def walk_skill(skill_dir: Path) -> dict[str, os.stat_result]:
+    """Stat every file of a skill, keyed by path relative to the skill.
+
+    The skill's provenance file is left out: it is not skill content.
+    """
+    found: dict[str, os.stat_result] = {}
+    pending = [(skill_dir, "")]
+    while pending:
+        directory, prefix = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                rel_path = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((Path(entry.path), rel_path + "/"))
+                elif entry.is_file(follow_symlinks=False):
+                    if rel_path != PROVENANCE_FILENAME:
+                        found[rel_path] = entry.stat(follow_symlinks=False)
+    return found
+
+
+def record_skill(
+    name: str, files: Mapping[str, FileStamp], skill_md: bytes | None
+) -> RecordedSkill:
+    """Build a skill's catalog entry and stamps from its files and SKILL.md."""
+    frontmatter = parse_frontmatter(skill_md) if skill_md is not None else {}
+    description = frontmatter.get("description")
+    digest = tree_hash({rel_path: stamp.digest for rel_path, stamp in files.items()})
+    entry = CatalogEntry(
+        name=name,
+        description=description if isinstance(description, str) else "",
+        frontmatter=frontmatter,
+        hash=digest,
+        files=sorted(files),
+    )
+    return RecordedSkill(entry, SkillStamps(hash=digest, files=dict(files)))
+
+
+def scan_skill(skill_dir: Path) -> RecordedSkill:
+    """Record a skill by reading its directory from disk."""
+    files = {
+        rel_path: FileStamp(hash_file(skill_dir / rel_path), st.st_size, st.st_mtime_ns)
+        for rel_path, st in walk_skill(skill_dir).items()
+    }
+    skill_md = skill_dir / "SKILL.md"
+    return record_skill(
+        skill_dir.name, files, skill_md.read_bytes() if skill_md.is_file() else None
+    )
+
+
+def skill_names(skills_dir: Path) -> set[str]:
+    """Names of the skill directories under skills/."""
+    return {
+        p.name
+        for p in skills_dir.iterdir()
+        if p.is_dir() and not p.name.startswith(".")
+    }
+
+
+def stamps_path(skills_dir: Path) -> Path:
+    """Where the stamps of a skills/ directory are kept in the cache."""
+    key = hashlib.sha256(str(skills_dir.resolve()).encode()).hexdigest()
+    return cache_dir() / "stamps" / f"{key[:32]}.json"
+
+
+def read_stamps(skills_dir: Path) -> Stamps:
+    """Load the stamps of a skills/ directory; missing stamps are empty."""
+    try:
+        return Stamps.model_validate_json(stamps_path(skills_dir).read_bytes())
+    except (OSError, ValidationError):
+        return Stamps()
+
+
+def save_stamps(skills_dir: Path, stamps: Stamps) -> None:
+    """Write the stamps of a skills/ directory.
+
+    They only speed up ``quiv status``, so a cache that cannot be written
+    to is not an error.
+    """
+    try:
+        write_atomic(stamps_path(skills_dir), stamps.model_dump_json())
+    except OSError:
+        pass
+
+
+class Recorder:
+    """Skills written during a run, by skill directory."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[Path, RecordedSkill] = {}
+
+    def add(
+        self, skill_dir: Path, files: Mapping[str, FileStamp], skill_md: bytes | None
+    ) -> None:
+        """Record a freshly written skill."""
+        recorded = record_skill(skill_dir.name, files, skill_md)
+        with self._lock:
+            self._entries[skill_dir] = recorded
+
+    def take(self, skills_dir: Path) -> dict[str, RecordedSkill]:
+        """Remove and return the skills recorded under a skills/ directory."""
+        with self._lock:
+            taken = {
+                path: recorded
+                for path, recorded in self._entries.items()
+                if path.parent == skills_dir
+            }
+            for path in taken:
+                del self._entries[path]
+        return {path.name: recorded for path, recorded in taken.items()}
+
+
+_recorder: ContextVar[Recorder | None] = ContextVar("quiv_recorder", default=None)
+
+
+@contextlib.contextmanager
+def recording() -> Iterator[Recorder]:
+    """Record every skill written inside the block for the catalog."""
+    recorder = Recorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def current_recorder() -> Recorder | None:
+    """The recorder of the enclosing ``recording`` block, if any."""
+    return _recorder.get()
+
+
+def update_catalog(
+    skills_dir: Path, written: Mapping[str, RecordedSkill] | None = None
+) -> None:
+    """Bring ``skills/index.json`` up to date after skills were written.
+
+    Entries for written skills are replaced, entries for skill
+    directories that no longer exist are dropped, and skills with no
+    entry are scanned from disk. The file is only rewritten if it
+    changed. The written skills' stamps are saved with it.
+
+    Args:
+        skills_dir: The project's skills/ directory.
+        written: Skills written since the last update.
+    """
+    if not skills_dir.is_dir():
+        return
+    recorded = dict(written or {})
+    old = read_catalog(skills_dir)
+    skills = dict(old.skills) if old is not None else {}
+    skills.update((name, skill.entry) for name, skill in recorded.items())
+
+    present = skill_names(skills_dir)
+    for name in present - skills.keys():
+        recorded[name] = scan_skill(skills_dir / name)
+        skills[name] = recorded[name].entry
+
+    catalog = Catalog(skills={name: skills[name] for name in sorted(present)})
+    if catalog != old:
+        write_atomic(catalog_path(skills_dir), catalog.model_dump_json(indent=2))
+
+    stamps = read_stamps(skills_dir)
+    kept = {
+        name: stamp for name, stamp in stamps.skills.items() if name in catalog.skills
+    }
+    for name, skill in recorded.items():
+        if skill.stamps is not None:
+            kept[name] = skill.stamps
+        else:
+            kept.pop(name, None)
+    if kept != stamps.skills:
+        save_stamps(skills_dir, Stamps(skills=kept))
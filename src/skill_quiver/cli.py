@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 
 from skill_quiver import __version__
-from skill_quiver.errors import QuivError
+from skill_quiver.errors import QuivError, SyncError
 
 
 def find_manifest(start: Path) -> Path:
@@ -65,6 +65,160 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show what would change without writing files",
     )
+    sync_parser.add_argument(
+        "--source",
+        action="append",
+        default=None,
+        help="Sync only this source (repeatable)",
+        metavar="NAME",
+    )
+    sync_parser.add_argument(
+        "--skill",
+        action="append",
+        default=None,
+        help="Sync only skills matching this glob (repeatable)",
+        metavar="PATTERN",
+    )
+    sync_parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="Sync only skills whose manifest entry differs from their provenance",
+    )
+    sync_parser.add_argument(
+        "--workspace",
+        action="store_true",
+        help="Sync every skills.kdl under the working directory "
+        "(or those listed in quiv-workspace.kdl) in one pass",
+    )
+    sync_parser.add_argument(
+        "--shard",
+        default=None,
+        help="Sync only shard I of N (1-based) into the --out fragment",
+        metavar="I/N",
+    )
+    sync_parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help="Fragment output directory for --shard",
+        metavar="DIR",
+    )
+    sync_parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Sync every source that can be synced, then exit non-zero if any failed",
+    )
+    sync_parser.add_argument(
+        "--source-timeout",
+        type=float,
+        default=None,
+        help="Give up on a source after SECONDS",
+        metavar="SECONDS",
+    )
+    sync_parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Give up on the whole sync after SECONDS",
+        metavar="SECONDS",
+    )
+    sync_parser.add_argument(
+        "--from-bundle",
+        type=Path,
+        default=None,
+        help="Install from a bundle written by 'quiv fetch --bundle', offline",
+        metavar="FILE",
+    )
+
+    # --- fetch command ---
+    fetch_parser = subparsers.add_parser(
+        "fetch", help="Download everything the manifest needs without syncing"
+    )
+    fetch_parser.add_argument(
+        "--bundle",
+        type=Path,
+        default=None,
+        help="Write a portable bundle for 'quiv sync --from-bundle'",
+        metavar="FILE",
+    )
+    fetch_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=8,
+        help="Concurrent downloads when warming the cache (default: 8)",
+        metavar="N",
+    )
+    fetch_parser.add_argument(
+        "--byte-budget",
+        default=None,
+        help="Cap the expected size of downloads in flight (e.g. 500M)",
+        metavar="SIZE",
+    )
+
+    # --- merge command ---
+    merge_parser = subparsers.add_parser(
+        "merge", help="Merge fragments from 'quiv sync --shard' into skills/"
+    )
+    merge_parser.add_argument(
+        "fragments",
+        type=Path,
+        nargs="+",
+        help="Fragment directories, one per shard",
+        metavar="FRAGMENT",
+    )
+
+    # --- watch command ---
+    watch_parser = subparsers.add_parser(
+        "watch", help="Stay resident and re-sync when upstream or skills.kdl change"
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=300.0,
+        help="Seconds between upstream polls (default: 300)",
+        metavar="SECONDS",
+    )
+
+    # --- cache command ---
+    cache_parser = subparsers.add_parser(
+        "cache", help="Inspect and trim the quiv cache"
+    )
+    cache_subparsers = cache_parser.add_subparsers(
+        dest="cache_command", title="cache commands", required=True
+    )
+    cache_subparsers.add_parser("stats", help="Show cache size by entry kind")
+    prune_parser = cache_subparsers.add_parser(
+        "prune", help="Evict least recently used cache entries"
+    )
+    prune_parser.add_argument(
+        "--max-size",
+        default=None,
+        help="Evict until the cache is at most SIZE (e.g. 500M, 2G)",
+        metavar="SIZE",
+    )
+    prune_parser.add_argument(
+        "--older-than",
+        default=None,
+        help="Evict entries not used for DURATION (e.g. 30d, 12h)",
+        metavar="DURATION",
+    )
+    cache_subparsers.add_parser("clear", help="Delete the whole cache")
+
+    # --- status and verify commands ---
+    subparsers.add_parser(
+        "status",
+        help="Report modified, missing and orphaned skills, offline",
+    )
+    verify_parser = subparsers.add_parser(
+        "verify", help="Re-hash every skill file and check it, offline"
+    )
+    verify_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Files hashed in parallel (default: up to 8)",
+        metavar="N",
+    )
 
     # --- init command ---
     subparsers.add_parser("init", help="Initialize a skill-quiver project")
@@ -87,9 +241,180 @@ def _handle_sync(args: argparse.Namespace, work_dir: Path) -> None:
     from skill_quiver.manifest import parse_manifest
     from skill_quiver.sync import sync
 
+    selecting = bool(args.source or args.skill or args.changed)
+    if selecting and (args.workspace or args.shard is not None):
+        raise QuivError(
+            "--source, --skill and --changed cannot be combined with "
+            "--workspace or --shard"
+        )
+
+    if args.from_bundle is not None and (args.workspace or args.shard is not None):
+        raise QuivError("--from-bundle cannot be combined with --workspace or --shard")
+
+    limited = args.keep_going or args.source_timeout or args.deadline
+    if limited and (args.workspace or args.shard or args.from_bundle):
+        raise QuivError(
+            "--keep-going, --source-timeout and --deadline cannot be combined "
+            "with --workspace, --shard or --from-bundle"
+        )
+    for flag, value in (
+        ("--source-timeout", args.source_timeout),
+        ("--deadline", args.deadline),
+    ):
+        if value is not None and value <= 0:
+            raise QuivError(f"{flag} must be positive")
+
+    if args.shard is not None:
+        from skill_quiver.shard import parse_shard, sync_shard
+
+        if args.workspace:
+            raise QuivError("--shard cannot be combined with --workspace")
+        if args.out is None:
+            raise QuivError("--shard requires --out DIR")
+        index, total = parse_shard(args.shard)
+        manifest = parse_manifest(find_manifest(work_dir))
+        sync_shard(manifest, index, total, args.out.resolve(), dry_run=args.dry_run)
+        return
+
+    if args.workspace:
+        from skill_quiver.workspace import load_workspace, sync_workspace
+
+        sync_workspace(work_dir, load_workspace(work_dir), dry_run=args.dry_run)
+        return
+
     manifest_path = find_manifest(work_dir)
     manifest = parse_manifest(manifest_path)
-    sync(manifest, dry_run=args.dry_run)
+
+    sources = None
+    if selecting:
+        from skill_quiver.selection import select_sources
+
+        sources = select_sources(manifest, args.source, args.skill, args.changed)
+        if not sources:
+            print("Nothing to sync: no skills match the selection")
+            return
+
+    if args.from_bundle is not None:
+        from skill_quiver.bundle import sync_from_bundle
+
+        sync_from_bundle(
+            manifest, args.from_bundle.resolve(), dry_run=args.dry_run, sources=sources
+        )
+        return
+
+    report = sync(
+        manifest,
+        dry_run=args.dry_run,
+        sources=sources,
+        keep_going=args.keep_going,
+        source_timeout=args.source_timeout,
+        deadline=args.deadline,
+    )
+    if report.failed:
+        raise SyncError(report.failure_summary())
+
+
+def _handle_fetch(args: argparse.Namespace, work_dir: Path) -> None:
+    """Dispatch fetch command."""
+    from skill_quiver.manifest import parse_manifest
+
+    manifest = parse_manifest(find_manifest(work_dir))
+    if args.bundle is not None:
+        from skill_quiver.bundle import write_bundle
+
+        write_bundle(manifest, args.bundle.resolve())
+        return
+
+    from skill_quiver.cache import parse_size
+    from skill_quiver.prefetch import prefetch
+
+    if args.jobs < 1:
+        raise QuivError("--jobs must be at least 1")
+    budget = parse_size(args.byte_budget) if args.byte_budget else None
+    if budget == 0:
+        raise QuivError("--byte-budget must be more than 0")
+    prefetch(manifest, jobs=args.jobs, byte_budget=budget)
+
+
+def _handle_merge(args: argparse.Namespace, work_dir: Path) -> None:
+    """Dispatch merge command."""
+    from skill_quiver.manifest import parse_manifest
+    from skill_quiver.shard import merge_fragments
+
+    manifest = parse_manifest(find_manifest(work_dir))
+    merge_fragments(manifest, [Path(f).resolve() for f in args.fragments])
+
+
+def _handle_watch(args: argparse.Namespace, work_dir: Path) -> None:
+    """Dispatch watch command."""
+    from skill_quiver.watch import Watcher
+
+    if args.interval <= 0:
+        raise QuivError("--interval must be positive")
+
+    watcher = Watcher(find_manifest(work_dir), interval=args.interval)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+        print("Stopped watching")
+
+
+def _handle_cache(args: argparse.Namespace, work_dir: Path) -> None:
+    """Dispatch cache command."""
+    from skill_quiver.cache import (
+        cache_dir,
+        cache_index,
+        cache_stats,
+        clear_cache,
+        format_size,
+        parse_duration,
+        parse_size,
+        pinned_keys,
+    )
+
+    match args.cache_command:
+        case "stats":
+            stats = cache_stats()
+            print(f"Cache: {cache_dir()}")
+            for kind, (count, size) in sorted(stats.items()):
+                print(f"  {kind}: {count} entries, {format_size(size)}")
+            total = sum(size for _, size in stats.values())
+            print(f"Total: {format_size(total)}")
+        case "prune":
+            if args.max_size is None and args.older_than is None:
+                raise QuivError("prune needs --max-size and/or --older-than")
+            max_size = parse_size(args.max_size) if args.max_size else None
+            older_than = parse_duration(args.older_than) if args.older_than else None
+            # Archives the current project was synced from are kept
+            try:
+                pinned = pinned_keys(find_manifest(work_dir).parent / "skills")
+            except QuivError:
+                pinned = frozenset()
+            count, freed = cache_index().prune(max_size, older_than, pinned)
+            print(f"Evicted {count} cache entries ({format_size(freed)})")
+        case "clear":
+            clear_cache()
+            print(f"Cleared {cache_dir()}")
+
+
+def _handle_status(args: argparse.Namespace, work_dir: Path) -> None:
+    """Dispatch status and verify commands."""
+    from skill_quiver.manifest import parse_manifest
+    from skill_quiver.status import check_skills
+
+    full = args.command == "verify"
+    jobs = args.jobs if full else None
+    if jobs is not None and jobs < 1:
+        raise QuivError("--jobs must be at least 1")
+
+    manifest = parse_manifest(find_manifest(work_dir))
+    report = check_skills(manifest, full=full, jobs=jobs)
+    for problem in report.problems:
+        print(problem.render())
+    if not report.ok:
+        raise QuivError(report.summary())
+    print(report.summary())
 
 
 def _handle_init(args: argparse.Namespace, work_dir: Path) -> None:
@@ -119,6 +444,16 @@ def main(argv: list[str] | None = None) -> None:
         match args.command:
             case "sync":
                 _handle_sync(args, work_dir)
+            case "fetch":
+                _handle_fetch(args, work_dir)
+            case "merge":
+                _handle_merge(args, work_dir)
+            case "watch":
+                _handle_watch(args, work_dir)
+            case "cache":
+                _handle_cache(args, work_dir)
+            case "status" | "verify":
+                _handle_status(args, work_dir)
             case "init":
                 _handle_init(args, work_dir)
 
@@ -20,3 +20,15 @@ class SyncError(QuivError):
 
 class InitError(QuivError):
     """Error during skill initialization."""
+
+
+class ConfigError(QuivError):
+    """Error reading the quiv config file."""
+
+
+class UnavailableError(SyncError):
+    """An upstream host timed out, refused, or answered with a server error."""
+
+
+class DeadlineError(UnavailableError):
+    """A per-source or whole-run sync deadline passed."""
@@ -0,0 +1,156 @@
+"""Fast parser and printer for the KDL subset quiv reads and writes.
+
+skills.kdl, workspace files, and .source.kdl files only use nodes with
+bare names, quoted-string arguments and ``key="value"`` properties, and
+one child block per line. That subset is handled here with one regex per
+line. Anything else (numbers, keywords, raw strings, semicolons, block or
+slashdash comments, ...) goes through ``kdl-py``, which also produces
+every syntax error, so results never differ from ``kdl.parse``.
+"""
+
+import re
+
+import kdl
+
+_IDENT = r"[A-Za-z_][A-Za-z0-9_-]*"
+_STRING = r'"(?:[^"\\\n]|\\["\\/bfnrt])*"'
+
+_LINE = re.compile(
+    rf"[ \t]*(?:(?P<close>\}})|(?P<name>{_IDENT})"
+    rf"(?P<entries>(?:[ \t]+(?:{_IDENT}=)?{_STRING})*)"
+    rf"(?:[ \t]+(?P<open>\{{))?)?[ \t]*(?://.*)?"
+)
+_ENTRY = re.compile(rf"[ \t]+(?:({_IDENT})=)?({_STRING})")
+_ESCAPE = re.compile(r"\\(.)")
+_BARE = re.compile(_IDENT)
+
+_UNESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_KEYWORDS = frozenset({"true", "false", "null"})
+# Newlines and whitespace KDL knows about that the line regex does not
+_UNUSUAL = re.compile(
+    "[\r\x0b\x0c\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff]"
+)
+
+
+def _unquote(token: str) -> str:
+    body = token[1:-1]
+    if "\\" not in body:
+        return body
+    return _ESCAPE.sub(lambda m: _UNESCAPES[m.group(1)], body)
+
+
+def _parse_subset(text: str) -> list[kdl.Node] | None:
+    """Parse text if it is entirely within the subset, else return None."""
+    text = text.replace("\r\n", "\n")
+    if _UNUSUAL.search(text):
+        return None
+
+    top: list[kdl.Node] = []
+    stack: list[list[kdl.Node]] = [top]
+    for line in text.split("\n"):
+        match = _LINE.fullmatch(line)
+        if match is None:
+            return None
+        if match["close"]:
+            if len(stack) == 1:
+                return None
+            stack.pop()
+            continue
+        name = match["name"]
+        if name is None:
+            continue
+        if name in _KEYWORDS:
+            return None
+
+        args: list[object] = []
+        props: dict[str, object] = {}
+        for key, value in _ENTRY.findall(match["entries"]):
+            if key:
+                if key in _KEYWORDS:
+                    return None
+                props[key] = _unquote(value)
+            else:
+                args.append(_unquote(value))
+
+        node = kdl.Node(name=name, args=args, props=props)
+        stack[-1].append(node)
+        if match["open"]:
+            stack.append(node.nodes)
+
+    if len(stack) != 1:
+        return None
+    return top
+
+
+def parse(text: str) -> list[kdl.Node]:
+    """Parse a KDL document into its top-level nodes.
+
+    Raises:
+        kdl.ParseError: If the text is not valid KDL.
+    """
+    nodes = _parse_subset(text)
+    if nodes is None:
+        nodes = kdl.parse(text).nodes
+    return nodes
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\b", "\\b")
+        .replace("\f", "\\f")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+
+
+def _is_bare(name: object) -> bool:
+    return (
+        isinstance(name, str)
+        and name not in _KEYWORDS
+        and _BARE.fullmatch(name) is not None
+    )
+
+
+def _print_subset(node: kdl.Node, level: int, out: list[str]) -> bool:
+    if node.tag is not None or not _is_bare(node.name):
+        return False
+    parts = ["\t" * level, node.name]
+    for arg in node.args:
+        if not isinstance(arg, str):
+            return False
+        parts.append(f' "{_escape(arg)}"')
+    for key, value in node.props.items():
+        if not _is_bare(key) or not isinstance(value, str):
+            return False
+        parts.append(f' {key}="{_escape(value)}"')
+    if node.nodes:
+        parts.append(" {\n")
+        out.append("".join(parts))
+        for child in node.nodes:
+            if not _print_subset(child, level + 1, out):
+                return False
+        out.append("\t" * level + "}\n")
+    else:
+        parts.append("\n")
+        out.append("".join(parts))
+    return True
+
+
+def dumps(nodes: list[kdl.Node]) -> str:
+    """Print nodes exactly as ``str(kdl.Document(nodes))`` would."""
+    out: list[str] = []
+    if all(_print_subset(node, 0, out) for node in nodes):
+        return "".join(out) or "\n"
+    return str(kdl.Document(nodes=nodes))
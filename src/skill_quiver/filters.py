@@ -0,0 +1,104 @@
+"""Per-source include/exclude file filters.
+
+Patterns are matched against paths relative to the skill directory, with
+gitignore-like rules: ``*`` stays within one path segment and ``**``
+spans any number of them. A pattern without a ``/`` matches a file or
+directory name at any depth (``*.png``, ``fixtures``); one with a ``/``
+is anchored at the skill root (``examples/data/**``). A matched directory
+matches everything below it. The skill's own ``SKILL.md`` is always kept.
+"""
+
+import functools
+import re
+
+SKILL_FILE = "SKILL.md"
+
+_GLOB_TOKEN = re.compile(r"\[!?\]?[^\]]*\]|[*?]|[^*?\[]+|\[")
+
+
+def validate_pattern(pattern: str) -> str:
+    """Check a filter pattern is a non-empty path relative to the skill."""
+    stripped = pattern.strip("/")
+    if not stripped or pattern.startswith("/"):
+        raise ValueError(
+            f"Invalid file pattern '{pattern}': must be relative to the skill"
+        )
+    if ".." in stripped.split("/"):
+        raise ValueError(f"Invalid file pattern '{pattern}': may not contain '..'")
+    return pattern
+
+
+def _translate(pattern: str) -> str:
+    """Regex for a glob where ``*`` stays in one segment and ``**`` does not."""
+    out: list[str] = []
+    segments = pattern.split("/")
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == "**":
+            out.append(".*" if last else "(?:.*/)?")
+            continue
+        for part in _GLOB_TOKEN.findall(segment):
+            if part == "*":
+                out.append("[^/]*")
+            elif part == "?":
+                out.append("[^/]")
+            elif part.startswith("[") and len(part) > 1:
+                negate = part[1] == "!"
+                body = (part[2:-1] if negate else part[1:-1]).replace("\\", "\\\\")
+                out.append(f"[^/{body}]" if negate else f"[{body}]")
+            else:
+                out.append(re.escape(part))
+        if not last:
+            out.append("/")
+    return "".join(out) + r"\Z"
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(pattern: str) -> tuple[re.Pattern[str], bool]:
+    """Compile a pattern, and whether it is anchored at the skill root."""
+    stripped = pattern.strip("/")
+    return re.compile(_translate(stripped)), "/" in stripped
+
+
+def _matches(rel_path: str, pattern: str) -> bool:
+    regex, anchored = _compile(pattern)
+    parts = rel_path.split("/")
+    if anchored:
+        # The file itself or any directory above it
+        return any(regex.match("/".join(parts[:i])) for i in range(1, len(parts) + 1))
+    return any(regex.match(part) for part in parts)
+
+
+def keep_file(rel_path: str, include: list[str], exclude: list[str]) -> bool:
+    """Whether a file (relative to its skill directory) passes the filters.
+
+    With include patterns, only matching files are kept; exclude patterns
+    then remove matches. SKILL.md at the skill root is always kept.
+    """
+    if rel_path == SKILL_FILE:
+        return True
+    if include and not any(_matches(rel_path, p) for p in include):
+        return False
+    return not any(_matches(rel_path, p) for p in exclude)
+
+
+def sparse_patterns(
+    skill_path: str, include: list[str], exclude: list[str]
+) -> list[str]:
+    """Non-cone ``git sparse-checkout`` patterns for one filtered skill.
+
+    They select the same files as ``keep_file``, so excluded blobs are
+    never fetched by a blobless clone.
+    """
+
+    def rooted(pattern: str) -> str:
+        stripped = pattern.strip("/")
+        if "/" in stripped:
+            return f"/{skill_path}/{stripped}"
+        return f"/{skill_path}/**/{stripped}"
+
+    patterns = [rooted(p) for p in include] if include else [f"/{skill_path}/"]
+    patterns.extend(f"!{rooted(p)}" for p in exclude)
+    # Last match wins, so this keeps SKILL.md whatever the excludes say
+    patterns.append(f"/{skill_path}/{SKILL_FILE}")
+    return patterns
@@ -0,0 +1,189 @@
+"""Host mapping: which repo hosts have an HTTP forge API, and where it is.
+
+GitHub, GitLab and Gitea (including Forgejo and Codeberg) are supported.
+Sources on any other host fall back to git.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Literal
+from urllib.parse import quote, urlparse
+
+from pydantic import BaseModel, ValidationError
+
+from skill_quiver import fastkdl
+from skill_quiver.errors import ConfigError
+
+ForgeKind = Literal["github", "gitlab", "gitea"]
+
+GITHUB_API = "https://api.github.com"
+
+# Hosts known without any configuration: (kind, API base)
+KNOWN_HOSTS: dict[str, tuple[ForgeKind, str]] = {
+    "github.com": ("github", GITHUB_API),
+    "www.github.com": ("github", GITHUB_API),
+    "gitlab.com": ("gitlab", "https://gitlab.com/api/v4"),
+    "codeberg.org": ("gitea", "https://codeberg.org/api/v1"),
+}
+
+TOKEN_ENV: dict[ForgeKind, str] = {
+    "github": "GITHUB_TOKEN",
+    "gitlab": "GITLAB_TOKEN",
+    "gitea": "GITEA_TOKEN",
+}
+
+_AUTH_SCHEME: dict[ForgeKind, str] = {
+    "github": "Bearer",
+    "gitlab": "Bearer",
+    "gitea": "token",
+}
+
+
+class ForgeHost(BaseModel):
+    """A host whose commits, trees and archives are served over HTTP."""
+
+    host: str
+    kind: ForgeKind = "github"
+    # Base of the REST API, e.g. ``https://ghe.example.com/api/v3``
+    api: str
+    # Base for archive downloads, if they go somewhere else (a caching proxy)
+    archive: str | None = None
+    # Environment variable holding this host's token (default per kind)
+    token_env: str | None = None
+
+    def repo_url(self, project: str, base: str | None = None) -> str:
+        """API URL of a project (``owner/repo``, or a GitLab path)."""
+        base = (base or self.api).rstrip("/")
+        if self.kind == "gitlab":
+            return f"{base}/projects/{quote(project, safe='')}"
+        return f"{base}/repos/{project}"
+
+    def commit_url(self, project: str, ref: str) -> str:
+        """URL resolving ref to a commit in one request."""
+        base = self.repo_url(project)
+        match self.kind:
+            case "github":
+                return f"{base}/commits/{ref}"
+            case "gitlab":
+                return f"{base}/repository/commits/{quote(ref, safe='')}"
+            case "gitea":
+                return f"{base}/commits?sha={quote(ref, safe='')}&limit=1&stat=false"
+
+    def sha_from(self, data: object) -> str | None:
+        """Pull the commit SHA out of a commit_url response, if present."""
+        if self.kind == "gitea":
+            data = data[0] if isinstance(data, list) and data else None
+        key = "id" if self.kind == "gitlab" else "sha"
+        if isinstance(data, dict) and isinstance(data.get(key), str):
+            return data[key]
+        return None
+
+    def tarball_url(self, project: str, sha: str) -> str:
+        """URL of a gzipped tarball of the whole project at sha."""
+        base = self.repo_url(project, self.archive)
+        match self.kind:
+            case "github":
+                return f"{base}/tarball/{sha}"
+            case "gitlab":
+                return f"{base}/repository/archive.tar.gz?sha={sha}"
+            case "gitea":
+                return f"{base}/archive/{sha}.tar.gz"
+
+    def auth_headers(self) -> dict[str, str]:
+        """Authorization for this host, if its token variable is set."""
+        token = os.environ.get(self.token_env or TOKEN_ENV[self.kind])
+        if not token:
+            return {}
+        return {"Authorization": f"{_AUTH_SCHEME[self.kind]} {token}"}
+
+
+def config_path() -> Path:
+    """Location of the quiv config file.
+
+    ``$QUIV_CONFIG``, falling back to ``$XDG_CONFIG_HOME/quiv/config.kdl``
+    and then ``~/.config/quiv/config.kdl``.
+    """
+    override = os.environ.get("QUIV_CONFIG")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".config"
+    return base / "quiv" / "config.kdl"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_hosts(
+    path: Path, mtime_ns: int | None, api: str | None, archive: str | None
+) -> dict[str, ForgeHost]:
+    hosts = {
+        host: ForgeHost(host=host, kind=kind, api=base)
+        for host, (kind, base) in KNOWN_HOSTS.items()
+    }
+    if mtime_ns is not None:
+        try:
+            nodes = fastkdl.parse(path.read_text(encoding="utf-8"))
+        except OSError as e:
+            raise ConfigError(f"Cannot read config {path}: {e}") from e
+        except Exception as e:
+            raise ConfigError(f"Invalid KDL syntax in {path}: {e}") from e
+
+        for node in nodes:
+            kind = node.name.removesuffix("-host")
+            if not node.name.endswith("-host") or kind not in TOKEN_ENV:
+                continue
+            if not node.args:
+                raise ConfigError(f"{node.name} in {path} needs a host name")
+            host = str(node.args[0]).lower()
+            props = {key.replace("-", "_"): value for key, value in node.props.items()}
+            if host in KNOWN_HOSTS:
+                props.setdefault("api", KNOWN_HOSTS[host][1])
+            try:
+                hosts[host] = ForgeHost(host=host, kind=kind, **props)
+            except (TypeError, ValidationError) as e:
+                raise ConfigError(f"Invalid {node.name} '{host}' in {path}: {e}") from e
+
+    # The environment overrides win over the config file for github.com
+    for host in ("github.com", "www.github.com"):
+        if (api or archive) and hosts[host].kind == "github":
+            hosts[host] = hosts[host].model_copy(
+                update={
+                    "api": api or hosts[host].api,
+                    "archive": archive or hosts[host].archive,
+                }
+            )
+    return hosts
+
+
+def forge_hosts() -> dict[str, ForgeHost]:
+    """Every host with a forge API, keyed by lowercase hostname.
+
+    github.com, gitlab.com and codeberg.org are always present.
+    ``QUIV_GITHUB_API`` and ``QUIV_GITHUB_ARCHIVE`` point github.com
+    somewhere else, and ``github-host``, ``gitlab-host`` and ``gitea-host``
+    nodes in the config file add or override hosts::
+
+        gitlab-host "gitlab.example.com" api="https://gitlab.example.com/api/v4"
+
+    Raises:
+        ConfigError: If the config file cannot be read or is invalid.
+    """
+    path = config_path()
+    try:
+        mtime_ns: int | None = path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _load_hosts(
+        path,
+        mtime_ns,
+        os.environ.get("QUIV_GITHUB_API") or None,
+        os.environ.get("QUIV_GITHUB_ARCHIVE") or None,
+    )
+
+
+def forge_host(repo: str) -> ForgeHost | None:
+    """The forge serving a repo URL, or None for plain git hosts."""
+    hostname = urlparse(repo).hostname
+    if hostname is None:
+        return None
+    return forge_hosts().get(hostname.lower())
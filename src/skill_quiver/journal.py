@@ -0,0 +1,67 @@
+"""Sync journal: the plan and per-source progress of an unfinished sync.
+
+``sync_report`` writes the journal next to the manifest as it goes and
+deletes it when the run completes. If a run is killed, the next one
+with the same plan picks it up: resolved SHAs are reused, finished
+sources are skipped, and skills that were being rewritten are redone.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from skill_quiver.locking import write_atomic
+from skill_quiver.manifest import Source
+
+JOURNAL_FILENAME = ".quiv-journal.json"
+
+
+class SyncJournal(BaseModel):
+    """Progress of one sync run over a fixed list of sources."""
+
+    # Digest of the sources being synced; a different plan starts over
+    plan: str
+    # Resolved commit (or fingerprint) per source name
+    shas: dict[str, str] = {}
+    # Skills being replaced, per source that has not finished
+    writing: dict[str, list[str]] = {}
+    # Sources whose skills and provenance are fully written
+    done: list[str] = []
+
+
+def plan_digest(sources: list[Source]) -> str:
+    """Digest identifying a list of sources, including their filters."""
+    data = [source.model_dump(mode="json") for source in sources]
+    encoded = json.dumps(data, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def journal_path(root: Path) -> Path:
+    """Where the journal for the manifest at root is kept."""
+    return root / JOURNAL_FILENAME
+
+
+def load_journal(root: Path, sources: list[Source]) -> SyncJournal:
+    """Return the unfinished journal for this plan, or a fresh one.
+
+    A journal that is unreadable or was written for other sources is
+    ignored; the fresh journal replaces it on the first save.
+    """
+    plan = plan_digest(sources)
+    try:
+        journal = SyncJournal.model_validate_json(journal_path(root).read_bytes())
+    except (OSError, ValidationError):
+        return SyncJournal(plan=plan)
+    return journal if journal.plan == plan else SyncJournal(plan=plan)
+
+
+def save_journal(root: Path, journal: SyncJournal) -> None:
+    """Write the journal atomically, so a kill never leaves half of it."""
+    write_atomic(journal_path(root), journal.model_dump_json())
+
+
+def clear_journal(root: Path) -> None:
+    """Remove the journal once a run has finished."""
+    journal_path(root).unlink(missing_ok=True)
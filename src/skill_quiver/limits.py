@@ -0,0 +1,112 @@
+"""Deadlines and per-host circuit breaking for sync runs.
+
+A deadline bounds everything run inside a ``deadline`` block: each HTTP
+request's timeout and each git command's timeout are capped at the time
+left, and downloads check it between chunks. Deadlines are kept in a
+context variable, so they follow ``sync_async`` into its worker thread.
+"""
+
+import contextlib
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from urllib.parse import urlparse
+
+import httpx
+
+from skill_quiver.errors import DeadlineError, UnavailableError
+
+# Default per-request timeouts; a deadline only ever shortens them
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+_deadline: ContextVar[float | None] = ContextVar("quiv_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Bound the work inside the block to seconds from now.
+
+    Nested deadlines keep whichever ends first. None adds no bound.
+    """
+    if seconds is None:
+        yield
+        return
+    end = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(end if current is None else min(end, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None without one."""
+    end = _deadline.get()
+    return None if end is None else end - time.monotonic()
+
+
+def check_deadline(what: str) -> None:
+    """Raise DeadlineError if the current deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineError(f"Deadline exceeded before trying to {what}")
+
+
+def http_timeout(what: str) -> httpx.Timeout:
+    """Timeouts for one HTTP request, capped at the time left."""
+    check_deadline(what)
+    left = remaining()
+    if left is None:
+        return HTTP_TIMEOUT
+    return httpx.Timeout(min(30.0, left), connect=min(10.0, left))
+
+
+def process_timeout(what: str) -> float | None:
+    """Timeout for one subprocess, or None without a deadline."""
+    check_deadline(what)
+    return remaining()
+
+
+def host_key(repo: str) -> str:
+    """The host a circuit breaker tracks a repo under."""
+    return urlparse(repo).hostname or "localhost"
+
+
+class CircuitBreaker:
+    """Stop calling a host after repeated failures.
+
+    After ``threshold`` consecutive UnavailableErrors from a host its
+    circuit opens, and ``check`` fails fast instead of waiting for yet
+    another timeout. Once ``cooldown`` seconds have passed, one attempt
+    is let through; a success closes the circuit again.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 60.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: dict[str, int] = {}
+        self._opened: dict[str, float] = {}
+
+    def check(self, host: str) -> None:
+        """Raise UnavailableError if host's circuit is open."""
+        opened = self._opened.get(host)
+        if opened is None:
+            return
+        if time.monotonic() - opened < self.cooldown:
+            raise UnavailableError(
+                f"Skipped: {host} failed {self._failures[host]} times in a row"
+            )
+        # Half-open: allow one attempt; a failure re-opens immediately
+        del self._opened[host]
+        self._failures[host] = self.threshold - 1
+
+    def record(self, host: str, ok: bool) -> None:
+        """Record the outcome of an attempt against host."""
+        if ok:
+            self._failures.pop(host, None)
+            self._opened.pop(host, None)
+            return
+        self._failures[host] = self._failures.get(host, 0) + 1
+        if self._failures[host] >= self.threshold:
+            self._opened[host] = time.monotonic()
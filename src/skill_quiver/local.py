@@ -0,0 +1,245 @@
+"""Local sources: skill directories and ``file://`` git repositories on disk."""
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from skill_quiver.errors import SyncError
+from skill_quiver.manifest import NAME_PATTERN, Source, is_local_repo
+
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+# Files changed this recently cannot be trusted to their stat (see fingerprint)
+RACY_WINDOW_NS = 2_000_000_000
+
+# Fingerprints taken while some file was within RACY_WINDOW_NS of now
+_racy_fingerprints: set[str] = set()
+
+# Tags of tags are followed this many levels before deferring to git
+MAX_TAG_DEPTH = 8
+
+
+def is_local_dir(source: Source) -> bool:
+    """Whether a source is a plain directory, read as-is from disk."""
+    return is_local_repo(source.repo) and not source.repo.startswith("file://")
+
+
+def local_path(source: Source) -> Path:
+    """The directory or repository a local source points at."""
+    if source.repo.startswith("file://"):
+        return Path(unquote(urlparse(source.repo).path))
+    return Path(source.repo).expanduser()
+
+
+def fingerprint(root: Path) -> str:
+    """Hash the relative path and stat of every file below root.
+
+    Each file contributes its size, mtime, ctime and inode, so checking an
+    unchanged source only stats files, and the same tree always gives the
+    same fingerprint. A file modified within ``RACY_WINDOW_NS`` of now could
+    be rewritten within the same timestamp tick without any of those
+    changing. Such fingerprints are remembered (see ``is_settled``) rather
+    than made to differ. ``.git`` directories are skipped.
+
+    Raises:
+        SyncError: If root cannot be read.
+    """
+    entries: list[tuple[str, str]] = []
+    racy_since = time.time_ns() - RACY_WINDOW_NS
+    racy = False
+    pending = [root]
+    try:
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != ".git":
+                            pending.append(Path(entry.path))
+                    elif entry.is_file():
+                        st = entry.stat()
+                        rel = os.path.relpath(entry.path, root)
+                        stamp = (
+                            f"{st.st_size}\0{st.st_mtime_ns}\0"
+                            f"{st.st_ctime_ns}\0{st.st_ino}"
+                        )
+                        if max(st.st_mtime_ns, st.st_ctime_ns) >= racy_since:
+                            racy = True
+                        entries.append((rel, stamp))
+    except OSError as e:
+        raise SyncError(f"Cannot read local source {root}: {e}") from e
+
+    digest = hashlib.sha256()
+    for rel, stamp in sorted(entries):
+        digest.update(f"{rel}\0{stamp}\n".encode())
+    sha = digest.hexdigest()[:40]
+    if racy:
+        _racy_fingerprints.add(sha)
+    else:
+        _racy_fingerprints.discard(sha)
+    return sha
+
+
+def is_settled(sha: str) -> bool:
+    """Whether a matching provenance SHA proves a source unchanged.
+
+    False for fingerprints taken while a file had just changed: the file
+    may have been rewritten since it was synced without its stat changing,
+    so skills recorded with that fingerprint are re-synced anyway.
+    Commit SHAs are always settled.
+    """
+    return sha not in _racy_fingerprints
+
+
+def _git_dir(repo: Path) -> Path:
+    dot_git = repo / ".git"
+    return dot_git if dot_git.is_dir() else repo
+
+
+def _peel(git_dir: Path, sha: str) -> str | None:
+    """Follow annotated tags stored as loose objects to the commit they tag.
+
+    Returns None if an object is packed or not a tag or commit, so the
+    caller can fall back to git.
+    """
+    for _ in range(MAX_TAG_DEPTH):
+        try:
+            compressed = (git_dir / "objects" / sha[:2] / sha[2:]).read_bytes()
+            data = zlib.decompress(compressed)
+        except (OSError, zlib.error):
+            return None
+        header, _, body = data.partition(b"\0")
+        if header.startswith(b"commit "):
+            return sha
+        first_line = body.split(b"\n", 1)[0].decode("ascii", errors="replace")
+        if not header.startswith(b"tag ") or not first_line.startswith("object "):
+            return None
+        sha = first_line[len("object ") :]
+    return None
+
+
+def _read_packed_refs(git_dir: Path) -> dict[str, tuple[str, str | None]]:
+    """Map ref names in packed-refs to their SHA and peeled commit, if known.
+
+    Without the ``peeled`` trait, tags have no peeled lines and the commit
+    is not known.
+    """
+    try:
+        lines = (git_dir / "packed-refs").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    peeled = bool(lines) and lines[0].startswith("#") and " peeled" in lines[0]
+    refs: dict[str, tuple[str, str | None]] = {}
+    last: str | None = None
+    for line in lines:
+        if line.startswith("#"):
+            continue
+        if line.startswith("^"):
+            if last is not None:
+                # Peeled commit of the annotated tag just listed
+                refs[last] = (refs[last][0], line[1:])
+            continue
+        sha, _, name = line.partition(" ")
+        commit = sha if peeled or not name.startswith("refs/tags/") else None
+        refs[name] = (sha, commit)
+        last = name
+    return refs
+
+
+def _read_ref(git_dir: Path, ref: str) -> str | None:
+    """Resolve ref to a commit from loose refs and packed-refs, without git.
+
+    Names are tried in git's order: tags before branches, and a loose ref
+    before a packed one. Returns None if the ref cannot be resolved this
+    way, e.g. an annotated tag whose object is packed.
+    """
+    if _SHA_PATTERN.match(ref):
+        return ref
+    if ref == "HEAD" or ref.startswith("refs/"):
+        candidates = [ref]
+    else:
+        candidates = [f"refs/tags/{ref}", f"refs/heads/{ref}"]
+
+    packed: dict[str, tuple[str, str | None]] | None = None
+    for name in candidates:
+        try:
+            value = (git_dir / name).read_text(encoding="utf-8").strip()
+        except OSError:
+            value = ""
+        if value.startswith("ref: "):
+            return _read_ref(git_dir, value[len("ref: ") :])
+        if _SHA_PATTERN.match(value):
+            return _peel(git_dir, value) if name.startswith("refs/tags/") else value
+
+        if packed is None:
+            packed = _read_packed_refs(git_dir)
+        if name in packed:
+            sha, commit = packed[name]
+            return commit if commit is not None else _peel(git_dir, sha)
+    return None
+
+
+def resolve_local_sha(source: Source) -> str:
+    """Resolve the version of a local source provenance is compared against.
+
+    ``file://`` repositories resolve the source's ref by reading refs
+    directly, falling back to ``git rev-parse`` for layouts it cannot read
+    (e.g. linked worktrees). Plain directories have no commits; their
+    ``fingerprint`` stands in for one.
+
+    Raises:
+        SyncError: If the path is missing or the ref does not exist.
+    """
+    path = local_path(source)
+    if not path.is_dir():
+        raise SyncError(f"Local source {source.name} not found: {path}")
+    if is_local_dir(source):
+        return fingerprint(path / source.path.strip("/"))
+
+    sha = _read_ref(_git_dir(path), source.ref)
+    if sha is not None:
+        return sha
+    if shutil.which("git") is None:
+        raise SyncError(
+            f"Cannot resolve '{source.ref}' in {path}: git is not installed"
+        )
+    try:
+        result = subprocess.run(
+            [
+                "git",
+                "-C",
+                str(path),
+                "rev-parse",
+                "--verify",
+                f"{source.ref}^{{commit}}",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise SyncError(
+            f"Cannot resolve '{source.ref}' for {source.name}: {e.stderr.strip()}"
+        ) from e
+    return result.stdout.strip()
+
+
+def list_local_skills(source: Source) -> list[str]:
+    """List skill directories (those with a SKILL.md) in a local directory."""
+    root = local_path(source) / source.path.strip("/")
+    try:
+        children = list(root.iterdir())
+    except OSError as e:
+        raise SyncError(f"Failed to list skills for {source.name}: {e}") from e
+    return sorted(
+        child.name
+        for child in children
+        if NAME_PATTERN.match(child.name)
+        and len(child.name) <= 64
+        and (child / "SKILL.md").is_file()
+    )
@@ -0,0 +1,126 @@
+"""Advisory locks and atomic writes for files shared between quiv processes.
+
+Locks are ``flock`` locks: the kernel releases them when the holder
+exits, however it exits, so a crashed run never leaves a stale lock.
+They are per open file, so threads of one process exclude each other
+too. Platforms without ``fcntl`` get no locking.
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from skill_quiver.errors import DeadlineError
+from skill_quiver.limits import remaining
+
+# How often a lock is retried while waiting under a deadline
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _open(path: Path) -> int:
+    """Open a directory in place, or a lock file, creating it if needed."""
+    if path.is_dir():
+        return os.open(path, os.O_RDONLY)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+
+@contextlib.contextmanager
+def locked(path: Path, what: str, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory lock on path for the duration of the block.
+
+    Waits for other holders. Under a deadline (see ``skill_quiver.limits``)
+    it waits at most until the deadline passes.
+
+    Args:
+        path: A directory, locked in place, or a lock file.
+        what: What the lock guards, for the error message.
+        shared: Take a shared (reader) lock instead of an exclusive one.
+
+    Raises:
+        DeadlineError: If the deadline passes while waiting.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    fd = _open(path)
+    try:
+        if remaining() is None:
+            fcntl.flock(fd, mode)
+        else:
+            while True:
+                try:
+                    fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    left = remaining()
+                    if left is not None and left <= 0:
+                        raise DeadlineError(
+                            f"Deadline exceeded waiting for {what}"
+                        ) from None
+                    time.sleep(LOCK_POLL_INTERVAL)
+        yield
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def try_locked(path: Path) -> Iterator[bool]:
+    """Take an exclusive lock on path if it is free, without waiting.
+
+    Yields whether the lock was taken; it is held until the block ends.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield True
+        return
+
+    fd = _open(path)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+        else:
+            yield True
+    finally:
+        os.close(fd)
+
+
+def write_atomic(target: Path, data: str | bytes) -> None:
+    """Write a file through a uniquely named temp file and rename it into place.
+
+    Readers see the old file or the new one, never a partial write, and
+    concurrent writers (threads or processes) never share a temp file.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".tmp-{target.name}-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.encode() if isinstance(data, str) else data)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def project_lock(root: Path) -> contextlib.AbstractContextManager[None]:
+    """Exclusive lock on a project's skills/ directory, creating it.
+
+    Held by every run that writes to the project, so two runs against
+    the same manifest take turns instead of interleaving their writes.
+    """
+    skills_dir = root / "skills"
+    skills_dir.mkdir(parents=True, exist_ok=True)
+    return locked(skills_dir, f"another quiv run in {root}")
@@ -1,14 +1,20 @@
 """KDL manifest parsing and Pydantic models for skills.kdl."""
 
+import hashlib
 import re
 from pathlib import Path
 
-import kdl
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, HttpUrl, TypeAdapter, ValidationError, field_validator
 
+from skill_quiver import fastkdl
+from skill_quiver.cache import cache_dir, cache_index
 from skill_quiver.errors import ManifestError
+from skill_quiver.filters import keep_file, validate_pattern
+from skill_quiver.locking import write_atomic
 
 NAME_PATTERN = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+SKILL_GLOB_PATTERN = re.compile(r"^[a-z0-9*?\[\]!-]+$")
+GLOB_CHARS = frozenset("*?[")
 
 
 def _validate_kebab_case(name: str) -> str:
@@ -23,68 +29,251 @@ def _validate_kebab_case(name: str) -> str:
     return name
 
 
+_HTTP_URL = TypeAdapter(HttpUrl)
+
+
+def is_local_repo(repo: str) -> bool:
+    """Whether a repo is a directory or ``file://`` repository on this machine."""
+    return repo.startswith("file://") or "://" not in repo
+
+
+def _validate_repo(repo: str) -> str:
+    """Validate an http(s) URL, a ``file://`` URL, or a local path.
+
+    Local paths must be explicit (``/``, ``./``, ``../`` or ``~``), so a
+    mistyped URL is reported rather than read as a directory name.
+    """
+    if repo.startswith("file://"):
+        if not repo.startswith("file:///"):
+            raise ValueError(f"Invalid repo '{repo}': file:// URLs must be absolute")
+        return repo
+    if repo in (".", "..", "~") or repo.startswith(("/", "./", "../", "~/")):
+        return repo
+    try:
+        return str(_HTTP_URL.validate_python(repo))
+    except ValidationError:
+        raise ValueError(
+            f"Invalid repo '{repo}': expected an http(s) URL, a file:// URL, "
+            "or a local path starting with /, ./, ../ or ~/"
+        ) from None
+
+
+def is_skill_glob(entry: str) -> bool:
+    """Whether a skill entry is a glob pattern rather than a literal name."""
+    return any(c in GLOB_CHARS for c in entry)
+
+
+def _validate_skill_entry(entry: str) -> str:
+    """Validate a skill name or glob pattern."""
+    if not is_skill_glob(entry):
+        return _validate_kebab_case(entry)
+    if not SKILL_GLOB_PATTERN.match(entry):
+        raise ValueError(
+            f"Invalid skill pattern '{entry}': may only contain lowercase "
+            "alphanumerics, hyphens, and glob characters (* ? [ ] !)"
+        )
+    return entry
+
+
 class Source(BaseModel):
     """A single source definition from skills.kdl."""
 
     name: str
-    repo: HttpUrl
+    # http(s) URL, file:// git repository, or local directory
+    repo: str
     path: str = "."
     ref: str = "main"
     license: str | None = None
     attribution: str | None = None
     skills: list[str]
+    exclude_skills: list[str] = []
+    # File globs inside each skill (see skill_quiver.filters)
+    include: list[str] = []
+    exclude: list[str] = []
+    # Set by ``quiv sync --skill`` selection; never read from skills.kdl.
+    only_skills: list[str] = []
 
     @field_validator("name")
     @classmethod
     def validate_name(cls, v: str) -> str:
         return _validate_kebab_case(v)
 
+    @field_validator("repo")
+    @classmethod
+    def validate_repo(cls, v: str) -> str:
+        return _validate_repo(v)
+
     @field_validator("skills")
     @classmethod
     def validate_skills(cls, v: list[str]) -> list[str]:
         if len(v) < 1:
             raise ValueError("At least one skill must be specified")
-        for skill_name in v:
-            _validate_kebab_case(skill_name)
+        for entry in v:
+            _validate_skill_entry(entry)
+        return v
+
+    @field_validator("exclude_skills")
+    @classmethod
+    def validate_exclude_skills(cls, v: list[str]) -> list[str]:
+        for entry in v:
+            _validate_skill_entry(entry)
+        return v
+
+    @field_validator("include", "exclude")
+    @classmethod
+    def validate_file_patterns(cls, v: list[str]) -> list[str]:
+        for pattern in v:
+            validate_pattern(pattern)
         return v
 
+    @property
+    def is_wildcard(self) -> bool:
+        """Whether the skill list must be expanded against upstream."""
+        return any(is_skill_glob(entry) for entry in self.skills) or bool(
+            self.exclude_skills
+        )
+
+    @property
+    def is_filtered(self) -> bool:
+        """Whether only some of each skill's files are fetched."""
+        return bool(self.include or self.exclude)
+
+    def keeps_file(self, rel_path: str) -> bool:
+        """Whether a file, relative to its skill directory, passes the filters."""
+        return keep_file(rel_path, self.include, self.exclude)
+
 
 class Manifest(BaseModel):
     """Parsed skills.kdl manifest."""
 
     sources: list[Source]
     root: Path
+    # Fragment files pulled in by ``include`` nodes, in merge order
+    fragments: list[Path] = []
 
 
-def parse_manifest(path: Path) -> Manifest:
-    """Parse a skills.kdl manifest file.
+class _Fragment(BaseModel):
+    """Validated contents of one manifest file, cached by content hash."""
 
-    Args:
-        path: Path to the skills.kdl file.
+    sources: list[Source]
+    includes: list[str] = []
+
+
+# Validates every source in one call, so all errors are reported together
+_SOURCES_ADAPTER = TypeAdapter(list[Source])
 
-    Returns:
-        Parsed Manifest object.
+
+def _format_errors(
+    error: ValidationError, raw: list[dict[str, object]], path: Path
+) -> str:
+    """Render validation errors as one line per failing field."""
+    lines: list[str] = []
+    for err in error.errors():
+        loc = err["loc"]
+        index = loc[0] if loc and isinstance(loc[0], int) else None
+        name = raw[index].get("name", "<unnamed>") if index is not None else "<unnamed>"
+        field = ".".join(str(part) for part in loc[1:]) or "source"
+        lines.append(f"Invalid source '{name}' in {path}: {field}: {err['msg']}")
+    return "\n".join(lines)
+
+
+def index_skills(sources: list[Source]) -> dict[str, int]:
+    """Map each literal skill name to the position of the source providing it.
+
+    Every skill lands in ``skills/<name>``, so two sources declaring the
+    same name would overwrite each other on every sync. Glob entries are
+    only known after listing upstream and are not indexed.
 
     Raises:
-        ManifestError: If the file cannot be parsed or validated.
+        ManifestError: If source names repeat or a skill name is declared
+            by more than one source. All conflicts are listed.
     """
-    try:
-        content = path.read_text(encoding="utf-8")
-    except OSError as e:
-        raise ManifestError(f"Cannot read manifest: {e}") from e
+    problems: list[str] = []
+
+    seen_names: dict[str, int] = {}
+    for i, source in enumerate(sources):
+        if source.name in seen_names:
+            problems.append(f"Duplicate source name '{source.name}'")
+        else:
+            seen_names[source.name] = i
+
+    index: dict[str, int] = {}
+    for i, source in enumerate(sources):
+        for skill in source.skills:
+            if is_skill_glob(skill):
+                continue
+            owner = index.setdefault(skill, i)
+            if owner != i:
+                problems.append(
+                    f"Skill '{skill}' is declared by both "
+                    f"'{sources[owner].name}' and '{source.name}'"
+                )
+
+    if problems:
+        raise ManifestError("\n".join(problems))
+    return index
+
+
+def check_expanded_skills(sources: list[Source]) -> None:
+    """Reject skills that two sources provide once their globs are expanded.
 
+    ``index_skills`` can only compare literal names. Run this on sources
+    returned by ``expand_source``, before anything is extracted, so a
+    glob matching another source's skill fails instead of flip-flopping.
+
+    Raises:
+        ManifestError: If a skill name is provided by more than one
+            source. All conflicts are listed.
+    """
+    owners: dict[str, str] = {}
+    problems: list[str] = []
+    for source in sources:
+        for skill in source.skills:
+            owner = owners.setdefault(skill, source.name)
+            if owner != source.name:
+                problems.append(
+                    f"Skill '{skill}' is provided by both '{owner}' and "
+                    f"'{source.name}' once their skill globs are expanded"
+                )
+    if problems:
+        raise ManifestError("\n".join(problems))
+
+
+# Parsed fragments keyed by the SHA-256 of their bytes
+_fragments: dict[str, _Fragment] = {}
+
+
+# Bumped whenever parsing changes, so older cached results are not reused
+_FRAGMENT_FORMAT = 2
+
+
+def _fragment_cache_path(digest: str) -> Path:
+    return cache_dir() / "manifests" / f"{digest}-v{_FRAGMENT_FORMAT}.json"
+
+
+def _parse_kdl(content: str, path: Path) -> _Fragment:
+    """Parse and validate the source and include nodes of one KDL file."""
     try:
-        doc = kdl.parse(content)
+        nodes = fastkdl.parse(content)
     except Exception as e:
         raise ManifestError(f"Invalid KDL syntax in {path}: {e}") from e
 
-    sources: list[Source] = []
-    for node in doc.nodes:
+    raw: list[dict[str, object]] = []
+    includes: list[str] = []
+    for node in nodes:
+        if node.name == "include":
+            if not node.args:
+                raise ManifestError(f"include in {path} needs a path or glob")
+            includes.append(str(node.args[0]))
+            continue
         if node.name != "source":
             continue
 
         props: dict[str, object] = {}
         skills: list[str] = []
+        exclude_skills: list[str] = []
+        include: list[str] = []
+        exclude: list[str] = []
 
         # Extract properties from node props (key=value syntax)
         for key, value in node.props.items():
@@ -95,18 +284,144 @@ def parse_manifest(path: Path) -> Manifest:
             if child.name == "skill":
                 if child.args:
                     skills.append(str(child.args[0]))
+            elif child.name == "exclude-skill":
+                if child.args:
+                    exclude_skills.append(str(child.args[0]))
+            elif child.name == "include":
+                if child.args:
+                    include.append(str(child.args[0]))
+            elif child.name == "exclude":
+                if child.args:
+                    exclude.append(str(child.args[0]))
             elif child.args:
                 # Single-argument child node: treat as key-value pair
                 props[child.name] = child.args[0]
 
         props["skills"] = skills
+        props["exclude_skills"] = exclude_skills
+        props["include"] = include
+        props["exclude"] = exclude
+        raw.append(props)
+
+    # One validation pass over every source in the file
+    try:
+        sources = _SOURCES_ADAPTER.validate_python(raw)
+    except ValidationError as e:
+        raise ManifestError(_format_errors(e, raw, path)) from e
+    return _Fragment(sources=sources, includes=includes)
+
+
+def _load_fragment(path: Path) -> _Fragment:
+    """Parse one manifest file, reusing the result for unchanged content.
+
+    Results are memoized in-process and stored under the cache's
+    ``manifests/`` directory, keyed by the file's SHA-256, so only files
+    whose bytes changed are parsed again. Invalid files are never cached.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        raise ManifestError(f"Cannot read manifest: {e}") from e
 
+    digest = hashlib.sha256(data).hexdigest()
+    fragment = _fragments.get(digest)
+    if fragment is not None:
+        return fragment
+
+    cached = _fragment_cache_path(digest)
+    try:
+        stored = cached.read_bytes()
+        fragment = _Fragment.model_validate_json(stored)
+    except (OSError, ValidationError):
         try:
-            source = Source.model_validate(props)
-        except Exception as e:
-            source_name = props.get("name", "<unnamed>")
-            raise ManifestError(f"Invalid source '{source_name}' in {path}: {e}") from e
+            content = data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise ManifestError(f"Cannot read manifest: {path}: {e}") from e
+        fragment = _parse_kdl(content, path)
+        _store_fragment(cached, fragment)
+    else:
+        index = cache_index()
+        index.record(index.key_for(cached), len(stored))
+
+    _fragments[digest] = fragment
+    return fragment
+
+
+def _store_fragment(target: Path, fragment: _Fragment) -> None:
+    """Write a parsed fragment to the cache, ignoring failures."""
+    content = fragment.model_dump_json()
+    try:
+        write_atomic(target, content)
+    except OSError:
+        return
+    index = cache_index()
+    index.record(index.key_for(target), len(content))
+
+
+def _resolve_includes(root: Path, patterns: list[str], path: Path) -> list[Path]:
+    """Expand include patterns relative to the manifest's directory."""
+    files: list[Path] = []
+    for pattern in patterns:
+        if Path(pattern).is_absolute():
+            raise ManifestError(
+                f"include '{pattern}' in {path} must be relative to the manifest"
+            )
+        matches = sorted(p for p in root.glob(pattern) if p.is_file())
+        if not matches and not any(c in GLOB_CHARS for c in pattern):
+            raise ManifestError(f"Included file '{pattern}' not found")
+        # A broad glob may match the manifest itself; never include it
+        files.extend(m for m in matches if m != path and m not in files)
+    return files
+
+
+def _anchor_local_paths(sources: list[Source], base: Path) -> list[Source]:
+    """Make local directory repos absolute, relative to the declaring file."""
+    anchored: list[Source] = []
+    for source in sources:
+        repo = source.repo
+        if is_local_repo(repo) and not repo.startswith("file://"):
+            resolved = (base / Path(repo).expanduser()).resolve()
+            source = source.model_copy(update={"repo": str(resolved)})
+        anchored.append(source)
+    return anchored
+
+
+def manifest_files(path: Path) -> list[Path]:
+    """The manifest plus every fragment its include nodes currently match."""
+    fragment = _load_fragment(path)
+    return [path, *_resolve_includes(path.parent, fragment.includes, path)]
 
-        sources.append(source)
 
-    return Manifest(sources=sources, root=path.parent)
+def parse_manifest(path: Path) -> Manifest:
+    """Parse a skills.kdl manifest file and the fragments it includes.
+
+    ``include "teams/*.kdl"`` nodes pull in the source nodes of every
+    matching file, in sorted order after the manifest's own sources. Each
+    file is parsed and validated on its own and cached by content hash;
+    duplicate names and skill collisions are checked on the merged list.
+    Relative local ``repo`` paths resolve against the file declaring them.
+
+    Args:
+        path: Path to the skills.kdl file.
+
+    Returns:
+        Parsed Manifest object.
+
+    Raises:
+        ManifestError: If any file cannot be parsed or validated.
+    """
+    main = _load_fragment(path)
+    sources = _anchor_local_paths(main.sources, path.parent)
+    fragments = _resolve_includes(path.parent, main.includes, path)
+    for fragment_path in fragments:
+        fragment = _load_fragment(fragment_path)
+        if fragment.includes:
+            raise ManifestError(
+                f"include in {fragment_path} is not allowed: "
+                "only the top-level manifest may include files"
+            )
+        sources.extend(_anchor_local_paths(fragment.sources, fragment_path.parent))
+
+    # Cross-source checks run on the merged result, before any network work
+    index_skills(sources)
+    return Manifest(sources=sources, root=path.parent, fragments=fragments)
@@ -0,0 +1,154 @@
+"""Prefetch: warm the quiv cache without touching skills/."""
+
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import httpx
+
+from skill_quiver.archive import is_cached, remove_archive, verify_archive
+from skill_quiver.cache import archive_path
+from skill_quiver.errors import QuivError, SyncError
+from skill_quiver.manifest import Manifest, Source, is_local_repo
+from skill_quiver.schedule import (
+    FetchRecord,
+    Job,
+    Scheduler,
+    critical_path,
+    load_history,
+)
+from skill_quiver.sync import (
+    _is_forge,
+    _make_client,
+    expand_source,
+    forge_archive,
+    resolve_source_sha,
+    update_mirror,
+)
+
+DEFAULT_JOBS = 8
+
+
+def verify_mirror(mirror: Path) -> bool:
+    """Check that a git mirror's objects are present and connected.
+
+    A failing fsck means the mirror is broken, not that the check failed,
+    so its exit status is returned rather than raised.
+    """
+    result = subprocess.run(
+        [
+            "git",
+            "--git-dir",
+            str(mirror),
+            "fsck",
+            "--connectivity-only",
+            "--no-dangling",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.returncode == 0
+
+
+def _fetch_archive(client: httpx.Client, source: Source, sha: str) -> None:
+    """Ensure a verified archive of source at sha is in the cache."""
+    try:
+        archive = forge_archive(client, source, sha)
+    except SyncError:
+        archive = None
+    if archive is None or not verify_archive(archive):
+        # Corrupt cache entry: download once more before giving up
+        remove_archive(archive_path(str(source.repo), sha))
+        archive = forge_archive(client, source, sha)
+        if not verify_archive(archive):
+            remove_archive(archive)
+            raise SyncError(f"Archive for {source.name} at {sha[:8]} is corrupt")
+
+
+def _fetch_mirror(source: Source) -> None:
+    """Ensure a verified mirror of a git source is in the cache."""
+    mirror = update_mirror(source)
+    if not verify_mirror(mirror):
+        raise SyncError(f"Git mirror for {source.name} failed verification")
+
+
+def prefetch(
+    manifest: Manifest, jobs: int = DEFAULT_JOBS, byte_budget: int | None = None
+) -> None:
+    """Download every archive and git object a manifest needs into the cache.
+
+    Sources are resolved, wildcard listings are cached, and each distinct
+    forge (repo, SHA) archive or git mirror is fetched concurrently and
+    verified. skills/ and provenance are left alone.
+
+    Downloads are scheduled longest first by what each repository took
+    last time (see ``skill_quiver.schedule``); archives already cached
+    count as free. The critical path of the run is printed at the end.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        jobs: Maximum concurrent requests.
+        byte_budget: Maximum expected bytes of downloads in flight at once.
+
+    Raises:
+        SyncError: If any source fails to resolve, download, or verify.
+            Every source is attempted before the error is raised.
+    """
+    failures: list[str] = []
+
+    def resolve(source: Source) -> tuple[Source, str] | None:
+        try:
+            sha = resolve_source_sha(client, source)
+            return expand_source(client, source, sha), sha
+        except QuivError as e:
+            failures.append(f"{source.name}: {e.message}")
+            return None
+
+    history = load_history().repos
+    started = time.monotonic()
+    with _make_client() as client, ThreadPoolExecutor(max_workers=jobs) as pool:
+        resolved = [r for r in pool.map(resolve, manifest.sources) if r is not None]
+        resolving = time.monotonic() - started
+
+        # Jobs by label, in manifest order, with the source each is for
+        planned: dict[str, tuple[Source, Job]] = {}
+        for source, sha in resolved:
+            repo = str(source.repo)
+            if is_local_repo(source.repo):
+                # Already on disk; there is nothing to download
+                continue
+            if _is_forge(source):
+                label = f"{repo} at {sha[:8]}"
+                if label in planned:
+                    continue
+                expected = history.get(repo)
+                if is_cached(archive_path(repo, sha)):
+                    expected = FetchRecord(bytes=0, seconds=0.0)
+                job = Job(label, partial(_fetch_archive, client, source, sha), expected)
+            else:
+                label = f"{repo} (mirror)"
+                if label in planned:
+                    continue
+                job = Job(label, partial(_fetch_mirror, source), history.get(repo))
+            planned[label] = (source, job)
+
+        scheduler = Scheduler([job for _, job in planned.values()], byte_budget)
+        results = scheduler.run(pool, min(jobs, len(planned)))
+
+    by_label = {result.job.label: result for result in results}
+    for label, (source, _) in planned.items():
+        error = by_label[label].error
+        if error is None:
+            print(f"Fetched {label}")
+        else:
+            failures.append(f"{source.name}: {error.message}")
+    print(critical_path(results, before=resolving))
+
+    for failure in failures:
+        print(f"error: {failure}", file=sys.stderr)
+    if failures:
+        raise SyncError(f"Prefetch failed for {len(failures)} source(s)")
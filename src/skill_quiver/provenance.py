@@ -6,6 +6,7 @@ from pathlib import Path
 import kdl
 from pydantic import BaseModel
 
+from skill_quiver import fastkdl
 from skill_quiver.errors import SyncError
 
 PROVENANCE_FILENAME = ".source.kdl"
@@ -20,6 +21,9 @@ class Provenance(BaseModel):
     sha: str
     license: str | None = None
     fetched: datetime
+    # File filters the skill was extracted with
+    include: list[str] = []
+    exclude: list[str] = []
 
 
 def write_provenance(skill_dir: Path, provenance: Provenance) -> None:
@@ -29,7 +33,6 @@ def write_provenance(skill_dir: Path, provenance: Provenance) -> None:
         skill_dir: Path to the skill directory.
         provenance: Provenance data to write.
     """
-    doc = kdl.Document()
     node = kdl.Node(name="source")
     node.props["repo"] = provenance.repo
     node.props["path"] = provenance.path
@@ -38,10 +41,12 @@ def write_provenance(skill_dir: Path, provenance: Provenance) -> None:
     if provenance.license is not None:
         node.props["license"] = provenance.license
     node.props["fetched"] = provenance.fetched.isoformat()
-    doc.nodes.append(node)
+    for name in ("include", "exclude"):
+        for pattern in getattr(provenance, name):
+            node.nodes.append(kdl.Node(name=name, args=[pattern]))
 
     out_path = skill_dir / PROVENANCE_FILENAME
-    out_path.write_text(str(doc) + "\n", encoding="utf-8")
+    out_path.write_text(fastkdl.dumps([node]) + "\n", encoding="utf-8")
 
 
 def read_provenance(skill_dir: Path) -> Provenance | None:
@@ -62,15 +67,20 @@ def read_provenance(skill_dir: Path) -> Provenance | None:
 
     try:
         content = source_file.read_text(encoding="utf-8")
-        doc = kdl.parse(content)
+        nodes = fastkdl.parse(content)
     except Exception as e:
         raise SyncError(f"Cannot parse {source_file}: {e}") from e
 
-    for node in doc.nodes:
+    for node in nodes:
         if node.name == "source":
             props: dict[str, object] = {}
             for key, value in node.props.items():
                 props[key] = value
+            filters: dict[str, list[str]] = {"include": [], "exclude": []}
+            for child in node.nodes:
+                if child.name in filters and child.args:
+                    filters[child.name].append(str(child.args[0]))
+            props.update(filters)
             # Parse fetched as datetime
             if "fetched" in props and isinstance(props["fetched"], str):
                 props["fetched"] = datetime.fromisoformat(props["fetched"])
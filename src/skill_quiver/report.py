@@ -0,0 +1,92 @@
+"""Structured results of a sync run, and their text rendering."""
+
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from skill_quiver.manifest import Source
+
+SourceStatus = Literal["up-to-date", "pending", "synced", "failed"]
+
+
+class SyncOptions(BaseModel):
+    """Options for ``sync_async`` and ``sync_report``."""
+
+    dry_run: bool = False
+    # Sync only these sources (see ``select_sources``); None means all
+    sources: list[Source] | None = None
+    # Report failing sources and sync the rest, instead of stopping
+    keep_going: bool = False
+    # Seconds allowed per source and for the whole run; None is unbounded
+    source_timeout: float | None = None
+    deadline: float | None = None
+
+
+class SourceReport(BaseModel):
+    """What a sync did, or would do, for one source."""
+
+    name: str
+    status: SourceStatus
+    old_sha: str | None = None
+    # Empty for a source that failed
+    new_sha: str
+    # Stale skills: replaced when synced, to be replaced when pending
+    skills: list[str] = []
+    # Bytes written into skills/ for this source
+    bytes: int = 0
+    seconds: float = 0.0
+    # Why a failed source failed
+    error: str | None = None
+
+    def render(self) -> str:
+        """Render as the CLI's per-source output."""
+        match self.status:
+            case "up-to-date":
+                return f"{self.name}: up to date"
+            case "pending":
+                old = self.old_sha[:8] if self.old_sha else "none"
+                return (
+                    f"{self.name}: {old} -> {self.new_sha[:8]} "
+                    f"({len(self.skills)} skills)"
+                )
+            case "synced":
+                lines = [f"Syncing {self.name}..."]
+                lines.extend(f"  {skill}" for skill in self.skills)
+                return "\n".join(lines)
+            case "failed":
+                return f"{self.name}: failed: {self.error}"
+
+
+class SyncReport(BaseModel):
+    """Result of syncing one manifest."""
+
+    root: Path
+    dry_run: bool
+    sources: list[SourceReport] = []
+    seconds: float = 0.0
+
+    @property
+    def changed(self) -> list[SourceReport]:
+        """Sources that were synced, or would be in a dry run."""
+        return [s for s in self.sources if s.status in ("pending", "synced")]
+
+    @property
+    def failed(self) -> list[SourceReport]:
+        """Sources that failed under ``keep_going``."""
+        return [s for s in self.sources if s.status == "failed"]
+
+    @property
+    def bytes(self) -> int:
+        """Total bytes written into skills/."""
+        return sum(s.bytes for s in self.sources)
+
+    def render(self) -> str:
+        """Render the whole report as the CLI prints it."""
+        return "\n".join(s.render() for s in self.sources)
+
+    def failure_summary(self) -> str:
+        """One line per failed source, headed by a count."""
+        lines = [f"{len(self.failed)} of {len(self.sources)} sources failed:"]
+        lines.extend(f"  {s.name}: {s.error}" for s in self.failed)
+        return "\n".join(lines)
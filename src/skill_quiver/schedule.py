@@ -0,0 +1,182 @@
+"""Size-aware scheduling of concurrent downloads.
+
+Every archive download and mirror update records, per repository, how
+many bytes it fetched and how long it took (``record_fetch``). When
+``quiv fetch`` downloads concurrently, a ``Scheduler`` hands the jobs to
+its workers longest first, so the largest repository is not started
+after every other worker has gone idle. An optional byte budget keeps
+several huge downloads from sharing the link at once. The run ends with
+a report of its critical path.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from pydantic import BaseModel, ValidationError
+
+from skill_quiver.cache import cache_dir, format_size, lock_path
+from skill_quiver.errors import QuivError, SyncError
+from skill_quiver.locking import locked, write_atomic
+
+
+class FetchRecord(BaseModel):
+    """Size and duration of a repository's last download or mirror update."""
+
+    bytes: int
+    seconds: float
+
+
+class FetchHistory(BaseModel):
+    """Last fetch of every repository, keyed by repo URL."""
+
+    repos: dict[str, FetchRecord] = {}
+
+
+def history_path() -> Path:
+    """Where fetch history is kept in the cache."""
+    return cache_dir() / "history" / "fetches.json"
+
+
+def load_history() -> FetchHistory:
+    """Load the fetch history; a missing or unreadable file is empty."""
+    try:
+        return FetchHistory.model_validate_json(history_path().read_bytes())
+    except (OSError, ValidationError):
+        return FetchHistory()
+
+
+def record_fetch(repo: str, size: int, seconds: float) -> None:
+    """Remember how big a repository's fetch was and how long it took.
+
+    History only guides scheduling, so failing to write it is not an error.
+    """
+    path = history_path()
+    try:
+        with locked(lock_path(path), "the fetch history"):
+            history = load_history()
+            history.repos[repo] = FetchRecord(bytes=size, seconds=seconds)
+            write_atomic(path, history.model_dump_json())
+    except (OSError, QuivError):
+        pass
+
+
+class Job(NamedTuple):
+    """One download for the scheduler."""
+
+    # What is fetched, for output
+    label: str
+    run: Callable[[], object]
+    # Expected bytes and seconds, from history; None if never fetched
+    expected: FetchRecord | None
+
+
+class JobResult(NamedTuple):
+    """When a job ran, relative to the start of scheduling, and how it ended.
+
+    Exceptions other than QuivError are wrapped in a SyncError.
+    """
+
+    job: Job
+    started: float
+    finished: float
+    error: QuivError | None
+
+
+class Scheduler:
+    """Hand out jobs longest first, within a budget of bytes in flight.
+
+    Jobs with no history go first: any of them could be the largest.
+    A worker takes the longest pending job that fits in the budget, so
+    small jobs fill the link while a huge one waits. A job larger than
+    the whole budget runs once nothing else is in flight.
+    """
+
+    def __init__(self, jobs: list[Job], budget: int | None = None) -> None:
+        self.budget = budget
+        self._pending = sorted(
+            jobs,
+            key=lambda job: (
+                job.expected is not None,
+                -(job.expected.seconds if job.expected else 0.0),
+            ),
+        )
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._started = 0.0
+
+    @staticmethod
+    def _bytes(job: Job) -> int:
+        return job.expected.bytes if job.expected else 0
+
+    def _take(self) -> Job | None:
+        with self._cond:
+            while self._pending:
+                for i, job in enumerate(self._pending):
+                    size = self._bytes(job)
+                    if (
+                        self.budget is None
+                        or self._in_flight == 0
+                        or self._in_flight + size <= self.budget
+                    ):
+                        del self._pending[i]
+                        self._in_flight += size
+                        return job
+                self._cond.wait()
+            return None
+
+    def _work(self) -> list[JobResult]:
+        results: list[JobResult] = []
+        while (job := self._take()) is not None:
+            started = time.perf_counter() - self._started
+            error = None
+            try:
+                job.run()
+            except QuivError as e:
+                error = e
+            except Exception as e:
+                # e.g. a full disk; fail this job, not the whole schedule
+                error = SyncError(f"{type(e).__name__}: {e}")
+            finally:
+                with self._cond:
+                    self._in_flight -= self._bytes(job)
+                    self._cond.notify_all()
+            finished = time.perf_counter() - self._started
+            results.append(JobResult(job, started, finished, error))
+        return results
+
+    def run(self, pool: ThreadPoolExecutor, workers: int) -> list[JobResult]:
+        """Run every job on up to workers threads of pool.
+
+        Returns:
+            A result per job, in the order the jobs were taken.
+        """
+        self._started = time.perf_counter()
+        futures = [pool.submit(self._work) for _ in range(workers)]
+        results = [result for future in futures for result in future.result()]
+        return sorted(results, key=lambda result: result.started)
+
+
+def critical_path(results: list[JobResult], before: float = 0.0) -> str:
+    """Describe the chain of work that decided how long a run took.
+
+    Args:
+        results: Scheduled jobs of the run.
+        before: Seconds spent before scheduling started (e.g. resolving).
+    """
+    if not results:
+        return f"Critical path: {before:.1f}s resolving"
+    last = max(results, key=lambda result: result.finished)
+    size = (
+        f", {format_size(last.job.expected.bytes)} last time"
+        if last.job.expected
+        else ""
+    )
+    return (
+        f"Critical path: {before + last.finished:.1f}s = "
+        f"{before:.1f}s resolving + {last.started:.1f}s waiting + "
+        f"{last.finished - last.started:.1f}s fetching {last.job.label}{size}"
+    )
@@ -0,0 +1,94 @@
+"""Narrow a manifest to selected sources and skills before syncing."""
+
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from skill_quiver.errors import QuivError
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.provenance import read_provenance
+from skill_quiver.sync import installed_skills, provenance_matches
+
+
+def _skill_changed(source: Source, skill_dir: Path) -> bool:
+    """Whether a skill's provenance disagrees with its manifest entry."""
+    prov = read_provenance(skill_dir)
+    if prov is None:
+        return True
+    return (
+        not provenance_matches(prov, source)
+        or prov.ref != source.ref
+        or prov.license != source.license
+    )
+
+
+def _wildcard_changed(source: Source, skills_dir: Path) -> bool:
+    """Whether a wildcard source has no skills yet or any changed skill."""
+    installed = installed_skills(source, skills_dir)
+    if not installed:
+        return True
+    return any(_skill_changed(source, skills_dir / name) for name in installed)
+
+
+def select_sources(
+    manifest: Manifest,
+    source_names: list[str] | None = None,
+    skill_patterns: list[str] | None = None,
+    changed_only: bool = False,
+) -> list[Source]:
+    """Cut a manifest down to the sources and skills worth syncing.
+
+    Selection is purely local, so it runs before any network work.
+    Selected sources are copies whose ``skills`` list holds only the
+    matching skills. Wildcard sources keep their patterns and carry
+    ``--skill`` globs in ``only_skills``, applied once they are expanded.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        source_names: Keep only these sources.
+        skill_patterns: Keep only skills matching any of these globs.
+        changed_only: Keep only skills with no provenance, or whose
+            provenance records a different repo, path, ref, license, or
+            include/exclude filters than the manifest declares.
+
+    Returns:
+        Selected sources, in manifest order.
+
+    Raises:
+        QuivError: If a named source does not exist, or nothing matches.
+    """
+    skills_dir = manifest.root / "skills"
+    sources = manifest.sources
+
+    if source_names:
+        known = {s.name for s in sources}
+        unknown = sorted(set(source_names) - known)
+        if unknown:
+            raise QuivError(f"Unknown source(s): {', '.join(unknown)}")
+        sources = [s for s in sources if s.name in source_names]
+
+    selected: list[Source] = []
+    for source in sources:
+        if source.is_wildcard:
+            # Names are only known after listing upstream, so narrow lazily
+            if changed_only and not _wildcard_changed(source, skills_dir):
+                continue
+            if skill_patterns:
+                source = source.model_copy(update={"only_skills": skill_patterns})
+            selected.append(source)
+            continue
+
+        skills = source.skills
+        if skill_patterns:
+            skills = [
+                skill
+                for skill in skills
+                if any(fnmatchcase(skill, pattern) for pattern in skill_patterns)
+            ]
+        if changed_only:
+            skills = [s for s in skills if _skill_changed(source, skills_dir / s)]
+        if skills:
+            selected.append(source.model_copy(update={"skills": skills}))
+
+    if not selected and not changed_only:
+        raise QuivError("No sources or skills match the selection")
+    return selected
@@ -0,0 +1,274 @@
+"""Sharded sync: split a manifest across CI workers and merge the results."""
+
+import hashlib
+import shutil
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from skill_quiver.cache import blob_store, enforce_budget
+from skill_quiver.catalog import (
+    RecordedSkill,
+    read_catalog,
+    recording,
+    update_catalog,
+)
+from skill_quiver.errors import ManifestError, QuivError, SyncError
+from skill_quiver.locking import project_lock
+from skill_quiver.manifest import Manifest, Source, check_expanded_skills
+from skill_quiver.sync import (
+    _make_client,
+    describe_pending,
+    expand_source,
+    find_stale_skills,
+    generate_license_file,
+    installed_skills,
+    resolve_source_sha,
+    sync_source,
+)
+
+FRAGMENT_FILENAME = "fragment.json"
+
+
+class Fragment(BaseModel):
+    """Metadata describing one shard's sync output."""
+
+    shard: int
+    total: int
+    sources: list[str]
+    skills: list[str]
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse an ``i/N`` shard spec (1-based).
+
+    Raises:
+        QuivError: If the spec is malformed or out of range.
+    """
+    index_str, sep, total_str = spec.partition("/")
+    try:
+        if not sep:
+            raise ValueError
+        index, total = int(index_str), int(total_str)
+    except ValueError:
+        raise QuivError(f"Invalid shard '{spec}': expected I/N, e.g. 1/4") from None
+    if total < 1 or not 1 <= index <= total:
+        raise QuivError(f"Invalid shard '{spec}': need 1 <= I <= N")
+    return index, total
+
+
+def source_weight(source: Source, skills_dir: Path) -> int:
+    """Historical size of a source: bytes of its skills currently on disk."""
+    total = 0
+    for skill_name in installed_skills(source, skills_dir):
+        skill_dir = skills_dir / skill_name
+        if skill_dir.is_dir():
+            total += sum(p.stat().st_size for p in skill_dir.rglob("*") if p.is_file())
+    return total
+
+
+def _stable_hash(name: str) -> int:
+    """Hash a source name identically on every machine and Python run."""
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big")
+
+
+def partition_sources(
+    sources: list[Source], total: int, weights: dict[str, int]
+) -> list[list[Source]]:
+    """Split sources into ``total`` shards of roughly equal weight.
+
+    Sources are placed heaviest first onto the lightest shard, with ties
+    broken by a stable hash of the source name, so every worker computes
+    the same partition from the same checkout. Sources with no history
+    are weighted as the mean of those that have one.
+
+    Args:
+        sources: Sources to partition.
+        total: Number of shards.
+        weights: Historical size per source name.
+
+    Returns:
+        One list of sources per shard, in shard order.
+    """
+    known = [w for w in weights.values() if w > 0]
+    default = sum(known) // len(known) if known else 1
+
+    def weight(source: Source) -> int:
+        return weights.get(source.name) or default
+
+    ordered = sorted(sources, key=lambda s: (-weight(s), _stable_hash(s.name)))
+    shards: list[list[Source]] = [[] for _ in range(total)]
+    loads = [0] * total
+    for source in ordered:
+        target = min(range(total), key=lambda i: (loads[i], i))
+        shards[target].append(source)
+        loads[target] += weight(source)
+    return shards
+
+
+def select_shard(manifest: Manifest, index: int, total: int) -> list[Source]:
+    """Return the sources assigned to shard ``index`` of ``total``."""
+    skills_dir = manifest.root / "skills"
+    weights = {s.name: source_weight(s, skills_dir) for s in manifest.sources}
+    return partition_sources(manifest.sources, total, weights)[index - 1]
+
+
+def sync_shard(
+    manifest: Manifest, index: int, total: int, out_dir: Path, dry_run: bool = False
+) -> None:
+    """Sync one shard's sources into a fragment directory.
+
+    Staleness is judged against the project's skills/, but refreshed
+    skills are written to ``out_dir/skills`` together with a fragment.json
+    for ``quiv merge``.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        index: 1-based shard index.
+        total: Number of shards.
+        out_dir: Fragment output directory.
+        dry_run: If True, report what would change without writing files.
+
+    Raises:
+        ManifestError: If two sources provide the same skill.
+    """
+    skills_dir = manifest.root / "skills"
+    sources = select_shard(manifest, index, total)
+    out_skills = out_dir / "skills"
+    print(f"Shard {index}/{total}: {len(sources)} source(s)")
+
+    if not dry_run:
+        out_skills.mkdir(parents=True, exist_ok=True)
+
+    store = blob_store()
+    synced: list[str] = []
+
+    with _make_client() as client, recording() as recorder:
+        resolved: list[tuple[Source, str]] = []
+        for source in sources:
+            sha = resolve_source_sha(client, source)
+            resolved.append((expand_source(client, source, sha), sha))
+        # Other shards' globs are checked when their fragments are merged
+        names = {source.name for source in sources}
+        check_expanded_skills(
+            [s for s in manifest.sources if not s.is_wildcard and s.name not in names]
+            + [source for source, _ in resolved]
+        )
+
+        for source, sha in resolved:
+            stale_skills = find_stale_skills(source, sha, skills_dir)
+
+            if not stale_skills:
+                print(f"{source.name}: up to date")
+                continue
+
+            if dry_run:
+                print(describe_pending(source, sha, stale_skills, skills_dir))
+                continue
+
+            print(f"Syncing {source.name}...")
+            written = sync_source(client, source, sha, out_skills, [], store)
+            for skill_name in written:
+                print(f"  {skill_name}")
+            synced.extend(written)
+
+    if not dry_run:
+        fragment = Fragment(
+            shard=index,
+            total=total,
+            sources=[s.name for s in sources],
+            skills=sorted(synced),
+        )
+        (out_dir / FRAGMENT_FILENAME).write_text(
+            fragment.model_dump_json(indent=2) + "\n", encoding="utf-8"
+        )
+        update_catalog(out_skills, recorder.take(out_skills))
+        enforce_budget(skills_dir)
+
+
+def read_fragment(fragment_dir: Path) -> Fragment:
+    """Read fragment.json from a shard output directory.
+
+    Raises:
+        SyncError: If the file is missing or invalid.
+    """
+    path = fragment_dir / FRAGMENT_FILENAME
+    try:
+        return Fragment.model_validate_json(path.read_text(encoding="utf-8"))
+    except OSError as e:
+        raise SyncError(f"Cannot read fragment {path}: {e}") from e
+    except ValidationError as e:
+        raise SyncError(f"Invalid fragment {path}: {e}") from e
+
+
+def merge_fragments(manifest: Manifest, fragment_dirs: list[Path]) -> None:
+    """Merge shard fragments into the project's skills/.
+
+    Every shard of the same split must be present exactly once. Skills
+    refreshed by a shard replace the project's copy, provenance included,
+    and THIRD_PARTY_LICENSES is regenerated from the full manifest. Their
+    catalog entries are taken from each fragment's skills/index.json.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        fragment_dirs: Output directories from ``quiv sync --shard``.
+
+    Raises:
+        ManifestError: If two shards wrote the same skill.
+        SyncError: If fragments are missing, duplicated, or inconsistent.
+    """
+    fragments = [(d, read_fragment(d)) for d in fragment_dirs]
+    if not fragments:
+        raise SyncError("No fragments to merge")
+
+    totals = {f.total for _, f in fragments}
+    if len(totals) != 1:
+        raise SyncError(f"Fragments come from different splits: N={sorted(totals)}")
+    total = totals.pop()
+
+    indices = sorted(f.shard for _, f in fragments)
+    if indices != list(range(1, total + 1)):
+        raise SyncError(
+            f"Expected shards 1..{total} exactly once, got {', '.join(map(str, indices))}"
+        )
+
+    # Globs of sources in different shards were never expanded together
+    owners: dict[str, int] = {}
+    problems: list[str] = []
+    for _, fragment in fragments:
+        for skill_name in fragment.skills:
+            owner = owners.setdefault(skill_name, fragment.shard)
+            if owner != fragment.shard:
+                problems.append(
+                    f"Skill '{skill_name}' was written by shards {owner} "
+                    f"and {fragment.shard}"
+                )
+    if problems:
+        raise ManifestError("\n".join(problems))
+
+    skills_dir = manifest.root / "skills"
+
+    with project_lock(manifest.root):
+        written: dict[str, RecordedSkill] = {}
+        for fragment_dir, fragment in fragments:
+            catalog = read_catalog(fragment_dir / "skills")
+            for skill_name in fragment.skills:
+                src = fragment_dir / "skills" / skill_name
+                if not src.is_dir():
+                    raise SyncError(
+                        f"Fragment {fragment_dir} is missing skill {skill_name}"
+                    )
+                dest = skills_dir / skill_name
+                if dest.exists():
+                    shutil.rmtree(dest)
+                shutil.move(src, dest)
+                if catalog is not None and skill_name in catalog.skills:
+                    # Moved files keep their contents but not their stamps
+                    written[skill_name] = RecordedSkill(
+                        catalog.skills[skill_name], None
+                    )
+                print(f"  {skill_name}")
+            print(f"Merged shard {fragment.shard}/{total}")
+
+        generate_license_file(manifest, manifest.root)
+        update_catalog(skills_dir, written)
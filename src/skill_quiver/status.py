@@ -0,0 +1,218 @@
+"""Offline integrity checks of skills/ against skills/index.json.
+
+Each skill's Merkle hash in the catalog (see ``skill_quiver.catalog``)
+is recomputed from the files on disk. ``check_skills`` trusts a file
+whose size and mtime still match its stamp and only re-reads the rest,
+which is what ``quiv status`` runs; with ``full`` every file is re-read,
+in parallel, which is ``quiv verify``. Neither touches the network.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from skill_quiver.catalog import (
+    Catalog,
+    FileStamp,
+    SkillStamps,
+    Stamps,
+    hash_file,
+    read_catalog,
+    read_stamps,
+    save_stamps,
+    skill_names,
+    tree_hash,
+    walk_skill,
+)
+from skill_quiver.errors import QuivError
+from skill_quiver.manifest import Manifest
+from skill_quiver.provenance import PROVENANCE_FILENAME
+from skill_quiver.sync import installed_skills
+
+DEFAULT_VERIFY_JOBS = min(8, os.cpu_count() or 1)
+
+SkillState = Literal["modified", "missing", "orphaned"]
+
+
+class SkillProblem(BaseModel):
+    """A skill that does not match the manifest or the catalog."""
+
+    name: str
+    state: SkillState
+    detail: str
+
+    def render(self) -> str:
+        """Render as the CLI's per-skill output."""
+        return f"{self.state}: {self.name} ({self.detail})"
+
+
+class StatusReport(BaseModel):
+    """Result of checking a project's skills/."""
+
+    # Skills on disk whose contents were checked
+    checked: int = 0
+    # Files that had to be read and hashed
+    hashed: int = 0
+    problems: list[SkillProblem] = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether every skill is present, claimed and unmodified."""
+        return not self.problems
+
+    def summary(self) -> str:
+        """One-line summary for the CLI."""
+        if self.ok:
+            return f"{self.checked} skills match skills/index.json"
+        return f"{len(self.problems)} of {self.checked} skills differ"
+
+
+def _claimed_skills(manifest: Manifest, skills_dir: Path) -> tuple[set[str], set[str]]:
+    """Skills the manifest names outright, and every skill it provides."""
+    named: set[str] = set()
+    claimed: set[str] = set()
+    for source in manifest.sources:
+        skills = installed_skills(source, skills_dir)
+        claimed.update(skills)
+        if not source.is_wildcard:
+            named.update(skills)
+    return named, claimed
+
+
+def _compare_files(expected: list[str], found: set[str]) -> str | None:
+    added = len(found - set(expected))
+    removed = len(set(expected) - found)
+    if not added and not removed:
+        return None
+    parts = []
+    if added:
+        parts.append(f"{added} added")
+    if removed:
+        parts.append(f"{removed} removed")
+    return ", ".join(parts) + (" file" if added + removed == 1 else " files")
+
+
+def check_skills(
+    manifest: Manifest, full: bool = False, jobs: int | None = None
+) -> StatusReport:
+    """Check skills/ against the manifest and skills/index.json, offline.
+
+    A skill is missing if the manifest or the catalog expects it and its
+    directory is gone, orphaned if no manifest source provides it, and
+    modified if it has no provenance or catalog entry, or its files no
+    longer hash to the catalog's Merkle hash. Skills found intact have
+    their stamps refreshed, so the next check can skip reading them.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        full: Re-hash every file instead of trusting unchanged stamps.
+        jobs: Files hashed in parallel (default: up to 8).
+
+    Returns:
+        The problems found, and how much was checked.
+
+    Raises:
+        QuivError: If skills/ has skills but no readable index.json.
+    """
+    skills_dir = manifest.root / "skills"
+    present = skill_names(skills_dir) if skills_dir.is_dir() else set()
+    catalog = read_catalog(skills_dir)
+    if catalog is None:
+        if present:
+            raise QuivError(
+                f"No skills/index.json in {manifest.root}; "
+                "run 'quiv sync' to record skill hashes"
+            )
+        catalog = Catalog()
+
+    named, claimed = _claimed_skills(manifest, skills_dir)
+    stamps = read_stamps(skills_dir)
+    report = StatusReport()
+
+    # Skills to hash: name -> files on disk, and which of them need reading
+    listed: dict[str, dict[str, os.stat_result]] = {}
+    to_read: list[tuple[str, str]] = []
+    for name in sorted(present | named | catalog.skills.keys()):
+        entry = catalog.skills.get(name)
+        if name not in present:
+            report.problems.append(
+                SkillProblem(name=name, state="missing", detail="directory not found")
+            )
+            continue
+        report.checked += 1
+        skill_dir = skills_dir / name
+        if name not in claimed:
+            detail = "not provided by any source in skills.kdl"
+            report.problems.append(
+                SkillProblem(name=name, state="orphaned", detail=detail)
+            )
+            continue
+        if entry is None:
+            detail = "not in skills/index.json"
+            report.problems.append(
+                SkillProblem(name=name, state="modified", detail=detail)
+            )
+            continue
+        if not (skill_dir / PROVENANCE_FILENAME).is_file():
+            detail = f"no {PROVENANCE_FILENAME}"
+            report.problems.append(
+                SkillProblem(name=name, state="modified", detail=detail)
+            )
+            continue
+
+        files = walk_skill(skill_dir)
+        difference = _compare_files(entry.files, set(files))
+        if difference is not None:
+            report.problems.append(
+                SkillProblem(name=name, state="modified", detail=difference)
+            )
+            continue
+
+        listed[name] = files
+        known = stamps.skills.get(name)
+        # Stamps taken for other contents say nothing about these
+        trusted = known if not full and known and known.hash == entry.hash else None
+        for rel_path, st in files.items():
+            stamp = trusted.files.get(rel_path) if trusted else None
+            if (
+                stamp is None
+                or stamp.size != st.st_size
+                or stamp.mtime_ns != st.st_mtime_ns
+            ):
+                to_read.append((name, rel_path))
+
+    digests: dict[tuple[str, str], str] = {}
+    if to_read:
+        with ThreadPoolExecutor(max_workers=jobs or DEFAULT_VERIFY_JOBS) as pool:
+            paths = [skills_dir / name / rel_path for name, rel_path in to_read]
+            digests = dict(zip(to_read, pool.map(hash_file, paths)))
+        report.hashed = len(to_read)
+
+    refreshed = dict(stamps.skills)
+    for name, files in listed.items():
+        entry = catalog.skills[name]
+        known = stamps.skills.get(name)
+        file_stamps: dict[str, FileStamp] = {}
+        for rel_path, st in files.items():
+            digest = digests.get((name, rel_path))
+            if digest is None:
+                assert known is not None
+                digest = known.files[rel_path].digest
+            file_stamps[rel_path] = FileStamp(digest, st.st_size, st.st_mtime_ns)
+
+        digest_map = {rel_path: stamp.digest for rel_path, stamp in file_stamps.items()}
+        if tree_hash(digest_map) == entry.hash:
+            refreshed[name] = SkillStamps(hash=entry.hash, files=file_stamps)
+        else:
+            report.problems.append(
+                SkillProblem(name=name, state="modified", detail="contents changed")
+            )
+            refreshed.pop(name, None)
+
+    report.problems.sort(key=lambda problem: problem.name)
+    if refreshed != stamps.skills:
+        save_stamps(skills_dir, Stamps(skills=refreshed))
+    return report
@@ -1,41 +1,128 @@
 """Sync engine: resolve manifest and make skills/ match it."""
 
+import asyncio
+import contextlib
 import os
+import re
 import shutil
 import subprocess
 import tarfile
 import tempfile
+import time
+from collections.abc import Callable, Mapping
 from datetime import datetime, timezone
+from fnmatch import fnmatchcase
 from pathlib import Path
+from typing import IO
 from urllib.parse import urlparse
 
 import httpx
 
-from skill_quiver.errors import SyncError
-from skill_quiver.manifest import Manifest, Source
+from skill_quiver.archive import (
+    ArchiveIndex,
+    index_path,
+    is_cached,
+    load_index,
+    read_range,
+    store_gzip_tarball,
+)
+from skill_quiver.cache import (
+    BlobStore,
+    archive_path,
+    blob_store,
+    cache_index,
+    enforce_budget,
+    lock_path,
+    mirror_path,
+    read_listing,
+    tree_size,
+    write_listing,
+)
+from skill_quiver.catalog import recording, update_catalog
+from skill_quiver.errors import DeadlineError, SyncError, UnavailableError
+from skill_quiver.filters import sparse_patterns
+from skill_quiver.hosts import ForgeHost, forge_host
+from skill_quiver.journal import (
+    SyncJournal,
+    clear_journal,
+    load_journal,
+    save_journal,
+)
+from skill_quiver.limits import (
+    HTTP_TIMEOUT,
+    CircuitBreaker,
+    check_deadline,
+    deadline,
+    host_key,
+    http_timeout,
+    process_timeout,
+)
+from skill_quiver.local import (
+    is_local_dir,
+    is_settled,
+    list_local_skills,
+    local_path,
+    resolve_local_sha,
+)
+from skill_quiver.locking import locked, project_lock
+from skill_quiver.manifest import (
+    NAME_PATTERN,
+    Manifest,
+    Source,
+    check_expanded_skills,
+    is_local_repo,
+    is_skill_glob,
+)
 from skill_quiver.provenance import Provenance, read_provenance, write_provenance
+from skill_quiver.report import SourceReport, SyncOptions, SyncReport
+from skill_quiver.schedule import record_fetch
+from skill_quiver.writer import SkillWriter
 
 
 def _make_client() -> httpx.Client:
-    """Create an httpx client with optional GitHub token auth."""
+    """Create an httpx client for forge APIs.
+
+    Tokens are not set here; each request carries its own host's token
+    (see ``ForgeHost.auth_headers``), so no token leaks to another forge.
+    """
     headers: dict[str, str] = {
         "Accept": "application/vnd.github.v3+json",
     }
-    token = os.environ.get("GITHUB_TOKEN")
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
     return httpx.Client(
         headers=headers,
-        timeout=httpx.Timeout(30.0, connect=10.0),
+        timeout=HTTP_TIMEOUT,
         follow_redirects=True,
     )
 
 
-def _is_github(source: Source) -> bool:
-    """Check if a source is hosted on GitHub."""
-    parsed = urlparse(str(source.repo))
-    return parsed.hostname in ("github.com", "www.github.com")
+def _http_error(what: str, e: httpx.HTTPError) -> SyncError:
+    """Wrap an httpx failure, marking failures of the host itself.
+
+    Timeouts, connection errors, 429 and 5xx answers become
+    UnavailableError, which the circuit breaker counts. Other 4xx answers
+    are about the request (a missing repo or ref) and stay SyncError.
+    """
+    if isinstance(e, httpx.HTTPStatusError):
+        status = e.response.status_code
+        error = UnavailableError if status >= 500 or status == 429 else SyncError
+        return error(f"Failed to {what}: HTTP {status}")
+    return UnavailableError(f"Failed to {what}: {e}")
+
+
+def _is_forge(source: Source) -> bool:
+    """Check if a source's forge serves commits and archives over HTTP.
+
+    Sources on other hosts are fetched with git.
+    """
+    return forge_host(str(source.repo)) is not None
+
+
+def _forge_host(source: Source) -> ForgeHost:
+    """The forge serving a source."""
+    host = forge_host(str(source.repo))
+    if host is None:
+        raise SyncError(f"No forge API is configured for {source.repo}")
+    return host
 
 
 def _parse_github_repo(source: Source) -> tuple[str, str]:
@@ -47,8 +134,23 @@ def _parse_github_repo(source: Source) -> tuple[str, str]:
     return parts[0], parts[1].removesuffix(".git")
 
 
+def _forge_project(source: Source, host: ForgeHost) -> str:
+    """The project path a forge API knows a source's repo by.
+
+    ``owner/repo`` for GitHub and Gitea. GitLab projects may sit in
+    nested groups, so the whole path is used.
+    """
+    if host.kind != "gitlab":
+        return "/".join(_parse_github_repo(source))
+    path = urlparse(str(source.repo)).path.strip("/")
+    path = path.split("/-/")[0].removesuffix(".git")
+    if path.count("/") < 1:
+        raise SyncError(f"Invalid GitLab repo URL: {source.repo}")
+    return path
+
+
 def resolve_sha(client: httpx.Client, source: Source) -> str:
-    """Get the latest commit SHA for a source via GitHub API.
+    """Get the latest commit SHA for a source via its forge API.
 
     Args:
         client: httpx client instance.
@@ -60,138 +162,709 @@ def resolve_sha(client: httpx.Client, source: Source) -> str:
     Raises:
         SyncError: If the API call fails.
     """
-    owner, repo = _parse_github_repo(source)
-    url = f"https://api.github.com/repos/{owner}/{repo}/commits/{source.ref}"
+    sha, _ = resolve_sha_conditional(client, source)
+    return sha
+
+
+def resolve_sha_conditional(
+    client: httpx.Client,
+    source: Source,
+    etag: str | None = None,
+    previous: str | None = None,
+) -> tuple[str, str | None]:
+    """Resolve a source's commit SHA with an ``If-None-Match`` request.
+
+    A 304 Not Modified answer does not count against the GitHub rate
+    limit, which makes this cheap enough to poll. Forges that ignore the
+    header just answer 200.
+
+    Args:
+        client: httpx client instance.
+        source: Source to resolve.
+        etag: ETag from the previous response, if any.
+        previous: SHA returned alongside that ETag.
+
+    Returns:
+        Tuple of (sha, etag). The SHA is ``previous`` when upstream
+        answered 304.
+
+    Raises:
+        SyncError: If the API call fails.
+    """
+    host = _forge_host(source)
+    headers = host.auth_headers()
+    if etag is not None and previous is not None:
+        headers["If-None-Match"] = etag
 
+    url = host.commit_url(_forge_project(source, host), source.ref)
+    what = f"resolve SHA for {source.name}"
     try:
-        response = client.get(url)
+        response = client.get(url, headers=headers, timeout=http_timeout(what))
+        if response.status_code == 304 and previous is not None:
+            return previous, etag
         response.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        raise SyncError(
-            f"Failed to resolve SHA for {source.name}: HTTP {e.response.status_code}"
-        ) from e
     except httpx.HTTPError as e:
-        raise SyncError(f"Failed to resolve SHA for {source.name}: {e}") from e
+        raise _http_error(what, e) from e
+
+    sha = host.sha_from(response.json())
+    if sha is None:
+        raise SyncError(f"Failed to resolve SHA for {source.name}: ref not found")
+    return sha, response.headers.get("etag")
+
 
-    data = response.json()
-    return data["sha"]
+def resolve_source_sha(client: httpx.Client, source: Source) -> str:
+    """Resolve the SHA a source's provenance is compared against.
 
+    Forge sources are resolved through the forge API and local sources
+    from disk (see ``resolve_local_sha``). Other hosts use the declared
+    ref as-is.
+    """
+    if is_local_repo(source.repo):
+        return resolve_local_sha(source)
+    if _is_forge(source):
+        return resolve_sha(client, source)
+    return source.ref
+
+
+COMMIT_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
 
-def fetch_github_tarball(
+
+def _get(
     client: httpx.Client,
-    source: Source,
-    sha: str,
-    dest: Path,
-) -> list[Path]:
-    """Download and extract a GitHub tarball for specific skills.
+    url: str,
+    what: str,
+    headers: Mapping[str, str] | None = None,
+) -> httpx.Response:
+    """GET a URL, wrapping failures in SyncError."""
+    try:
+        response = client.get(url, headers=headers, timeout=http_timeout(what))
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise _http_error(what, e) from e
+    return response
+
+
+def _get_json(
+    client: httpx.Client,
+    url: str,
+    what: str,
+    headers: Mapping[str, str] | None = None,
+) -> object:
+    """GET a JSON document, wrapping failures in SyncError."""
+    return _get(client, url, what, headers).json()
+
+
+def _skill_names_from_paths(paths: list[str], source: Source) -> list[str]:
+    """Pick skill directories (those with a SKILL.md) under a source's path."""
+    source_path = source.path.strip("/")
+    prefix = f"{source_path}/" if source_path and source_path != "." else ""
+    names: set[str] = set()
+    for path in paths:
+        if not path.startswith(prefix) or not path.endswith("/SKILL.md"):
+            continue
+        name = path[len(prefix) : -len("/SKILL.md")]
+        if NAME_PATTERN.match(name) and len(name) <= 64:
+            names.add(name)
+    return sorted(names)
+
+
+def _blob_paths(entries: object) -> list[str]:
+    """File paths from a GitHub, GitLab, or Gitea tree listing."""
+    if not isinstance(entries, list):
+        return []
+    return [entry["path"] for entry in entries if entry.get("type") == "blob"]
+
+
+def list_github_skills(
+    client: httpx.Client, source: Source, sha: str, host: ForgeHost
+) -> list[str]:
+    """List skill names under a GitHub source's path with one tree request.
+
+    Uses the recursive git trees API. If GitHub truncates the tree, falls
+    back to a single contents listing of the source path.
+    """
+    base = host.repo_url(_forge_project(source, host))
+    headers = host.auth_headers()
+    what = f"list skills for {source.name}"
+
+    data = _get_json(client, f"{base}/git/trees/{sha}?recursive=1", what, headers)
+    if isinstance(data, dict) and not data.get("truncated"):
+        return _skill_names_from_paths(_blob_paths(data.get("tree")), source)
+
+    source_path = source.path.strip("/")
+    if source_path == ".":
+        source_path = ""
+    entries = _get_json(
+        client, f"{base}/contents/{source_path}?ref={sha}", what, headers
+    )
+    if not isinstance(entries, list):
+        raise SyncError(f"Failed to {what}: {source.path} is not a directory")
+    return sorted(
+        entry["name"]
+        for entry in entries
+        if entry["type"] == "dir" and NAME_PATTERN.match(entry["name"])
+    )
+
+
+def list_gitlab_skills(
+    client: httpx.Client, source: Source, sha: str, host: ForgeHost
+) -> list[str]:
+    """List skill names from GitLab's recursive tree of the source path.
+
+    The tree is paginated; pages are followed through the Link header.
+    """
+    base = host.repo_url(_forge_project(source, host))
+    headers = host.auth_headers()
+    what = f"list skills for {source.name}"
+
+    params = {"ref": sha, "recursive": "true", "per_page": "100"}
+    source_path = source.path.strip("/")
+    if source_path and source_path != ".":
+        params["path"] = source_path
+    url: str | None = str(httpx.URL(f"{base}/repository/tree", params=params))
+
+    paths: list[str] = []
+    while url is not None:
+        response = _get(client, url, what, headers)
+        paths.extend(_blob_paths(response.json()))
+        url = response.links.get("next", {}).get("url")
+    return _skill_names_from_paths(paths, source)
+
+
+def list_gitea_skills(
+    client: httpx.Client, source: Source, sha: str, host: ForgeHost
+) -> list[str]:
+    """List skill names from Gitea's recursive git tree, page by page."""
+    base = host.repo_url(_forge_project(source, host))
+    headers = host.auth_headers()
+    what = f"list skills for {source.name}"
+
+    paths: list[str] = []
+    page = 1
+    while True:
+        url = f"{base}/git/trees/{sha}?recursive=true&per_page=1000&page={page}"
+        data = _get_json(client, url, what, headers)
+        if not isinstance(data, dict):
+            raise SyncError(f"Failed to {what}: unexpected tree response")
+        paths.extend(_blob_paths(data.get("tree")))
+        if not data.get("truncated"):
+            return _skill_names_from_paths(paths, source)
+        page += 1
+
+
+def list_git_skills(source: Source) -> list[str]:
+    """List skill names under a git source's path from a blobless clone."""
+    if shutil.which("git") is None:
+        raise SyncError(
+            "git is not installed. Required for sources on plain git hosts. "
+            "Install git or configure the host's forge (see quiv's config file)."
+        )
+
+    source_path = source.path.strip("/")
+    pathspec = [source_path] if source_path and source_path != "." else []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo_dir = Path(tmp_dir) / "repo"
+        try:
+            subprocess.run(
+                [
+                    "git",
+                    "clone",
+                    "--depth",
+                    "1",
+                    "--filter=blob:none",
+                    "--no-checkout",
+                    "--branch",
+                    source.ref,
+                    str(source.repo),
+                    str(repo_dir),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=process_timeout(f"list skills for {source.name}"),
+            )
+            result = subprocess.run(
+                ["git", "ls-tree", "-r", "--name-only", "HEAD", "--", *pathspec],
+                cwd=repo_dir,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise SyncError(
+                f"Failed to list skills for {source.name}: {e.stderr}"
+            ) from e
+        except subprocess.TimeoutExpired as e:
+            raise DeadlineError(
+                f"Deadline exceeded listing skills for {source.name}"
+            ) from e
+    return _skill_names_from_paths(result.stdout.splitlines(), source)
+
+
+def list_skills(client: httpx.Client, source: Source, sha: str) -> list[str]:
+    """List the skills available to a source at sha.
+
+    Listings for a full commit SHA are cached, so later syncs at the same
+    commit do not list again.
+    """
+    if is_local_dir(source):
+        return list_local_skills(source)
+
+    cacheable = COMMIT_SHA_PATTERN.match(sha) is not None
+    repo = str(source.repo)
+    if cacheable:
+        cached = read_listing(repo, sha, source.path)
+        if cached is not None:
+            return cached
+
+    host = forge_host(repo)
+    match host.kind if host is not None else None:
+        case "github":
+            names = list_github_skills(client, source, sha, host)
+        case "gitlab":
+            names = list_gitlab_skills(client, source, sha, host)
+        case "gitea":
+            names = list_gitea_skills(client, source, sha, host)
+        case _:
+            names = list_git_skills(source)
+
+    if cacheable:
+        write_listing(repo, sha, source.path, names)
+    return names
+
+
+def _matches_any(name: str, patterns: list[str]) -> bool:
+    return any(fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def expand_source(client: httpx.Client, source: Source, sha: str) -> Source:
+    """Expand a source's skill globs and exclusions into concrete names.
+
+    Args:
+        client: httpx client instance.
+        source: Source definition, possibly with glob entries.
+        sha: Resolved upstream SHA to list.
+
+    Returns:
+        The source itself if it has no globs, otherwise a copy whose
+        ``skills`` lists concrete skill names.
+
+    Raises:
+        SyncError: If listing fails or nothing matches.
+    """
+    if not source.is_wildcard and not source.only_skills:
+        return source
+
+    available = list_skills(client, source, sha) if source.is_wildcard else []
+    names: list[str] = []
+    for entry in source.skills:
+        if is_skill_glob(entry):
+            names.extend(n for n in available if fnmatchcase(n, entry))
+        else:
+            names.append(entry)
+
+    names = [
+        n for n in dict.fromkeys(names) if not _matches_any(n, source.exclude_skills)
+    ]
+    if source.only_skills:
+        names = [n for n in names if _matches_any(n, source.only_skills)]
+    if not names:
+        raise SyncError(f"No skills in {source.name} match {', '.join(source.skills)}")
+
+    return source.model_copy(
+        update={"skills": names, "exclude_skills": [], "only_skills": []}
+    )
+
+
+def installed_skills(source: Source, skills_dir: Path) -> list[str]:
+    """Names of skills in skills/ that a source provides.
+
+    For sources with literal skill lists this is just ``source.skills``.
+    For wildcard sources it is every skill whose provenance points at the
+    source's repo and path and whose name matches its patterns.
+    """
+    if not source.is_wildcard:
+        return list(source.skills)
+    if not skills_dir.is_dir():
+        return []
+
+    names: list[str] = []
+    for skill_dir in sorted(p for p in skills_dir.iterdir() if p.is_dir()):
+        name = skill_dir.name
+        if not _matches_any(name, source.skills) or _matches_any(
+            name, source.exclude_skills
+        ):
+            continue
+        prov = read_provenance(skill_dir)
+        if (
+            prov is not None
+            and prov.repo == str(source.repo)
+            and prov.path == source.path
+        ):
+            names.append(name)
+    return names
+
+
+def skill_repo_path(source: Source, skill_name: str) -> str:
+    """Path of a skill relative to the repository root."""
+    source_path = source.path.strip("/")
+    if source_path and source_path != ".":
+        return f"{source_path}/{skill_name}"
+    return skill_name
+
+
+def forge_archive(client: httpx.Client, source: Source, sha: str) -> Path:
+    """Return the cached forge tarball of a source at sha.
+
+    Archives are kept in the quiv cache keyed by (repo, SHA), so a commit
+    is downloaded once no matter how many projects or syncs need it. A
+    process that needs an archive another one is downloading waits for
+    it on the entry's lock instead of downloading it again. Archives are
+    stored uncompressed with a member-offset index, so later extractions
+    read only the byte ranges of the skills they need.
 
     Args:
         client: httpx client instance.
         source: Source definition.
         sha: Commit SHA to fetch.
-        dest: Destination directory for extracted skills.
 
     Returns:
-        List of paths to extracted skill directories.
+        Path to the cached .tar. It belongs to the cache; do not delete it.
 
     Raises:
-        SyncError: If download or extraction fails.
+        SyncError: If the download fails.
     """
-    owner, repo = _parse_github_repo(source)
-    url = f"https://api.github.com/repos/{owner}/{repo}/tarball/{sha}"
-
+    archive = archive_path(str(source.repo), sha)
+    index = cache_index()
+    if not is_cached(archive):
+        what = f"download tarball for {source.name}"
+        # Single flight: one process downloads while the others wait for it
+        with locked(lock_path(archive), what):
+            if not is_cached(archive):
+                _download_archive(client, source, sha, archive, what)
+
+    index.record(index.key_for(archive), archive.stat().st_size)
+    archive_index = index_path(archive)
+    index.record(index.key_for(archive_index), archive_index.stat().st_size)
+    return archive
+
+
+def _download_archive(
+    client: httpx.Client, source: Source, sha: str, archive: Path, what: str
+) -> None:
+    """Download a forge tarball and store it as a cached archive."""
+    host = _forge_host(source)
+    url = host.tarball_url(_forge_project(source, host), sha)
+
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=archive.parent, prefix=".tmp-")
+    tmp_path = Path(tmp_name)
+    started = time.monotonic()
     try:
-        with tempfile.NamedTemporaryFile(suffix=".tar.gz", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            with client.stream("GET", url) as response:
+        with os.fdopen(fd, "wb") as tmp:
+            with client.stream(
+                "GET", url, headers=host.auth_headers(), timeout=http_timeout(what)
+            ) as response:
                 response.raise_for_status()
                 for chunk in response.iter_bytes(chunk_size=8192):
+                    # Read timeouts bound each chunk; this bounds the total
+                    check_deadline(what)
                     tmp.write(chunk)
+        size = tmp_path.stat().st_size
+        store_gzip_tarball(tmp_path, archive)
     except httpx.HTTPError as e:
-        raise SyncError(f"Failed to download tarball for {source.name}: {e}") from e
+        raise _http_error(what, e) from e
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    record_fetch(str(source.repo), size, time.monotonic() - started)
 
-    extracted_skills: list[Path] = []
-    try:
-        with tarfile.open(tmp_path, "r:gz") as tar:
-            # Find the top-level directory in the tarball
-            members = tar.getmembers()
-            if not members:
-                raise SyncError(f"Empty tarball for {source.name}")
 
-            top_dir = members[0].name.split("/")[0]
-            source_path = source.path.strip("/")
+def extract_tarball(
+    archive: Path | IO[bytes], source: Source, dest: Path, store: BlobStore
+) -> list[Path]:
+    """Extract a source's skills from a downloaded repository tarball.
 
-            for skill_name in source.skills:
-                # Build the path within the tarball
-                if source_path and source_path != ".":
-                    skill_prefix = f"{top_dir}/{source_path}/{skill_name}/"
-                else:
-                    skill_prefix = f"{top_dir}/{skill_name}/"
+    A cached tarball with an index is read by seeking straight to the
+    skills' byte ranges. Anything else is streamed once from the start.
+    Files the source's include/exclude filters reject are skipped, so
+    they are never read from the archive or written to disk.
 
-                # Extract matching members
-                skill_dest = dest / skill_name
-                skill_dest.mkdir(parents=True, exist_ok=True)
+    Args:
+        archive: Path to a tarball (gzipped or not), or a readable file
+            object holding one, with one top-level directory.
+        source: Source definition.
+        dest: Destination directory for extracted skills.
+        store: Blob store to extract through.
 
-                for member in members:
-                    if member.name.startswith(skill_prefix) and not member.isdir():
-                        # Calculate relative path within the skill
-                        rel_path = member.name[len(skill_prefix) :]
-                        if not rel_path:
-                            continue
+    Returns:
+        List of paths to extracted skill directories, in manifest order.
+        Skills with no regular files in the archive are left out.
 
-                        out_file = skill_dest / rel_path
-                        out_file.parent.mkdir(parents=True, exist_ok=True)
+    Raises:
+        SyncError: If extraction fails.
+    """
+    if isinstance(archive, Path):
+        archive_index = load_index(archive)
+        if archive_index is not None:
+            return _extract_indexed(archive, archive_index, source, dest, store)
 
-                        extracted = tar.extractfile(member)
-                        if extracted is not None:
-                            out_file.write_bytes(extracted.read())
+    skill_dirs = {name: dest / name for name in source.skills}
+    base = source.path.strip("/")
+    if base == ".":
+        base = ""
 
-                if any(skill_dest.iterdir()):
-                    extracted_skills.append(skill_dest)
+    try:
+        # Stream members in archive order; nothing is read twice
+        if isinstance(archive, Path):
+            tar = tarfile.open(archive, "r|*")
+        else:
+            tar = tarfile.open(fileobj=archive, mode="r|*")
+        with tar, SkillWriter(store) as writer:
+            seen_any = False
+            for member in tar:
+                seen_any = True
+                if not member.isfile():
+                    continue
+                # Strip the archive's top-level directory and the source path
+                _, _, rest = member.name.partition("/")
+                if base:
+                    if not rest.startswith(base + "/"):
+                        continue
+                    rest = rest[len(base) + 1 :]
+                skill_name, _, rel_path = rest.partition("/")
+                skill_dir = skill_dirs.get(skill_name)
+                if skill_dir is None or not rel_path:
+                    continue
+                if not source.keeps_file(rel_path):
+                    continue
+
+                extracted = tar.extractfile(member)
+                if extracted is not None:
+                    writer.write_bytes(
+                        skill_dir,
+                        rel_path,
+                        extracted.read(),
+                        executable=bool(member.mode & 0o100),
+                    )
+
+            if not seen_any:
+                raise SyncError(f"Empty tarball for {source.name}")
+            written = set(writer.skill_dirs)
     except tarfile.TarError as e:
         raise SyncError(f"Failed to extract tarball for {source.name}: {e}") from e
+
+    return [dest / name for name in source.skills if dest / name in written]
+
+
+def _extract_indexed(
+    archive: Path,
+    archive_index: ArchiveIndex,
+    source: Source,
+    dest: Path,
+    store: BlobStore,
+) -> list[Path]:
+    """Extract skills from a cached tarball using its member-offset index.
+
+    Skills with no file that passes the source's filters are left out.
+    """
+    fd = os.open(archive, os.O_RDONLY)
+    try:
+        with SkillWriter(store) as writer:
+            for skill_name in source.skills:
+                prefix = skill_repo_path(source, skill_name) + "/"
+                for name, offset, size in archive_index.under(prefix):
+                    rel_path = name[len(prefix) :]
+                    if source.keeps_file(rel_path):
+                        data = read_range(fd, offset, size)
+                        executable = name in archive_index.executable_names
+                        writer.write_bytes(
+                            dest / skill_name, rel_path, data, executable
+                        )
+    except OSError as e:
+        raise SyncError(f"Failed to read cached archive for {source.name}: {e}") from e
     finally:
-        tmp_path.unlink(missing_ok=True)
+        os.close(fd)
+    return writer.skill_dirs
 
-    return extracted_skills
 
+def fetch_forge_tarball(
+    client: httpx.Client,
+    source: Source,
+    sha: str,
+    dest: Path,
+    store: BlobStore | None = None,
+) -> list[Path]:
+    """Fetch (or reuse) and extract a forge tarball for specific skills.
 
-def fetch_git_sparse(source: Source, dest: Path) -> list[Path]:
-    """Fetch skills via git sparse checkout (fallback for non-GitHub hosts).
+    File contents go into the blob store and are materialized under dest.
 
     Args:
+        client: httpx client instance.
         source: Source definition.
-        dest: Destination directory for cloned skills.
+        sha: Commit SHA to fetch.
+        dest: Destination directory for extracted skills.
+        store: Blob store to extract through (default: the quiv cache).
 
     Returns:
         List of paths to extracted skill directories.
 
     Raises:
-        SyncError: If git is unavailable or clone fails.
+        SyncError: If download or extraction fails.
     """
-    # Check git availability
-    git_path = shutil.which("git")
-    if git_path is None:
+    if store is None:
+        store = blob_store()
+
+    archive = forge_archive(client, source, sha)
+    return extract_tarball(archive, source, dest, store)
+
+
+def _require_git() -> None:
+    """Raise a helpful error if git is not on PATH."""
+    if shutil.which("git") is None:
         raise SyncError(
-            "git is not installed. Required for non-GitHub sources. "
-            "Install git or use GitHub-hosted sources."
+            "git is not installed. Required for sources on plain git hosts. "
+            "Install git or configure the host's forge (see quiv's config file)."
         )
 
-    source_path = source.path.strip("/")
 
-    # Build sparse checkout paths
-    sparse_paths: list[str] = []
-    for skill_name in source.skills:
-        if source_path and source_path != ".":
-            sparse_paths.append(f"{source_path}/{skill_name}")
-        else:
-            sparse_paths.append(skill_name)
+def _mirror_stamp(mirror: Path) -> tuple[bool, int | None]:
+    """Whether a mirror exists, and when it was last fetched into."""
+    try:
+        fetched: int | None = (mirror / "FETCH_HEAD").stat().st_mtime_ns
+    except OSError:
+        fetched = None
+    return (mirror / "HEAD").is_file(), fetched
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp = Path(tmp_dir)
 
+def update_mirror(source: Source) -> Path:
+    """Create or refresh the cached bare mirror of a git source.
+
+    The mirror is shallow: it holds the tip of every upstream ref, which
+    is all a sparse checkout at a ref needs. Updates hold the mirror's
+    lock; a process that had to wait for another one's update uses it
+    rather than fetching again.
+
+    Returns:
+        Path to the mirror.
+
+    Raises:
+        SyncError: If git is unavailable or the clone/fetch fails.
+    """
+    _require_git()
+    mirror = mirror_path(str(source.repo))
+    seen = _mirror_stamp(mirror)
+    with locked(lock_path(mirror), f"the mirror of {source.name}"):
+        if _mirror_stamp(mirror) != seen and (mirror / "HEAD").is_file():
+            # Another process refreshed it while this one waited
+            return mirror
+        started = time.monotonic()
+        try:
+            if (mirror / "HEAD").is_file():
+                subprocess.run(
+                    [
+                        "git",
+                        "--git-dir",
+                        str(mirror),
+                        "fetch",
+                        "--prune",
+                        "--depth",
+                        "1",
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=process_timeout(f"update the mirror of {source.name}"),
+                )
+            else:
+                mirror.parent.mkdir(parents=True, exist_ok=True)
+                tmp = mirror.with_name(f".tmp-{mirror.name}-{os.getpid()}")
+                shutil.rmtree(tmp, ignore_errors=True)
+                subprocess.run(
+                    [
+                        "git",
+                        "clone",
+                        "--mirror",
+                        "--depth",
+                        "1",
+                        str(source.repo),
+                        str(tmp),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=process_timeout(f"mirror {source.name}"),
+                )
+                try:
+                    os.replace(tmp, mirror)
+                except OSError:
+                    # Another process won the race; keep its mirror
+                    shutil.rmtree(tmp, ignore_errors=True)
+        except subprocess.CalledProcessError as e:
+            raise SyncError(
+                f"Git mirror update failed for {source.name}: {e.stderr}"
+            ) from e
+        except subprocess.TimeoutExpired as e:
+            raise DeadlineError(
+                f"Deadline exceeded updating the mirror of {source.name}"
+            ) from e
+
+        size = tree_size(mirror)
+        record_fetch(str(source.repo), size, time.monotonic() - started)
+
+    index = cache_index()
+    index.record(index.key_for(mirror), size)
+    return mirror
+
+
+def sparse_checkout(
+    source: Source, sparse_paths: list[str], work_dir: Path, cone: bool = True
+) -> Path:
+    """Sparse-clone a source's repository at its ref.
+
+    If the cache holds a mirror of the repository (see ``quiv fetch``), it
+    is refreshed and cloned from locally. When the refresh fails, e.g.
+    with no network, the mirror is used as last fetched. A local directory
+    source is returned as-is: its files are read in place, not cloned.
+
+    Args:
+        source: Source definition.
+        sparse_paths: Repository paths to check out, or gitignore-style
+            patterns when cone is False.
+        work_dir: Empty directory to clone into.
+        cone: Whether sparse_paths are whole directories (git's cone mode).
+
+    Returns:
+        Path to the checked-out repository.
+
+    Raises:
+        SyncError: If git is unavailable or clone fails.
+    """
+    if is_local_dir(source):
+        repo_dir = local_path(source)
+        if not repo_dir.is_dir():
+            raise SyncError(f"Local source {source.name} not found: {repo_dir}")
+        return repo_dir
+
+    _require_git()
+
+    origin = str(source.repo)
+    mirror = mirror_path(origin)
+    reading: contextlib.AbstractContextManager[None] = contextlib.nullcontext()
+    if (mirror / "HEAD").is_file():
         try:
-            # Initialize sparse checkout
+            update_mirror(source)
+        except DeadlineError:
+            raise
+        except SyncError:
+            pass
+        origin = mirror.as_uri()
+        # Readers share the mirror's lock, so no update runs mid-clone
+        reading = locked(lock_path(mirror), f"the mirror of {source.name}", shared=True)
+
+    repo_dir = work_dir / "repo"
+    try:
+        # Initialize sparse checkout
+        with reading:
             subprocess.run(
                 [
                     "git",
@@ -202,125 +875,499 @@ def fetch_git_sparse(source: Source, dest: Path) -> list[Path]:
                     "--sparse",
                     "--branch",
                     source.ref,
-                    str(source.repo),
-                    str(tmp / "repo"),
+                    origin,
+                    str(repo_dir),
                 ],
                 check=True,
                 capture_output=True,
                 text=True,
+                timeout=process_timeout(f"clone {source.name}"),
             )
 
-            repo_dir = tmp / "repo"
+        mode = [] if cone else ["--no-cone"]
+        subprocess.run(
+            ["git", "sparse-checkout", "set", *mode, *sparse_paths],
+            cwd=repo_dir,
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=process_timeout(f"check out {source.name}"),
+        )
+    except subprocess.CalledProcessError as e:
+        raise SyncError(
+            f"Git sparse checkout failed for {source.name}: {e.stderr}"
+        ) from e
+    except subprocess.TimeoutExpired as e:
+        raise DeadlineError(f"Deadline exceeded checking out {source.name}") from e
 
-            subprocess.run(
-                ["git", "sparse-checkout", "set"] + sparse_paths,
-                cwd=repo_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-        except subprocess.CalledProcessError as e:
-            raise SyncError(
-                f"Git sparse checkout failed for {source.name}: {e.stderr}"
-            ) from e
+    return repo_dir
+
+
+def copy_checkout_skills(
+    repo_dir: Path, source: Source, dest: Path, store: BlobStore
+) -> list[Path]:
+    """Copy a source's skills out of a checked-out repository.
 
-        # Copy skills to destination
-        extracted_skills: list[Path] = []
+    Only files passing the source's include/exclude filters are copied.
+
+    Args:
+        repo_dir: Repository checkout containing the skills.
+        source: Source definition.
+        dest: Destination directory for copied skills.
+        store: Blob store to copy through.
+
+    Returns:
+        List of paths to copied skill directories. Skills with no file
+        that passes the source's filters are left out.
+    """
+    with SkillWriter(store) as writer:
         for skill_name in source.skills:
-            if source_path and source_path != ".":
-                src_skill = repo_dir / source_path / skill_name
-            else:
-                src_skill = repo_dir / skill_name
+            src_skill = repo_dir / skill_repo_path(source, skill_name)
 
             if src_skill.is_dir():
                 skill_dest = dest / skill_name
                 if skill_dest.exists():
                     shutil.rmtree(skill_dest)
-                shutil.copytree(src_skill, skill_dest)
-                extracted_skills.append(skill_dest)
+                for path in sorted(src_skill.rglob("*")):
+                    if path.is_file():
+                        rel_path = path.relative_to(src_skill).as_posix()
+                        if source.keeps_file(rel_path):
+                            writer.copy_file(skill_dest, rel_path, path)
+
+    return writer.skill_dirs
 
-    return extracted_skills
 
+def fetch_git_sparse(
+    source: Source,
+    dest: Path,
+    store: BlobStore | None = None,
+    replace: list[str] | None = None,
+) -> list[Path]:
+    """Fetch skills via git sparse checkout (fallback for plain git hosts).
+
+    Args:
+        source: Source definition.
+        dest: Destination directory for cloned skills.
+        store: Blob store to copy through (default: the quiv cache).
+        replace: Skill directories under dest to delete once the checkout
+            has succeeded, so a failed clone leaves them as they were.
 
-def sync(manifest: Manifest, dry_run: bool = False) -> None:
-    """Resolve manifest and make skills/ match it.
+    Returns:
+        List of paths to extracted skill directories.
+
+    Raises:
+        SyncError: If git is unavailable or clone fails.
+    """
+    if store is None:
+        store = blob_store()
+
+    sparse_paths = [skill_repo_path(source, skill_name) for skill_name in source.skills]
+    if source.is_filtered:
+        # Filtered-out blobs are never fetched by the blobless clone
+        sparse_paths = [
+            pattern
+            for path in sparse_paths
+            for pattern in sparse_patterns(path, source.include, source.exclude)
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo_dir = sparse_checkout(
+            source, sparse_paths, Path(tmp_dir), cone=not source.is_filtered
+        )
+        remove_skills(dest, replace or [])
+        return copy_checkout_skills(repo_dir, source, dest, store)
+
+
+def provenance_matches(prov: Provenance, source: Source) -> bool:
+    """Whether provenance was written from source's repo, path and filters.
+
+    The SHA is not compared.
+    """
+    return (
+        # Provenance written while repos were URLs may end in "/"
+        prov.repo.rstrip("/") == str(source.repo).rstrip("/")
+        and prov.path == source.path
+        and (prov.include, prov.exclude) == (source.include, source.exclude)
+    )
+
+
+def find_stale_skills(
+    source: Source,
+    sha: str,
+    skills_dir: Path,
+    provenance: Mapping[str, Provenance | None] | None = None,
+) -> list[str]:
+    """List a source's skills whose provenance does not match sha.
+
+    A skill extracted from a different repo or path, or with different
+    include/exclude filters, is stale too. So is every skill of a local
+    directory that changed too recently for its fingerprint to be trusted
+    (see ``local.is_settled``).
+
+    Args:
+        source: Source definition.
+        sha: Resolved upstream SHA.
+        skills_dir: The project's skills/ directory.
+        provenance: Already-loaded provenance by skill name. Skills missing
+            from the mapping are read from disk.
+
+    Returns:
+        Names of stale skills, in manifest order.
+    """
+    stale: list[str] = []
+    for skill_name in source.skills:
+        if provenance is not None and skill_name in provenance:
+            prov = provenance[skill_name]
+        else:
+            prov = read_provenance(skills_dir / skill_name)
+        if (
+            prov is None
+            or prov.sha != sha
+            or not is_settled(sha)
+            or not provenance_matches(prov, source)
+        ):
+            stale.append(skill_name)
+    return stale
+
+
+def _local_sha(skills_dir: Path, skill_names: list[str]) -> str | None:
+    """SHA recorded in the first of these skills that has provenance."""
+    for skill_name in skill_names:
+        prov = read_provenance(skills_dir / skill_name)
+        if prov is not None:
+            return prov.sha
+    return None
+
+
+def describe_pending(
+    source: Source, sha: str, stale_skills: list[str], skills_dir: Path
+) -> str:
+    """Describe a pending update as ``name: old -> new (N skills)``."""
+    return SourceReport(
+        name=source.name,
+        status="pending",
+        old_sha=_local_sha(skills_dir, stale_skills),
+        new_sha=sha,
+        skills=stale_skills,
+    ).render()
+
+
+def remove_skills(skills_dir: Path, skill_names: list[str]) -> None:
+    """Delete skill directories ahead of re-extraction."""
+    for skill_name in skill_names:
+        skill_dir = skills_dir / skill_name
+        if skill_dir.exists():
+            shutil.rmtree(skill_dir)
+
+
+def record_provenance(
+    source: Source, sha: str, extracted: list[Path]
+) -> dict[str, Provenance]:
+    """Write .source.kdl into each freshly extracted skill directory.
+
+    Args:
+        source: Source the skills came from.
+        sha: Commit SHA they were extracted at.
+        extracted: Extracted skill directories.
+
+    Returns:
+        Provenance written, keyed by skill name.
+    """
+    now = datetime.now(timezone.utc)
+    written: dict[str, Provenance] = {}
+    for skill_dir in extracted:
+        prov = Provenance(
+            repo=str(source.repo),
+            path=source.path,
+            ref=source.ref,
+            sha=sha,
+            license=source.license,
+            fetched=now,
+            include=source.include,
+            exclude=source.exclude,
+        )
+        write_provenance(skill_dir, prov)
+        written[skill_dir.name] = prov
+    return written
+
+
+def sync_source(
+    client: httpx.Client,
+    source: Source,
+    sha: str,
+    skills_dir: Path,
+    stale_skills: list[str],
+    store: BlobStore,
+) -> dict[str, Provenance]:
+    """Replace a source's stale skills with the upstream version at sha.
+
+    The stale skills are only deleted once the download or checkout has
+    succeeded, so a network failure leaves their previous contents.
+
+    Args:
+        client: httpx client instance.
+        source: Source definition.
+        sha: Resolved upstream SHA.
+        skills_dir: The project's skills/ directory.
+        stale_skills: Skills to delete before fetching.
+        store: Blob store to extract through.
+
+    Returns:
+        Provenance written, keyed by skill name.
+    """
+    if _is_forge(source):
+        archive = forge_archive(client, source, sha)
+        remove_skills(skills_dir, stale_skills)
+        extracted = extract_tarball(archive, source, skills_dir, store)
+    else:
+        extracted = fetch_git_sparse(source, skills_dir, store, replace=stale_skills)
+
+    return record_provenance(source, sha, extracted)
+
+
+def _expand_up_front(
+    client: httpx.Client,
+    manifest: Manifest,
+    sources: list[Source],
+    shas: dict[str, str],
+    options: SyncOptions,
+) -> None:
+    """Expand wildcard sources before anything is written, checking collisions.
+
+    Literal names were checked when the manifest was parsed; only globs
+    can add a collision. SHAs resolved here are added to shas, so the
+    sources are not resolved again. Under ``keep_going``, a source that
+    fails to resolve is left out; its error is reported when it syncs.
+
+    Raises:
+        ManifestError: If two sources provide the same skill.
+    """
+    selected = {source.name for source in sources}
+    expanded = [
+        source
+        for source in manifest.sources
+        if not source.is_wildcard and source.name not in selected
+    ]
+    for source in sources:
+        if not source.is_wildcard:
+            expanded.append(source)
+            continue
+        try:
+            check_deadline(f"sync {source.name}")
+            with deadline(options.source_timeout):
+                sha = shas.get(source.name) or resolve_source_sha(client, source)
+                expanded.append(expand_source(client, source, sha))
+            shas[source.name] = sha
+        except SyncError:
+            if not options.keep_going:
+                raise
+    check_expanded_skills(expanded)
+
+
+def _sync_one(
+    client: httpx.Client,
+    root: Path,
+    source: Source,
+    options: SyncOptions,
+    journal: SyncJournal | None,
+    shas: dict[str, str],
+    store: BlobStore,
+) -> SourceReport:
+    """Sync one source for ``sync_report``, keeping the journal current."""
+    skills_dir = root / "skills"
+    if journal is not None and source.name in journal.done:
+        # Finished by an interrupted earlier run
+        return SourceReport(
+            name=source.name, status="up-to-date", new_sha=journal.shas[source.name]
+        )
+
+    sha = shas.get(source.name)
+    if sha is None:
+        sha = resolve_source_sha(client, source)
+    if journal is not None:
+        journal.shas[source.name] = sha
+    source = expand_source(client, source, sha)
+
+    # Check which skills are stale
+    stale_skills = find_stale_skills(source, sha, skills_dir)
+    if journal is not None and source.name in journal.writing:
+        # Possibly half-written when the last run stopped
+        interrupted = set(journal.writing[source.name]) | set(stale_skills)
+        stale_skills = [s for s in source.skills if s in interrupted]
+
+    if not stale_skills:
+        entry = SourceReport(name=source.name, status="up-to-date", new_sha=sha)
+    else:
+        entry = SourceReport(
+            name=source.name,
+            status="pending" if options.dry_run else "synced",
+            old_sha=_local_sha(skills_dir, stale_skills),
+            new_sha=sha,
+            skills=stale_skills,
+        )
+        if not options.dry_run:
+            if journal is not None:
+                journal.writing[source.name] = stale_skills
+                save_journal(root, journal)
+            written = sync_source(client, source, sha, skills_dir, stale_skills, store)
+            entry.skills = list(written)
+            entry.bytes = sum(tree_size(skills_dir / n) for n in written)
+
+    if journal is not None:
+        journal.writing.pop(source.name, None)
+        journal.done.append(source.name)
+        save_journal(root, journal)
+    return entry
+
+
+def sync_report(
+    manifest: Manifest,
+    options: SyncOptions | None = None,
+    on_source: Callable[[SourceReport], None] | None = None,
+) -> SyncReport:
+    """Resolve manifest and make skills/ match it, without printing.
 
     For each source in the manifest, resolves the upstream SHA, compares
     with local provenance, and re-extracts any stale skills. Treats
     skills/ as a build output — stale skills are deleted and replaced
-    unconditionally.
+    unconditionally. Skill globs are expanded before anything is written,
+    and a skill provided by two sources fails the run with ManifestError.
+
+    ``skills/index.json`` is updated with the skills each source wrote
+    (see ``skill_quiver.catalog``). The run holds the project's lock (see
+    ``skill_quiver.locking``), so a concurrent run against the same
+    manifest waits for it. Progress is kept in a journal next to the
+    manifest (see ``skill_quiver.journal``). If a run is interrupted, the
+    next run over the same sources reuses its resolved SHAs, skips sources
+    it finished, and redoes skills it was midway through writing.
+
+    ``options.source_timeout`` and ``options.deadline`` bound each source
+    and the whole run (see ``skill_quiver.limits``). A host that fails
+    three times in a row is skipped for the rest of the run. With
+    ``options.keep_going``, a failing source is reported as failed and
+    keeps its previous skills while the others sync; otherwise the first
+    error is raised.
 
     Args:
         manifest: Parsed manifest with sources.
-        dry_run: If True, report what would change without writing files.
+        options: Dry run, source selection, deadlines and error handling
+            (default: sync everything, stop at the first error).
+            THIRD_PARTY_LICENSES is always generated from the full manifest.
+        on_source: Called with each source's report as soon as it is done.
+
+    Returns:
+        Per-source SHAs, changed skills, bytes written, and timings.
     """
+    if options is None:
+        options = SyncOptions()
+    sources = manifest.sources if options.sources is None else options.sources
     skills_dir = manifest.root / "skills"
+    report = SyncReport(root=manifest.root, dry_run=options.dry_run)
+    started = time.perf_counter()
 
-    if not dry_run:
-        skills_dir.mkdir(exist_ok=True)
-
-    with _make_client() as client:
-        for source in manifest.sources:
-            if _is_github(source):
-                sha = resolve_sha(client, source)
-            else:
-                sha = source.ref
+    store = blob_store()
+    breaker = CircuitBreaker()
+    writing = (
+        contextlib.nullcontext() if options.dry_run else project_lock(manifest.root)
+    )
 
-            # Check which skills are stale
-            stale_skills: list[str] = []
-            for skill_name in source.skills:
-                skill_dir = skills_dir / skill_name
-                prov = read_provenance(skill_dir)
-                if prov is None or prov.sha != sha:
-                    stale_skills.append(skill_name)
-
-            if not stale_skills:
-                print(f"{source.name}: up to date")
-                continue
-
-            if dry_run:
-                # Report what would change
-                local_sha = "none"
-                for skill_name in stale_skills:
-                    prov = read_provenance(skills_dir / skill_name)
-                    if prov is not None:
-                        local_sha = prov.sha[:8]
-                        break
-                print(
-                    f"{source.name}: {local_sha} -> {sha[:8]} "
-                    f"({len(stale_skills)} skills)"
+    with (
+        _make_client() as client,
+        deadline(options.deadline),
+        writing,
+        recording() as recorder,
+    ):
+        journal = None if options.dry_run else load_journal(manifest.root, sources)
+        shas = dict(journal.shas) if journal is not None else {}
+        _expand_up_front(client, manifest, sources, shas, options)
+        for source in sources:
+            source_started = time.perf_counter()
+            host = host_key(source.repo)
+            try:
+                check_deadline(f"sync {source.name}")
+                breaker.check(host)
+                try:
+                    with deadline(options.source_timeout):
+                        entry = _sync_one(
+                            client,
+                            manifest.root,
+                            source,
+                            options,
+                            journal,
+                            shas,
+                            store,
+                        )
+                except UnavailableError:
+                    breaker.record(host, ok=False)
+                    raise
+                breaker.record(host, ok=True)
+            except SyncError as e:
+                if not options.keep_going:
+                    raise
+                # Its skills keep their previous contents
+                entry = SourceReport(
+                    name=source.name, status="failed", new_sha="", error=e.message
                 )
-                continue
-
-            # Delete stale skill directories before fetching
-            for skill_name in stale_skills:
-                skill_dir = skills_dir / skill_name
-                if skill_dir.exists():
-                    shutil.rmtree(skill_dir)
-
-            # Fetch
-            print(f"Syncing {source.name}...")
-            if _is_github(source):
-                extracted = fetch_github_tarball(client, source, sha, skills_dir)
-            else:
-                extracted = fetch_git_sparse(source, skills_dir)
-
-            # Write provenance
-            now = datetime.now(timezone.utc)
-            for skill_dir in extracted:
-                prov = Provenance(
-                    repo=str(source.repo),
-                    path=source.path,
-                    ref=source.ref,
-                    sha=sha,
-                    license=source.license,
-                    fetched=now,
-                )
-                write_provenance(skill_dir, prov)
-                print(f"  {skill_dir.name}")
 
-    if not dry_run:
-        generate_license_file(manifest, manifest.root)
+            written = recorder.take(skills_dir)
+            if written:
+                # Updated as each source finishes, not only at the end
+                update_catalog(skills_dir, written)
+
+            entry.seconds = time.perf_counter() - source_started
+            report.sources.append(entry)
+            if on_source is not None:
+                on_source(entry)
+
+        if not options.dry_run:
+            generate_license_file(manifest, manifest.root)
+            update_catalog(skills_dir)
+            enforce_budget(skills_dir)
+            clear_journal(manifest.root)
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def sync(
+    manifest: Manifest,
+    dry_run: bool = False,
+    sources: list[Source] | None = None,
+    keep_going: bool = False,
+    source_timeout: float | None = None,
+    deadline: float | None = None,
+) -> SyncReport:
+    """Sync like ``sync_report``, printing each source as it finishes.
+
+    Args:
+        manifest: Parsed manifest with sources.
+        dry_run: If True, report what would change without writing files.
+        sources: Sync only these sources (see ``select_sources``).
+            THIRD_PARTY_LICENSES is still generated from the full manifest.
+        keep_going: Report failing sources instead of stopping at the first.
+        source_timeout: Seconds allowed per source.
+        deadline: Seconds allowed for the whole run.
+    """
+    options = SyncOptions(
+        dry_run=dry_run,
+        sources=sources,
+        keep_going=keep_going,
+        source_timeout=source_timeout,
+        deadline=deadline,
+    )
+    return sync_report(manifest, options, on_source=lambda r: print(r.render()))
+
+
+async def sync_async(
+    manifest: Manifest, options: SyncOptions | None = None
+) -> SyncReport:
+    """Sync a manifest from async code and return its report.
+
+    The engine does blocking network, git, and disk work, so it runs in a
+    worker thread. Many manifests can be awaited concurrently in one event
+    loop, e.g. with ``asyncio.gather``. Nothing is printed.
+    """
+    return await asyncio.to_thread(sync_report, manifest, options)
 
 
 def generate_license_file(manifest: Manifest, root: Path) -> None:
@@ -351,7 +1398,7 @@ def generate_license_file(manifest: Manifest, root: Path) -> None:
         if source.attribution:
             section_lines.append(f"Attribution: {source.attribution}")
         section_lines.append("Skills:")
-        for skill_name in sorted(source.skills):
+        for skill_name in sorted(installed_skills(source, root / "skills")):
             section_lines.append(f"  - {skill_name}")
         sections.append("\n".join(section_lines))
 
@@ -0,0 +1,258 @@
+"""Watch mode: stay resident, poll upstream, and re-sync what moved."""
+
+import sys
+import threading
+from pathlib import Path
+
+import httpx
+
+from skill_quiver.cache import blob_store, enforce_budget
+from skill_quiver.catalog import recording, update_catalog
+from skill_quiver.errors import ManifestError, QuivError
+from skill_quiver.locking import project_lock
+from skill_quiver.manifest import (
+    Manifest,
+    Source,
+    check_expanded_skills,
+    is_skill_glob,
+    manifest_files,
+    parse_manifest,
+)
+from skill_quiver.provenance import Provenance, read_provenance
+from skill_quiver.sync import (
+    _is_forge,
+    _make_client,
+    expand_source,
+    find_stale_skills,
+    generate_license_file,
+    resolve_sha_conditional,
+    resolve_source_sha,
+    sync_source,
+)
+
+DEFAULT_INTERVAL = 300.0
+MANIFEST_POLL_INTERVAL = 2.0
+
+# (path, stat signature) for the manifest and each included fragment
+_Signature = tuple[tuple[Path, tuple[int, int] | None], ...]
+
+
+class Watcher:
+    """Resident sync loop with a warm client, manifest, and provenance index.
+
+    Upstream refs are polled every ``interval`` seconds with conditional
+    requests, and only sources whose SHA moved are re-synced. Edits to
+    skills.kdl are picked up through filesystem notifications when
+    ``watchfiles`` is installed, and by polling its mtime otherwise. Files
+    pulled in by ``include`` nodes are watched the same way.
+    """
+
+    def __init__(self, manifest_path: Path, interval: float = DEFAULT_INTERVAL) -> None:
+        self.manifest_path = manifest_path
+        self.interval = interval
+        self.manifest: Manifest | None = None
+        self.provenance: dict[str, Provenance | None] = {}
+        self._manifest_signature: _Signature = ()
+        # (repo, ref) -> (etag, sha) from the last conditional request
+        self._etags: dict[tuple[str, str], tuple[str, str]] = {}
+        self._store = blob_store()
+        self._changed = threading.Event()
+        self._stop = threading.Event()
+
+    @property
+    def skills_dir(self) -> Path:
+        return self.manifest_path.parent / "skills"
+
+    def load_manifest(self) -> bool:
+        """(Re)parse skills.kdl if it or an included fragment changed.
+
+        Unchanged files are served from the fragment cache, so only edited
+        files are parsed again. A manifest that fails to parse is reported and the previous one
+        kept, so a half-saved edit does not stop the daemon.
+
+        Returns:
+            True if a new manifest was loaded.
+
+        Raises:
+            ManifestError: If the initial manifest cannot be parsed.
+        """
+        self._manifest_signature = self._signature()
+        try:
+            manifest = parse_manifest(self.manifest_path)
+        except ManifestError as e:
+            if self.manifest is None:
+                raise
+            print(f"error: {e.message}", file=sys.stderr)
+            return False
+
+        if manifest == self.manifest:
+            return False
+        self.manifest = manifest
+
+        # Keep the provenance index to skills the manifest still declares
+        wanted = {
+            skill
+            for source in manifest.sources
+            for skill in source.skills
+            if not is_skill_glob(skill)
+        }
+        self.provenance = {
+            name: self.provenance[name]
+            if name in self.provenance
+            else read_provenance(self.skills_dir / name)
+            for name in wanted
+        }
+        return True
+
+    def poll_sha(self, client: httpx.Client, source: Source) -> str:
+        """Resolve a source's SHA, reusing the last ETag when possible."""
+        if not _is_forge(source):
+            return resolve_source_sha(client, source)
+
+        key = (str(source.repo), source.ref)
+        etag, previous = self._etags.get(key, (None, None))
+        sha, new_etag = resolve_sha_conditional(client, source, etag, previous)
+        if new_etag is not None:
+            self._etags[key] = (new_etag, sha)
+        return sha
+
+    def tick(self, client: httpx.Client, force_licenses: bool = False) -> int:
+        """Poll every source once and re-sync the ones that moved.
+
+        Errors are reported per source so one failing upstream does not
+        block the others. If two sources' globs match the same skill, the
+        collision is reported and nothing is synced. The project's lock is held for the tick, so a
+        ``quiv sync`` in the same project waits for it.
+
+        Args:
+            client: httpx client kept open across ticks.
+            force_licenses: Regenerate THIRD_PARTY_LICENSES even if no
+                source changed (e.g. after a manifest edit).
+
+        Returns:
+            Number of sources re-synced.
+        """
+        assert self.manifest is not None
+
+        with project_lock(self.manifest.root), recording() as recorder:
+            resolved: list[tuple[Source, str]] = []
+            for source in self.manifest.sources:
+                try:
+                    sha = self.poll_sha(client, source)
+                    resolved.append((expand_source(client, source, sha), sha))
+                except QuivError as e:
+                    print(f"error: {source.name}: {e.message}", file=sys.stderr)
+            try:
+                check_expanded_skills([source for source, _ in resolved])
+            except ManifestError as e:
+                # Syncing either source would only overwrite the other's skill
+                print(f"error: {e.message}", file=sys.stderr)
+                return 0
+
+            synced = 0
+            for source, sha in resolved:
+                try:
+                    stale = find_stale_skills(
+                        source, sha, self.skills_dir, self.provenance
+                    )
+                    if not stale:
+                        continue
+                    print(f"Syncing {source.name}...")
+                    written = sync_source(
+                        client, source, sha, self.skills_dir, stale, self._store
+                    )
+                    for skill_name in written:
+                        print(f"  {skill_name}")
+                except QuivError as e:
+                    print(f"error: {source.name}: {e.message}", file=sys.stderr)
+                    continue
+
+                for skill_name in stale:
+                    self.provenance[skill_name] = written.get(skill_name)
+                self.provenance.update(written)
+                synced += 1
+
+            if synced or force_licenses:
+                generate_license_file(self.manifest, self.manifest.root)
+                update_catalog(self.skills_dir, recorder.take(self.skills_dir))
+            if synced:
+                enforce_budget(self.skills_dir)
+        return synced
+
+    def run(self) -> None:
+        """Sync, then keep polling until stop() is called."""
+        self.load_manifest()
+        watcher = threading.Thread(target=self._watch_manifest, daemon=True)
+        watcher.start()
+
+        print(
+            f"Watching {self.manifest_path} (polling upstream every {self.interval:g}s)"
+        )
+        with _make_client() as client:
+            reloaded = True
+            while not self._stop.is_set():
+                self.tick(client, force_licenses=reloaded)
+                self._changed.wait(timeout=self.interval)
+                reloaded = False
+                if self._changed.is_set() and not self._stop.is_set():
+                    self._changed.clear()
+                    reloaded = self.load_manifest()
+                    if reloaded:
+                        print(f"Reloaded {self.manifest_path.name}")
+
+    def stop(self) -> None:
+        """Ask run() to return after the current tick."""
+        self._stop.set()
+        self._changed.set()
+
+    def _watch_manifest(self) -> None:
+        """Signal manifest edits via watchfiles, or fall back to polling."""
+        try:
+            import watchfiles
+        except ImportError:
+            self._poll_manifest()
+            return
+
+        manifest = self.manifest_path.resolve()
+
+        def is_manifest_file(_change: object, path: str) -> bool:
+            # Fragments may be created after startup, so match any .kdl
+            # below the manifest's directory, not just the known files
+            changed = Path(path)
+            return changed == manifest or (
+                changed.suffix == ".kdl" and changed.name != ".source.kdl"
+            )
+
+        for _changes in watchfiles.watch(
+            manifest.parent,
+            watch_filter=is_manifest_file,
+            recursive=True,
+            stop_event=self._stop,
+        ):
+            self._changed.set()
+
+    def _poll_manifest(self, poll_interval: float = MANIFEST_POLL_INTERVAL) -> None:
+        """Signal manifest edits by comparing stat signatures."""
+        last = self._manifest_signature
+        while not self._stop.wait(poll_interval):
+            current = self._signature()
+            if current != last:
+                last = current
+                self._changed.set()
+
+    def _signature(self) -> _Signature:
+        """Stat signatures of the manifest and every fragment it includes."""
+        try:
+            files = manifest_files(self.manifest_path)
+        except ManifestError:
+            files = [self.manifest_path]
+        return tuple((path, _stat_signature(path)) for path in files)
+
+
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) for path, or None if it is missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
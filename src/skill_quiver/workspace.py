@@ -0,0 +1,248 @@
+"""Workspace mode: sync many skills.kdl manifests in one process."""
+
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+from skill_quiver import fastkdl
+from skill_quiver.cache import blob_store, enforce_budget
+from skill_quiver.catalog import recording, update_catalog
+from skill_quiver.errors import ManifestError, QuivError
+from skill_quiver.local import is_local_dir
+from skill_quiver.locking import project_lock
+from skill_quiver.manifest import (
+    Manifest,
+    Source,
+    check_expanded_skills,
+    parse_manifest,
+)
+from skill_quiver.sync import (
+    _is_forge,
+    _make_client,
+    copy_checkout_skills,
+    describe_pending,
+    expand_source,
+    extract_tarball,
+    find_stale_skills,
+    forge_archive,
+    generate_license_file,
+    record_provenance,
+    remove_skills,
+    resolve_source_sha,
+    skill_repo_path,
+    sparse_checkout,
+)
+
+WORKSPACE_FILENAME = "quiv-workspace.kdl"
+MANIFEST_FILENAME = "skills.kdl"
+
+# Directories never searched for manifests during discovery.
+SKIP_DIRS = frozenset({"skills", "node_modules", "venv", "__pycache__"})
+
+
+def discover_manifests(root: Path) -> list[Path]:
+    """Find every skills.kdl below root.
+
+    Hidden directories, skills/ output trees, and common dependency
+    directories are not searched.
+
+    Args:
+        root: Directory to search.
+
+    Returns:
+        Manifest paths, sorted.
+    """
+    found: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+        ]
+        if MANIFEST_FILENAME in filenames:
+            found.append(Path(dirpath) / MANIFEST_FILENAME)
+    return sorted(found)
+
+
+def read_workspace_file(path: Path) -> list[Path]:
+    """Read manifest paths from a quiv-workspace.kdl file.
+
+    Each ``manifest "path"`` node names a skills.kdl file, or a directory
+    containing one, relative to the workspace file.
+
+    Args:
+        path: Path to the workspace file.
+
+    Returns:
+        Manifest paths in declaration order.
+
+    Raises:
+        ManifestError: If the file cannot be parsed or names a missing manifest.
+    """
+    try:
+        nodes = fastkdl.parse(path.read_text(encoding="utf-8"))
+    except OSError as e:
+        raise ManifestError(f"Cannot read workspace file: {e}") from e
+    except Exception as e:
+        raise ManifestError(f"Invalid KDL syntax in {path}: {e}") from e
+
+    manifests: list[Path] = []
+    for node in nodes:
+        if node.name != "manifest" or not node.args:
+            continue
+        candidate = path.parent / str(node.args[0])
+        if candidate.is_dir():
+            candidate = candidate / MANIFEST_FILENAME
+        if not candidate.is_file():
+            raise ManifestError(f"Workspace manifest not found: {candidate}")
+        manifests.append(candidate.resolve())
+    return manifests
+
+
+def load_workspace(root: Path) -> list[Manifest]:
+    """Parse every manifest in a workspace.
+
+    Uses quiv-workspace.kdl in root if present, otherwise discovers
+    skills.kdl files below root.
+
+    Raises:
+        QuivError: If no manifests are found.
+    """
+    workspace_file = root / WORKSPACE_FILENAME
+    if workspace_file.is_file():
+        paths = read_workspace_file(workspace_file)
+    else:
+        paths = discover_manifests(root)
+
+    if not paths:
+        raise QuivError(f"No skills.kdl manifests found under {root}")
+    return [parse_manifest(path) for path in paths]
+
+
+def _label(manifest: Manifest, root: Path) -> str:
+    """Short display name for a workspace project."""
+    try:
+        rel = manifest.root.resolve().relative_to(root.resolve())
+    except ValueError:
+        return str(manifest.root)
+    return str(rel)
+
+
+def _lock_projects(
+    manifests: list[Manifest], dry_run: bool
+) -> contextlib.ExitStack[bool | None]:
+    """Take every project's lock, in path order so runs cannot deadlock."""
+    stack = contextlib.ExitStack()
+    if not dry_run:
+        for project in sorted({manifest.root.resolve() for manifest in manifests}):
+            stack.enter_context(project_lock(project))
+    return stack
+
+
+def _sha_key(source: Source) -> tuple[str, str, str]:
+    """What a source's resolved SHA depends on.
+
+    A local directory is fingerprinted below its path, so sources sharing
+    the directory but not the path resolve separately.
+    """
+    return (str(source.repo), source.ref, source.path if is_local_dir(source) else "")
+
+
+def sync_workspace(
+    root: Path, manifests: list[Manifest], dry_run: bool = False
+) -> None:
+    """Sync every manifest in a workspace with one global fetch plan.
+
+    Each distinct (repo, ref) is resolved once, and each distinct
+    (repo, SHA) is downloaded once. The result is then extracted into
+    every project's skills/ that needs it. THIRD_PARTY_LICENSES is
+    regenerated per project. Every project's lock is held for the run.
+
+    Args:
+        root: Workspace root, used for display labels.
+        manifests: Parsed manifests to sync.
+        dry_run: If True, report what would change without writing files.
+
+    Raises:
+        ManifestError: If two sources of one manifest provide the same skill.
+    """
+    store = blob_store()
+
+    with (
+        _lock_projects(manifests, dry_run),
+        _make_client() as client,
+        recording() as recorder,
+    ):
+        # Resolve every distinct source once (see _sha_key)
+        shas: dict[tuple[str, str, str], str] = {}
+        for manifest in manifests:
+            for source in manifest.sources:
+                key = _sha_key(source)
+                if key not in shas:
+                    shas[key] = resolve_source_sha(client, source)
+
+        # Group stale work by what has to be fetched
+        plan: dict[tuple[str, str], list[tuple[Manifest, Source, list[str]]]] = {}
+        expanded: dict[Path, list[tuple[Source, str]]] = {}
+        for manifest in manifests:
+            resolved = []
+            for source in manifest.sources:
+                sha = shas[_sha_key(source)]
+                resolved.append((expand_source(client, source, sha), sha))
+            check_expanded_skills([source for source, _ in resolved])
+            expanded[manifest.root] = resolved
+
+        for manifest in manifests:
+            label = _label(manifest, root)
+            skills_dir = manifest.root / "skills"
+            for source, sha in expanded[manifest.root]:
+                stale = find_stale_skills(source, sha, skills_dir)
+                if not stale:
+                    print(f"{label}: {source.name}: up to date")
+                elif dry_run:
+                    print(
+                        f"{label}: {describe_pending(source, sha, stale, skills_dir)}"
+                    )
+                else:
+                    fetch_key = (str(source.repo), sha)
+                    plan.setdefault(fetch_key, []).append((manifest, source, stale))
+
+        if dry_run:
+            return
+
+        for (repo, sha), targets in plan.items():
+            print(f"Fetching {repo} at {sha[:8]} for {len(targets)} source(s)...")
+            first = targets[0][1]
+            if _is_forge(first):
+                archive = forge_archive(client, first, sha)
+                for manifest, source, stale in targets:
+                    skills_dir = manifest.root / "skills"
+                    remove_skills(skills_dir, stale)
+                    print(f"Syncing {_label(manifest, root)}: {source.name}...")
+                    extracted = extract_tarball(archive, source, skills_dir, store)
+                    for skill_name in record_provenance(source, sha, extracted):
+                        print(f"  {skill_name}")
+            else:
+                sparse_paths = sorted(
+                    {
+                        skill_repo_path(source, skill_name)
+                        for _, source, _ in targets
+                        for skill_name in source.skills
+                    }
+                )
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    repo_dir = sparse_checkout(first, sparse_paths, Path(tmp_dir))
+                    for manifest, source, stale in targets:
+                        skills_dir = manifest.root / "skills"
+                        remove_skills(skills_dir, stale)
+                        print(f"Syncing {_label(manifest, root)}: {source.name}...")
+                        extracted = copy_checkout_skills(
+                            repo_dir, source, skills_dir, store
+                        )
+                        for skill_name in record_provenance(source, sha, extracted):
+                            print(f"  {skill_name}")
+
+        for manifest in manifests:
+            generate_license_file(manifest, manifest.root)
+            skills_dir = manifest.root / "skills"
+            update_catalog(skills_dir, recorder.take(skills_dir))
+        enforce_budget(*(manifest.root / "skills" for manifest in manifests))
@@ -0,0 +1,259 @@
+"""Parallel writer stage for extracted skill files."""
+
+import contextlib
+import os
+import stat
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from skill_quiver.cache import BlobStore
+from skill_quiver.catalog import FileStamp, current_recorder
+from skill_quiver.errors import SyncError
+
+DEFAULT_WRITE_JOBS = min(8, os.cpu_count() or 1)
+
+# Batches in flight per worker before the producer blocks
+QUEUE_DEPTH = 4
+
+# A batch is handed to a worker once it holds this many files or bytes
+BATCH_FILES = 64
+BATCH_BYTES = 1024 * 1024
+
+# What a worker writes: bytes (or a file to copy), the destination, and
+# whether it is executable (None for a copy: taken from the source file)
+_Payload = tuple[bytes | Path, str, bool | None]
+
+
+def write_jobs() -> int:
+    """Worker count from ``QUIV_WRITE_JOBS`` (default: up to 8)."""
+    value = os.environ.get("QUIV_WRITE_JOBS")
+    if not value:
+        return DEFAULT_WRITE_JOBS
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise SyncError(
+            f"Invalid QUIV_WRITE_JOBS '{value}': expected a positive integer"
+        )
+    return jobs
+
+
+def durable_writes() -> bool:
+    """Whether ``QUIV_DURABLE`` asks for skills to be synced to disk."""
+    return os.environ.get("QUIV_DURABLE", "").lower() in ("1", "true", "yes")
+
+
+def fsync_path(path: str | Path) -> None:
+    """Flush a file, or a directory's entries, to stable storage.
+
+    Raises:
+        OSError: If path cannot be opened or flushed.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SkillWriter:
+    """Write files into skill directories through the blob store in parallel.
+
+    The producer (a tar stream or a checkout walk) hands over payloads,
+    which are grouped into batches of up to ``BATCH_FILES`` files or
+    ``BATCH_BYTES`` bytes. A small thread pool hashes, stores, and
+    materializes each batch, so the cost of handing work to a thread is
+    paid per batch rather than per file. With a single job there is
+    nothing to overlap, and files are written inline on the producer
+    thread. Directories are created once, on the producer thread, before
+    any file in them is queued. The number of batches in flight is
+    bounded, so a large archive is never held in memory. The blob store
+    is locked shared (``BlobStore.in_use``) until the writes finish. With
+    ``durable``, the writer fsyncs each skill in one pass when it closes
+    (see ``_flush``) instead of syncing during extraction.
+    Inside a ``catalog.recording`` block, each skill's file digests, with
+    the size and mtime of the files written, and its SKILL.md are reported
+    to the catalog when the writer closes.
+    """
+
+    def __init__(
+        self, store: BlobStore, jobs: int | None = None, durable: bool | None = None
+    ) -> None:
+        self.store = store
+        self.jobs = write_jobs() if jobs is None else jobs
+        self.durable = durable_writes() if durable is None else durable
+        self._pool = (
+            ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="quiv-writer")
+            if self.jobs > 1
+            else None
+        )
+        self._slots = threading.BoundedSemaphore(self.jobs * QUEUE_DEPTH)
+        self._batch: list[_Payload] = []
+        self._batch_bytes = 0
+        self._futures: list[Future[list[FileStamp]]] = []
+        # Stamps of files written inline, in queue order
+        self._stamps: list[FileStamp] = []
+        self._targets: list[tuple[Path, str]] = []
+        self._skill_md: dict[Path, bytes] = {}
+        self._recorder = current_recorder()
+        self._dirs: set[str] = set()
+        self.skill_dirs: list[Path] = []
+        self._held = contextlib.ExitStack()
+        self._held.enter_context(store.in_use())
+
+    def __enter__(self) -> "SkillWriter":
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self._held.close()
+
+    def write_bytes(
+        self, skill_dir: Path, rel_path: str, data: bytes, executable: bool = False
+    ) -> None:
+        """Queue data to be written at ``skill_dir/rel_path``.
+
+        Raises:
+            SyncError: If the file is written inline and cannot be.
+        """
+        dest = self._prepare(skill_dir, rel_path)
+        if rel_path == "SKILL.md":
+            self._skill_md[skill_dir] = data
+        self._queue(skill_dir, rel_path, (data, dest, executable), len(data))
+
+    def copy_file(self, skill_dir: Path, rel_path: str, src: Path) -> None:
+        """Queue src to be copied to ``skill_dir/rel_path``, keeping its exec bit.
+
+        Raises:
+            SyncError: If the file is copied inline and cannot be.
+        """
+        dest = self._prepare(skill_dir, rel_path)
+        if rel_path == "SKILL.md":
+            self._skill_md[skill_dir] = src.read_bytes()
+        self._queue(skill_dir, rel_path, (src, dest, None), 0)
+
+    def close(self) -> None:
+        """Wait for every queued write, then sync if durable.
+
+        Raises:
+            SyncError: If any write failed.
+        """
+        try:
+            if self._pool is not None:
+                self._submit()
+                self._pool.shutdown(wait=True)
+        finally:
+            self._held.close()
+        stamps = self._stamps
+        for future in self._futures:
+            error = future.exception()
+            if error is not None:
+                if isinstance(error, SyncError):
+                    raise error
+                raise SyncError(f"Failed to write skill file: {error}") from error
+            stamps.extend(future.result())
+        if self.durable:
+            self._flush()
+        if self._recorder is not None:
+            files: dict[Path, dict[str, FileStamp]] = {}
+            for (skill_dir, rel_path), stamp in zip(self._targets, stamps):
+                files.setdefault(skill_dir, {})[rel_path] = stamp
+            for skill_dir in self.skill_dirs:
+                self._recorder.add(
+                    skill_dir, files.get(skill_dir, {}), self._skill_md.get(skill_dir)
+                )
+
+    def _flush(self) -> None:
+        """fsync each skill's files and then its directories, one skill at a time.
+
+        Running after every write has finished lets the first fsync of a
+        skill commit most of its writes at once, so the rest find little
+        left to flush. Directories above the skills go last.
+        """
+        files: dict[Path, list[str]] = {}
+        for skill_dir, rel_path in self._targets:
+            files.setdefault(skill_dir, []).append(os.path.join(skill_dir, rel_path))
+        # New skill directories are entries in their parent, too
+        dirs = self._dirs | {
+            os.fspath(skill_dir.parent) for skill_dir in self.skill_dirs
+        }
+        passes = []
+        for skill_dir in self.skill_dirs:
+            base = os.fspath(skill_dir)
+            own = sorted(d for d in dirs if d == base or d.startswith(base + os.sep))
+            dirs.difference_update(own)
+            passes.append([*files.get(skill_dir, []), *own])
+        passes.append(sorted(dirs))
+        for paths in passes:
+            for path in paths:
+                try:
+                    fsync_path(path)
+                except OSError as e:
+                    raise SyncError(f"Cannot flush {path}: {e}") from e
+
+    def _prepare(self, skill_dir: Path, rel_path: str) -> str:
+        # Plain strings: Path arithmetic per file costs more than the write
+        base = os.fspath(skill_dir)
+        if base not in self._dirs:
+            os.makedirs(base, exist_ok=True)
+            self._dirs.add(base)
+            self.skill_dirs.append(skill_dir)
+        dest = os.path.join(base, rel_path)
+        parent = os.path.dirname(dest)
+        if parent not in self._dirs:
+            os.makedirs(parent, exist_ok=True)
+            # Intermediate directories are new entries too
+            while parent not in self._dirs and parent != os.path.dirname(parent):
+                self._dirs.add(parent)
+                parent = os.path.dirname(parent)
+        return dest
+
+    def _queue(
+        self, skill_dir: Path, rel_path: str, payload: _Payload, size: int
+    ) -> None:
+        self._targets.append((skill_dir, rel_path))
+        if self._pool is None:
+            self._stamps.append(self._write(payload))
+            return
+        self._batch.append(payload)
+        self._batch_bytes += size
+        if len(self._batch) >= BATCH_FILES or self._batch_bytes >= BATCH_BYTES:
+            self._submit()
+
+    def _submit(self) -> None:
+        """Hand the current batch to the pool."""
+        if not self._batch or self._pool is None:
+            return
+        batch = self._batch
+        self._batch = []
+        self._batch_bytes = 0
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._write_batch, batch)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _write_batch(self, batch: list[_Payload]) -> list[FileStamp]:
+        return [self._write(payload) for payload in batch]
+
+    def _write(self, payload: _Payload) -> FileStamp:
+        data, dest, executable = payload
+        try:
+            if isinstance(data, Path):
+                executable = bool(os.stat(data).st_mode & stat.S_IXUSR)
+                data = data.read_bytes()
+            digest = self.store.place_bytes(data, dest, bool(executable))
+            st = os.stat(dest)
+        except OSError as e:
+            raise SyncError(f"Failed to write skill file {dest}: {e}") from e
+        return FileStamp(digest, st.st_size, st.st_mtime_ns)
@@ -1,5 +1,7 @@
 """Shared test fixtures for skill-quiver tests."""
 
+import io
+import tarfile
 from pathlib import Path
 
 import pytest
@@ -48,6 +50,34 @@ source {
 """
 
 
+def make_tarball(files: dict[str, str], top_dir: str = "example-repo-abc123") -> bytes:
+    """Create a GitHub-style .tar.gz in memory with the given files."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for path, content in files.items():
+            info = tarfile.TarInfo(name=f"{top_dir}/{path}")
+            data = content.encode("utf-8")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Point the quiv cache at a per-test temporary directory.
+
+    The user's config file and host overrides are hidden as well.
+    """
+    cache = tmp_path_factory.mktemp("quiv-cache")
+    monkeypatch.setenv("QUIV_CACHE_DIR", str(cache))
+    monkeypatch.setenv("QUIV_CONFIG", str(cache / "config.kdl"))
+    monkeypatch.delenv("QUIV_GITHUB_API", raising=False)
+    monkeypatch.delenv("QUIV_GITHUB_ARCHIVE", raising=False)
+    return cache
+
+
 @pytest.fixture
 def sample_manifest(tmp_path: Path) -> Path:
     """Create a sample skills.kdl manifest file."""
@@ -0,0 +1,103 @@
+"""Tests for the seekable archive cache."""
+
+from pathlib import Path
+
+import pytest
+
+from skill_quiver.archive import (
+    index_path,
+    load_index,
+    store_gzip_tarball,
+    verify_archive,
+)
+from skill_quiver.cache import BlobStore
+from skill_quiver.errors import SyncError
+from skill_quiver.manifest import Source
+from skill_quiver.sync import extract_tarball
+from tests.conftest import make_tarball
+
+FILES = {
+    "README.md": "readme",
+    "skills/pdf/SKILL.md": "# pdf",
+    "skills/pdf/refs/spec.md": "spec",
+    "skills/pdf-extra/SKILL.md": "# pdf-extra",
+    "skills/xlsx/SKILL.md": "# xlsx",
+}
+
+
+@pytest.fixture
+def cached(tmp_path: Path) -> Path:
+    gz = tmp_path / "download.tar.gz"
+    gz.write_bytes(make_tarball(FILES))
+    archive = tmp_path / "cache" / "abc.tar"
+    store_gzip_tarball(gz, archive)
+    return archive
+
+
+def _source(*skills: str) -> Source:
+    return Source(
+        name="test-source",
+        repo="https://github.com/example/repo",
+        path="skills",
+        skills=list(skills),
+    )
+
+
+class TestStoreGzipTarball:
+    def test_index_written(self, cached: Path) -> None:
+        index = load_index(cached)
+        assert index is not None
+        assert index.top == "example-repo-abc123"
+        assert index.names == sorted(FILES)
+        assert index_path(cached).is_file()
+        assert verify_archive(cached)
+
+    def test_under_is_prefix_exact(self, cached: Path) -> None:
+        index = load_index(cached)
+        assert index is not None
+        assert [n for n, _, _ in index.under("skills/pdf/")] == [
+            "skills/pdf/SKILL.md",
+            "skills/pdf/refs/spec.md",
+        ]
+
+    def test_rejects_corrupt_download(self, tmp_path: Path) -> None:
+        gz = tmp_path / "download.tar.gz"
+        gz.write_bytes(make_tarball(FILES)[:-20])
+        with pytest.raises(SyncError, match="corrupt"):
+            store_gzip_tarball(gz, tmp_path / "abc.tar")
+        assert not (tmp_path / "abc.tar").exists()
+
+    def test_verify_detects_corruption(self, cached: Path) -> None:
+        with open(cached, "r+b") as f:
+            f.seek(700)
+            f.write(b"!")
+        assert not verify_archive(cached)
+
+
+class TestIndexedExtraction:
+    def test_extracts_only_requested_skills(self, tmp_path: Path, cached: Path) -> None:
+        dest = tmp_path / "skills"
+        extracted = extract_tarball(
+            cached, _source("pdf", "missing"), dest, BlobStore(tmp_path / "blobs")
+        )
+
+        assert extracted == [dest / "pdf"]
+        assert (dest / "pdf" / "refs" / "spec.md").read_text() == "spec"
+        assert not (dest / "pdf-extra").exists()
+        assert not (dest / "xlsx").exists()
+
+    def test_matches_streaming_extraction(self, tmp_path: Path, cached: Path) -> None:
+        gz = tmp_path / "download.tar.gz"
+        store = BlobStore(tmp_path / "blobs")
+        source = _source("pdf", "pdf-extra", "xlsx")
+        extract_tarball(cached, source, tmp_path / "indexed", store)
+        extract_tarball(gz, source, tmp_path / "streamed", store)
+
+        def tree(root: Path) -> dict[str, bytes]:
+            return {
+                p.relative_to(root).as_posix(): p.read_bytes()
+                for p in root.rglob("*")
+                if p.is_file()
+            }
+
+        assert tree(tmp_path / "indexed") == tree(tmp_path / "streamed")
@@ -0,0 +1,128 @@
+"""Tests for portable bundles."""
+
+import tarfile
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.bundle import BUNDLE_INDEX, Bundle, sync_from_bundle, write_bundle
+from skill_quiver.errors import SyncError
+from skill_quiver.manifest import parse_manifest
+from skill_quiver.provenance import read_provenance
+from tests.conftest import make_tarball
+
+COMMITS_URL = "https://api.github.com/repos/example/repo/commits/main"
+TARBALL_URL = "https://api.github.com/repos/example/repo/tarball/abc123"
+
+MANIFEST = """\
+source {
+    name "test-source"
+    repo "https://github.com/example/repo"
+    path "skills"
+    license "MIT"
+    skill "skill-a"
+    skill "skill-b"
+}
+"""
+
+
+@pytest.fixture
+def bundle_file(tmp_path: Path) -> Path:
+    """Write a bundle for MANIFEST with mocked GitHub responses."""
+    source_dir = tmp_path / "online"
+    source_dir.mkdir()
+    (source_dir / "skills.kdl").write_text(MANIFEST, encoding="utf-8")
+    tarball = make_tarball(
+        {
+            "skills/skill-a/SKILL.md": "# A",
+            "skills/skill-b/SKILL.md": "# B",
+        }
+    )
+    out = tmp_path / "out.tar"
+    with respx.mock:
+        respx.get(COMMITS_URL).mock(
+            return_value=httpx.Response(200, json={"sha": "abc123"})
+        )
+        respx.get(TARBALL_URL).mock(return_value=httpx.Response(200, content=tarball))
+        write_bundle(parse_manifest(source_dir / "skills.kdl"), out)
+    return out
+
+
+def _offline_project(tmp_path: Path, manifest: str = MANIFEST) -> Path:
+    project = tmp_path / "offline"
+    project.mkdir()
+    (project / "skills.kdl").write_text(manifest, encoding="utf-8")
+    return project
+
+
+class TestWriteBundle:
+    def test_index_is_first_member(self, bundle_file: Path) -> None:
+        with tarfile.open(bundle_file, "r:") as tar:
+            names = tar.getnames()
+        assert names[0] == BUNDLE_INDEX
+        assert len(names) == 2
+
+    def test_index_records_resolution(self, bundle_file: Path) -> None:
+        with Bundle(bundle_file) as bundle:
+            (entry,) = bundle.index.sources
+        assert entry.sha == "abc123"
+        assert entry.skills == ["skill-a", "skill-b"]
+
+
+class TestSyncFromBundle:
+    @respx.mock
+    def test_installs_without_network(self, tmp_path: Path, bundle_file: Path) -> None:
+        # respx.mock fails any request that has no route
+        project = _offline_project(tmp_path)
+        sync_from_bundle(parse_manifest(project / "skills.kdl"), bundle_file)
+
+        for skill in ("skill-a", "skill-b"):
+            assert (project / "skills" / skill / "SKILL.md").is_file()
+            prov = read_provenance(project / "skills" / skill)
+            assert prov is not None
+            assert prov.sha == "abc123"
+        assert (project / "THIRD_PARTY_LICENSES").is_file()
+
+    def test_skip_if_up_to_date(
+        self, tmp_path: Path, bundle_file: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        manifest = parse_manifest(_offline_project(tmp_path) / "skills.kdl")
+        sync_from_bundle(manifest, bundle_file)
+        capsys.readouterr()
+        sync_from_bundle(manifest, bundle_file)
+        assert "test-source: up to date" in capsys.readouterr().out
+
+    def test_unknown_source(self, tmp_path: Path, bundle_file: Path) -> None:
+        project = _offline_project(
+            tmp_path, MANIFEST.replace('name "test-source"', 'name "other"')
+        )
+        with pytest.raises(SyncError, match="no entry for other"):
+            sync_from_bundle(parse_manifest(project / "skills.kdl"), bundle_file)
+
+    def test_missing_skill(self, tmp_path: Path, bundle_file: Path) -> None:
+        project = _offline_project(
+            tmp_path, MANIFEST.replace('skill "skill-b"', 'skill "skill-c"')
+        )
+        with pytest.raises(SyncError, match="no skill-c"):
+            sync_from_bundle(parse_manifest(project / "skills.kdl"), bundle_file)
+
+    def test_corrupt_archive(self, tmp_path: Path, bundle_file: Path) -> None:
+        with Bundle(bundle_file) as bundle:
+            member = bundle.index.sources[0].archive
+        with tarfile.open(bundle_file, "r:") as tar:
+            offset = tar.getmember(member).offset_data
+        with open(bundle_file, "r+b") as f:
+            f.seek(offset + 20)
+            f.write(b"\0\0\0\0")
+
+        project = _offline_project(tmp_path)
+        with pytest.raises(SyncError, match="corrupt"):
+            sync_from_bundle(parse_manifest(project / "skills.kdl"), bundle_file)
+
+    def test_not_a_bundle(self, tmp_path: Path) -> None:
+        bogus = tmp_path / "bogus.tar"
+        bogus.write_bytes(b"not a tar")
+        with pytest.raises(SyncError, match="Cannot open bundle"):
+            Bundle(bogus)
@@ -0,0 +1,276 @@
+"""Tests for the quiv cache and blob store."""
+
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from skill_quiver.archive import index_path
+from skill_quiver.cache import (
+    BlobStore,
+    CacheIndex,
+    archive_path,
+    blob_store,
+    cache_dir,
+    cache_index,
+    cache_stats,
+    clear_cache,
+    enforce_budget,
+    mirror_path,
+    parse_duration,
+    parse_size,
+    pinned_keys,
+)
+from skill_quiver.errors import QuivError, SyncError
+from skill_quiver.provenance import Provenance, write_provenance
+
+
+class TestCacheDir:
+    def test_env_override(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("QUIV_CACHE_DIR", str(tmp_path / "c"))
+        assert cache_dir() == tmp_path / "c"
+
+    def test_xdg_cache_home(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("QUIV_CACHE_DIR")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        assert cache_dir() == tmp_path / "quiv"
+
+    def test_blob_store_under_cache(self, isolated_cache: Path) -> None:
+        assert blob_store().root == isolated_cache / "blobs"
+
+
+class TestBlobStore:
+    def test_put_bytes_is_content_addressed(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        first = store.put_bytes(b"same content")
+        second = store.put_bytes(b"same content")
+        assert first == second
+        assert store.path(first).read_bytes() == b"same content"
+        assert len(list((tmp_path / "blobs").rglob("*"))) == 2  # fan-out dir + blob
+
+    def test_blobs_are_read_only(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.put_bytes(b"data")
+        assert store.path(digest).stat().st_mode & 0o777 == 0o444
+
+    def test_put_file(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        src = tmp_path / "src.txt"
+        src.write_bytes(b"from file")
+        assert store.put_file(src) == store.put_bytes(b"from file")
+
+    def test_materialize_shares_storage(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.put_bytes(b"shared")
+        a = tmp_path / "a.txt"
+        b = tmp_path / "b.txt"
+        store.materialize(digest, a)
+        store.materialize(digest, b)
+        assert a.read_bytes() == b"shared"
+        assert b.read_bytes() == b"shared"
+
+    def test_materialize_is_writable_and_independent(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.put_bytes(b"shared")
+        dest = tmp_path / "run.sh"
+        store.materialize(digest, dest, executable=True)
+        assert dest.stat().st_mode & 0o100
+        assert dest.stat().st_nlink == 1
+        dest.write_bytes(b"edited")
+        assert store.path(digest).read_bytes() == b"shared"
+        assert store.path(digest).stat().st_mode & 0o777 == 0o444
+
+    def test_materialize_replaces_existing(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        dest = tmp_path / "out.txt"
+        dest.write_bytes(b"old")
+        store.materialize(store.put_bytes(b"new"), dest)
+        assert dest.read_bytes() == b"new"
+
+    def test_copy_mode(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("QUIV_LINK_MODE", "copy")
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.put_bytes(b"copied")
+        dest = tmp_path / "out.txt"
+        store.materialize(digest, dest)
+        assert dest.read_bytes() == b"copied"
+        assert not os.path.samefile(dest, store.path(digest))
+        # Copies are independent of the store and stay writable
+        dest.write_bytes(b"edited")
+        assert store.path(digest).read_bytes() == b"copied"
+
+    def test_hardlink_mode(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("QUIV_LINK_MODE", "hardlink")
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.place_bytes(b"linked", tmp_path / "a.txt")
+        store.place_bytes(b"linked", tmp_path / "run.sh", executable=True)
+        assert os.path.samefile(tmp_path / "a.txt", store.path(digest))
+        # A hardlink would share the blob's mode, so executables are copied
+        assert not os.path.samefile(tmp_path / "run.sh", store.path(digest))
+        assert (tmp_path / "run.sh").stat().st_mode & 0o100
+
+    def test_copies_skip_the_store(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("QUIV_LINK_MODE", "copy")
+        store = BlobStore(tmp_path / "blobs")
+        dest = tmp_path / "run.sh"
+        dest.write_bytes(b"old")
+        digest = store.place_bytes(b"copied", dest, executable=True)
+        assert dest.read_bytes() == b"copied"
+        assert dest.stat().st_mode & 0o100
+        assert not store.path(digest).exists()
+
+    def test_invalid_link_mode(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("QUIV_LINK_MODE", "symlink")
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.put_bytes(b"x")
+        with pytest.raises(SyncError, match="QUIV_LINK_MODE"):
+            store.materialize(digest, tmp_path / "out.txt")
+
+    def test_missing_blob(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        with pytest.raises(SyncError, match="Cannot materialize"):
+            store.materialize("ab" * 32, tmp_path / "out.txt")
+
+
+def _entry(index: CacheIndex, key: str, size: int, atime: float) -> None:
+    path = index.root / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    with open(index.path, "a", encoding="utf-8") as f:
+        f.write(f"{atime:.3f} {size} {key}\n")
+
+
+class TestCacheIndex:
+    def test_records_fold_to_latest(self, tmp_path: Path) -> None:
+        index = CacheIndex(tmp_path)
+        index.record("blobs/ab/cd", 10)
+        index.record("blobs/ab/cd", 10)
+        index.record("listings/x.json", 3)
+        assert set(index.entries()) == {"blobs/ab/cd", "listings/x.json"}
+        assert index.entries()["listings/x.json"][1] == 3
+
+    def test_rebuilds_from_metadata(self, tmp_path: Path) -> None:
+        (tmp_path / "archives").mkdir()
+        (tmp_path / "archives" / "a.tar.gz").write_bytes(b"12345")
+        entries = CacheIndex(tmp_path).entries()
+        assert entries["archives/a.tar.gz"][1] == 5
+        assert (tmp_path / "index.log").is_file()
+
+    def test_prune_max_size_evicts_lru(self, tmp_path: Path) -> None:
+        index = CacheIndex(tmp_path)
+        now = time.time()
+        _entry(index, "archives/old", 100, now - 30)
+        _entry(index, "archives/mid", 100, now - 20)
+        _entry(index, "archives/new", 100, now - 10)
+
+        assert index.prune(max_size=150) == (2, 200)
+        assert not (tmp_path / "archives" / "old").exists()
+        assert not (tmp_path / "archives" / "mid").exists()
+        assert set(index.entries()) == {"archives/new"}
+
+    def test_prune_older_than(self, tmp_path: Path) -> None:
+        index = CacheIndex(tmp_path)
+        now = time.time()
+        _entry(index, "archives/stale", 1, now - 3 * 86400)
+        _entry(index, "archives/fresh", 1, now)
+
+        assert index.prune(older_than=86400) == (1, 1)
+        assert set(index.entries()) == {"archives/fresh"}
+
+    def test_prune_keeps_pinned(self, tmp_path: Path) -> None:
+        index = CacheIndex(tmp_path)
+        now = time.time()
+        _entry(index, "archives/pinned", 100, now - 100)
+        _entry(index, "archives/other", 100, now)
+
+        index.prune(max_size=0, pinned=frozenset({"archives/pinned"}))
+        assert (tmp_path / "archives" / "pinned").exists()
+        assert set(index.entries()) == {"archives/pinned"}
+
+    def test_blob_store_records_access(self) -> None:
+        store = blob_store()
+        store.put_bytes(b"tracked")
+        stats = cache_stats()
+        assert stats["blobs"] == (1, len(b"tracked"))
+
+
+class TestCacheMaintenance:
+    def test_pinned_keys_from_provenance(self, tmp_path: Path) -> None:
+        skill = tmp_path / "skills" / "pdf"
+        skill.mkdir(parents=True)
+        write_provenance(
+            skill,
+            Provenance(
+                repo="https://github.com/o/r",
+                path="skills",
+                ref="main",
+                sha="a" * 40,
+                license="MIT",
+                fetched=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            ),
+        )
+        index = cache_index()
+        archive = archive_path("https://github.com/o/r", "a" * 40)
+        assert pinned_keys(tmp_path / "skills") == {
+            index.key_for(archive),
+            index.key_for(index_path(archive)),
+            index.key_for(mirror_path("https://github.com/o/r")),
+        }
+
+    def test_enforce_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        index = cache_index()
+        _entry(index, "archives/big", 1000, time.time())
+        monkeypatch.setenv("QUIV_CACHE_MAX_SIZE", "100")
+        enforce_budget()
+        assert not (cache_dir() / "archives" / "big").exists()
+
+    def test_no_budget_keeps_everything(self) -> None:
+        index = cache_index()
+        _entry(index, "archives/big", 1000, time.time())
+        enforce_budget()
+        assert (cache_dir() / "archives" / "big").exists()
+
+    def test_clear(self) -> None:
+        blob_store().put_bytes(b"gone")
+        clear_cache()
+        assert not cache_dir().exists()
+        assert cache_stats() == {}
+
+
+class TestParsing:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("100", 100),
+            ("2K", 2048),
+            ("500M", 500 * 1024**2),
+            ("1.5GB", 1536 * 1024**2),
+        ],
+    )
+    def test_parse_size(self, text: str, expected: int) -> None:
+        assert parse_size(text) == expected
+
+    @pytest.mark.parametrize(
+        ("text", "expected"), [("30s", 30), ("12h", 43200), ("30d", 2592000)]
+    )
+    def test_parse_duration(self, text: str, expected: float) -> None:
+        assert parse_duration(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "big", "10x"])
+    def test_invalid(self, text: str) -> None:
+        with pytest.raises(QuivError):
+            parse_size(text)
+        with pytest.raises(QuivError):
+            parse_duration(text)
@@ -0,0 +1,133 @@
+"""Tests for the skills/index.json catalog."""
+
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from skill_quiver import catalog as catalog_module
+from skill_quiver.catalog import (
+    catalog_path,
+    parse_frontmatter,
+    read_catalog,
+    scan_skill,
+)
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.sync import sync
+
+SKILL_MD = """---
+name: pdf
+description: Read and fill PDF forms
+version: 2
+updated: 2024-05-01
+---
+# PDF
+"""
+
+
+def _manifest(tmp_path: Path, **skills: str) -> Manifest:
+    """A project whose local source holds one skill per keyword argument."""
+    upstream = tmp_path / "upstream"
+    for name, skill_md in skills.items():
+        (upstream / name / "scripts").mkdir(parents=True, exist_ok=True)
+        (upstream / name / "SKILL.md").write_text(skill_md, encoding="utf-8")
+        (upstream / name / "scripts" / "run.py").write_text("print()", encoding="utf-8")
+    root = tmp_path / "project"
+    root.mkdir(exist_ok=True)
+    source = Source(name="local", repo=str(upstream), skills=sorted(skills))
+    return Manifest(sources=[source], root=root)
+
+
+class TestFrontmatter:
+    def test_fields(self) -> None:
+        fields = parse_frontmatter(SKILL_MD.encode())
+        assert fields == {
+            "name": "pdf",
+            "description": "Read and fill PDF forms",
+            "version": 2,
+            "updated": "2024-05-01",
+        }
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "# No frontmatter\n",
+            "---\nname: [unclosed\n---\n",
+            "---\n- a list\n---\n",
+            "---\nname: never closed\n",
+        ],
+    )
+    def test_missing_or_malformed(self, text: str) -> None:
+        assert parse_frontmatter(text.encode()) == {}
+
+
+class TestSync:
+    def test_sync_writes_catalog(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, pdf=SKILL_MD, plain="# Plain\n")
+        sync(manifest)
+
+        skills_dir = manifest.root / "skills"
+        data = json.loads(catalog_path(skills_dir).read_text(encoding="utf-8"))
+        assert list(data["skills"]) == ["pdf", "plain"]
+        pdf = data["skills"]["pdf"]
+        assert pdf["description"] == "Read and fill PDF forms"
+        assert pdf["frontmatter"]["version"] == 2
+        assert pdf["files"] == ["SKILL.md", "scripts/run.py"]
+        assert data["skills"]["plain"]["frontmatter"] == {}
+
+        # Digests from the writer match a fresh read of the files
+        assert pdf["hash"] == scan_skill(skills_dir / "pdf").entry.hash
+
+    def test_only_changed_skills_are_rebuilt(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, pdf=SKILL_MD, plain="# Plain\n")
+        sync(manifest)
+        skills_dir = manifest.root / "skills"
+        before = read_catalog(skills_dir)
+        assert before is not None
+
+        upstream = tmp_path / "upstream" / "plain"
+        (upstream / "SKILL.md").write_text(
+            "---\ndescription: Now described\n---\n", encoding="utf-8"
+        )
+        with patch.object(
+            catalog_module, "scan_skill", wraps=catalog_module.scan_skill
+        ) as scan:
+            sync(manifest)
+
+        after = read_catalog(skills_dir)
+        assert after is not None
+        assert scan.call_count == 0
+        assert after.skills["plain"].description == "Now described"
+        assert after.skills["plain"].hash != before.skills["plain"].hash
+        assert after.skills["pdf"] == before.skills["pdf"]
+
+    def test_missing_catalog_is_rebuilt_from_disk(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, pdf=SKILL_MD)
+        sync(manifest)
+        path = catalog_path(manifest.root / "skills")
+        expected = path.read_text(encoding="utf-8")
+        path.unlink()
+
+        # As if the local source had not been edited just now
+        with patch("skill_quiver.local.RACY_WINDOW_NS", -(10**18)):
+            report = sync(manifest)
+        assert report.sources[0].status == "up-to-date"
+        assert path.read_text(encoding="utf-8") == expected
+
+    def test_removed_skill_is_dropped(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, pdf=SKILL_MD, plain="# Plain\n")
+        sync(manifest)
+        shutil.rmtree(manifest.root / "skills" / "plain")
+        source = manifest.sources[0].model_copy(update={"skills": ["pdf"]})
+        sync(Manifest(sources=[source], root=manifest.root))
+
+        catalog = read_catalog(manifest.root / "skills")
+        assert catalog is not None
+        assert list(catalog.skills) == ["pdf"]
+
+    def test_dry_run_writes_nothing(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, pdf=SKILL_MD)
+        sync(manifest, dry_run=True)
+        assert not catalog_path(manifest.root / "skills").exists()
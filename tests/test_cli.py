@@ -3,6 +3,7 @@
 import subprocess
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -57,6 +58,13 @@ class TestHelp:
         captured = capsys.readouterr()
         assert "--dry-run" in captured.out
 
+    def test_watch_help(self, capsys: pytest.CaptureFixture[str]) -> None:
+        with pytest.raises(SystemExit) as exc_info:
+            main(["watch", "--help"])
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        assert "--interval" in captured.out
+
 
 class TestDirFlag:
     def test_valid_dir(self, tmp_path: Path) -> None:
@@ -71,6 +79,20 @@ class TestDirFlag:
         assert exc_info.value.code != 0
 
 
+class TestSyncSelection:
+    def test_empty_selection_syncs_nothing(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        (tmp_path / "skills.kdl").write_text(
+            'source {\n    name "dev"\n    repo "./nowhere"\n    skill "pdf"\n}\n',
+            encoding="utf-8",
+        )
+        with patch("skill_quiver.selection._skill_changed", return_value=False):
+            main(["--dir", str(tmp_path), "sync", "--changed"])
+        assert "Nothing to sync" in capsys.readouterr().out
+        assert not (tmp_path / "THIRD_PARTY_LICENSES").exists()
+
+
 class TestFindManifest:
     def test_manifest_in_current_dir(self, tmp_path: Path) -> None:
         manifest = tmp_path / "skills.kdl"
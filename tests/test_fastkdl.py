@@ -0,0 +1,111 @@
+"""Tests for the fast KDL subset parser, checked against kdl-py."""
+
+import random
+
+import kdl
+import pytest
+
+from skill_quiver import fastkdl
+
+NAMES = ["source", "skill", "exclude-skill", "repo", "include", "manifest", "a_b"]
+CHARS = 'abc-XYZ019 ./:"\\\n\t\r\b\f/{}=;é😀//#'
+ESCAPES = {'"': '\\"', "\\": "\\\\", "\n": "\\n", "\t": "\\t", "\r": "\\r"}
+ESCAPES |= {"\b": "\\b", "\f": "\\f"}
+
+
+def _quote(value: str, rng: random.Random) -> str:
+    out = []
+    for ch in value:
+        if ch == "/" and rng.random() < 0.3:
+            out.append("\\/")
+        else:
+            out.append(ESCAPES.get(ch, ch))
+    return '"' + "".join(out) + '"'
+
+
+def _value(rng: random.Random) -> str:
+    return "".join(rng.choice(CHARS) for _ in range(rng.randrange(12)))
+
+
+def _node(rng: random.Random, depth: int, indent: str) -> list[str]:
+    space = lambda: rng.choice([" ", "  ", "\t"])  # noqa: E731
+    line = indent + rng.choice(NAMES)
+    for _ in range(rng.randrange(4)):
+        if rng.random() < 0.5:
+            line += space() + _quote(_value(rng), rng)
+        else:
+            line += f"{space()}{rng.choice(NAMES)}={_quote(_value(rng), rng)}"
+    children = depth < 2 and rng.random() < 0.4
+    if children:
+        line += space() + "{"
+    if rng.random() < 0.2:
+        comment = "".join(c for c in _value(rng) if c.isprintable())
+        line += space() + "// " + comment
+    lines = [line]
+    if children:
+        for _ in range(rng.randrange(4)):
+            lines.extend(_node(rng, depth + 1, indent + rng.choice(["\t", "    "])))
+        lines.append(indent + "}")
+    return lines
+
+
+def _document(rng: random.Random) -> str:
+    lines: list[str] = []
+    for _ in range(rng.randrange(5)):
+        if rng.random() < 0.2:
+            lines.append(rng.choice(["", "// comment", "   "]))
+        lines.extend(_node(rng, 0, ""))
+    newline = "\r\n" if rng.random() < 0.2 else "\n"
+    return newline.join(lines) + rng.choice(["", newline])
+
+
+class TestCorpus:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_kdl_py(self, seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(50):
+            text = _document(rng)
+            nodes = fastkdl._parse_subset(text)
+            assert nodes is not None, text
+            expected = kdl.parse(text).nodes
+            assert nodes == expected, text
+            assert fastkdl.dumps(nodes) == str(kdl.Document(nodes=expected))
+
+    def test_round_trip(self) -> None:
+        rng = random.Random(0)
+        for _ in range(200):
+            nodes = fastkdl.parse(_document(rng))
+            assert fastkdl.parse(fastkdl.dumps(nodes)) == nodes
+
+
+class TestFallback:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "a 1 b=2.5",
+            "a true x=null",
+            'a r#"raw "quoted""#',
+            'a "x"; b "y"',
+            'a /* block */ "x"',
+            'a /-"skipped" "kept"',
+            '(tag)a "x"',
+            'a "\\u{1F600}"',
+            'a "multi\nline"',
+            'a { b "x"; }',
+            '"quoted name" "x"',
+        ],
+    )
+    def test_outside_subset_uses_kdl_py(self, text: str) -> None:
+        assert fastkdl._parse_subset(text) is None
+        assert fastkdl.parse(text) == kdl.parse(text).nodes
+
+    def test_invalid_syntax_raises(self) -> None:
+        with pytest.raises(kdl.ParseError):
+            fastkdl.parse("{{{ not kdl")
+
+    def test_dumps_non_string_values(self) -> None:
+        nodes = [kdl.Node(name="a", args=[1, None], props={"b": True})]
+        assert fastkdl.dumps(nodes) == str(kdl.Document(nodes=nodes))
+
+    def test_dumps_empty(self) -> None:
+        assert fastkdl.dumps([]) == str(kdl.Document())
@@ -0,0 +1,224 @@
+"""Tests for per-source include/exclude file filters."""
+
+import io
+import shutil
+import subprocess
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.cache import BlobStore
+from skill_quiver.filters import keep_file, sparse_patterns
+from skill_quiver.manifest import Manifest, Source, parse_manifest
+from skill_quiver.provenance import read_provenance
+from skill_quiver.sync import extract_tarball, sync
+from tests.conftest import make_tarball
+
+API = "https://api.github.com/repos/example/repo"
+
+FILES = {
+    "skills/pdf/SKILL.md": "# pdf",
+    "skills/pdf/scripts/run.py": "print()",
+    "skills/pdf/examples/big.csv": "a,b",
+    "skills/pdf/examples/readme.md": "examples",
+    "skills/pdf/docs/logo.png": "png",
+}
+
+
+def _tree(root: Path) -> list[str]:
+    return sorted(
+        p.relative_to(root).as_posix()
+        for p in root.rglob("*")
+        if p.is_file() and p.name != ".source.kdl"
+    )
+
+
+class TestKeepFile:
+    @pytest.mark.parametrize(
+        ("rel_path", "kept"),
+        [
+            ("SKILL.md", True),
+            ("scripts/run.py", True),
+            ("examples/big.csv", False),
+            ("docs/logo.png", False),
+            ("docs/guide.md", True),
+        ],
+    )
+    def test_exclude(self, rel_path: str, kept: bool) -> None:
+        assert keep_file(rel_path, [], ["examples", "*.png"]) is kept
+
+    @pytest.mark.parametrize(
+        ("rel_path", "kept"),
+        [
+            ("SKILL.md", True),
+            ("scripts/run.py", True),
+            ("scripts/test_run.py", False),
+            ("docs/logo.png", False),
+            ("reference.md", True),
+        ],
+    )
+    def test_include_then_exclude(self, rel_path: str, kept: bool) -> None:
+        assert keep_file(rel_path, ["scripts/**", "*.md"], ["test_*"]) is kept
+
+    def test_anchored_star_stays_in_segment(self) -> None:
+        assert keep_file("docs/a.md", ["docs/*.md"], [])
+        assert not keep_file("docs/sub/a.md", ["docs/*.md"], [])
+        assert keep_file("docs/sub/a.md", ["docs/**/*.md"], [])
+
+    def test_skill_md_survives_excludes(self) -> None:
+        assert keep_file("SKILL.md", [], ["*.md"])
+        assert not keep_file("nested/SKILL.md", [], ["*.md"])
+
+
+class TestManifest:
+    def test_parse_filters(self, tmp_path: Path) -> None:
+        path = tmp_path / "skills.kdl"
+        path.write_text(
+            'source {\n    name "s"\n    repo "https://github.com/o/r"\n'
+            '    skill "pdf"\n    include "scripts/**"\n    exclude "*.png"\n}\n',
+            encoding="utf-8",
+        )
+        source = parse_manifest(path).sources[0]
+        assert source.include == ["scripts/**"]
+        assert source.exclude == ["*.png"]
+        assert source.is_filtered
+
+    @pytest.mark.parametrize("pattern", ["/abs", "../up", "a/../../b", ""])
+    def test_invalid_patterns(self, pattern: str) -> None:
+        with pytest.raises(ValueError, match="Invalid file pattern"):
+            Source(
+                name="s", repo="https://github.com/o/r", skills=["a"], exclude=[pattern]
+            )
+
+
+class TestExtraction:
+    def test_streamed_archive_skips_excluded(self, tmp_path: Path) -> None:
+        source = Source(
+            name="s",
+            repo="https://github.com/example/repo",
+            path="skills",
+            skills=["pdf"],
+            exclude=["examples", "*.png"],
+        )
+        archive = io.BytesIO(make_tarball(FILES))
+        store = BlobStore(tmp_path / "blobs")
+        extract_tarball(archive, source, tmp_path / "out", store)
+        assert _tree(tmp_path / "out" / "pdf") == ["SKILL.md", "scripts/run.py"]
+
+    @respx.mock
+    def test_changing_filters_resyncs(self, tmp_path: Path) -> None:
+        respx.get(f"{API}/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": "abc123"})
+        )
+        tarball = respx.get(f"{API}/tarball/abc123").mock(
+            return_value=httpx.Response(200, content=make_tarball(FILES))
+        )
+        source = Source(
+            name="s",
+            repo="https://github.com/example/repo",
+            path="skills",
+            skills=["pdf"],
+            include=["scripts"],
+        )
+        skill = tmp_path / "skills" / "pdf"
+
+        sync(Manifest(sources=[source], root=tmp_path))
+        assert _tree(skill) == ["SKILL.md", "scripts/run.py"]
+        provenance = read_provenance(skill)
+        assert provenance is not None
+        assert provenance.include == ["scripts"]
+
+        report = sync(Manifest(sources=[source], root=tmp_path))
+        assert report.sources[0].status == "up-to-date"
+
+        # Same commit, new filters: re-extracted from the cached archive
+        widened = source.model_copy(update={"include": [], "exclude": ["*.csv"]})
+        report = sync(Manifest(sources=[widened], root=tmp_path))
+        assert report.sources[0].status == "synced"
+        assert _tree(skill) == [
+            "SKILL.md",
+            "docs/logo.png",
+            "examples/readme.md",
+            "scripts/run.py",
+        ]
+        assert tarball.call_count == 1
+
+    @respx.mock
+    def test_skill_with_every_file_filtered_out(self, tmp_path: Path) -> None:
+        respx.get(f"{API}/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": "abc123"})
+        )
+        files = {"skills/a/SKILL.md": "# a", "skills/b/data.bin": "bin"}
+        respx.get(f"{API}/tarball/abc123").mock(
+            return_value=httpx.Response(200, content=make_tarball(files))
+        )
+        source = Source(
+            name="s",
+            repo="https://github.com/example/repo",
+            path="skills",
+            skills=["a", "b"],
+            include=["*.md"],
+        )
+
+        sync(Manifest(sources=[source], root=tmp_path))
+
+        assert _tree(tmp_path / "skills" / "a") == ["SKILL.md"]
+        assert not (tmp_path / "skills" / "b").exists()
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+class TestSparseCheckout:
+    def test_patterns_match_keep_file(self, tmp_path: Path) -> None:
+        repo = tmp_path / "repo"
+        for rel, content in FILES.items():
+            (repo / rel).parent.mkdir(parents=True, exist_ok=True)
+            (repo / rel).write_text(content, encoding="utf-8")
+        env = {
+            "GIT_AUTHOR_NAME": "t",
+            "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t",
+            "GIT_COMMITTER_EMAIL": "t@example.com",
+            "HOME": str(tmp_path),
+        }
+        for args in (
+            ["init", "-q", "-b", "main"],
+            ["add", "."],
+            ["commit", "-qm", "x"],
+        ):
+            subprocess.run(["git", "-C", str(repo), *args], check=True, env=env)
+
+        include, exclude = ["*.md", "scripts"], ["readme.md"]
+        clone = tmp_path / "clone"
+        subprocess.run(
+            ["git", "clone", "-q", "--sparse", repo.as_uri(), str(clone)], check=True
+        )
+        subprocess.run(
+            ["git", "-C", str(clone), "sparse-checkout", "set", "--no-cone"]
+            + sparse_patterns("skills/pdf", include, exclude),
+            check=True,
+        )
+
+        expected = [
+            rel
+            for rel in sorted(FILES)
+            if keep_file(rel[len("skills/pdf/") :], include, exclude)
+        ]
+        assert [
+            f"skills/pdf/{rel}" for rel in _tree(clone / "skills" / "pdf")
+        ] == expected
+        assert expected == ["skills/pdf/SKILL.md", "skills/pdf/scripts/run.py"]
+
+        project = tmp_path / "project"
+        project.mkdir()
+        source = Source(
+            name="s",
+            repo=repo.as_uri(),
+            path="skills",
+            skills=["pdf"],
+            include=include,
+            exclude=exclude,
+        )
+        sync(Manifest(sources=[source], root=project))
+        assert _tree(project / "skills" / "pdf") == ["SKILL.md", "scripts/run.py"]
@@ -0,0 +1,173 @@
+"""Tests for configurable GitHub API hosts."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.errors import ConfigError
+from skill_quiver.hosts import forge_host
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.sync import _is_forge, _make_client, list_skills, sync
+from tests.conftest import make_tarball
+
+GHE_API = "https://ghe.example.com/api/v3/repos/team/skills"
+
+
+def _config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, content: str) -> None:
+    config = tmp_path / "config.kdl"
+    config.write_text(content, encoding="utf-8")
+    monkeypatch.setenv("QUIV_CONFIG", str(config))
+
+
+def _manifest(root: Path, repo: str) -> Manifest:
+    source = Source(name="team", repo=repo, path="skills", skills=["my-skill"])
+    return Manifest(sources=[source], root=root)
+
+
+def _mock_repo(api: str, archive: str | None = None) -> respx.Route:
+    respx.get(f"{api}/commits/main").mock(
+        return_value=httpx.Response(200, json={"sha": "abc123"})
+    )
+    tarball = make_tarball({"skills/my-skill/SKILL.md": "# Content"})
+    return respx.get(f"{archive or api}/tarball/abc123").mock(
+        return_value=httpx.Response(200, content=tarball)
+    )
+
+
+class TestHostMapping:
+    def test_defaults(self) -> None:
+        assert forge_host("https://github.com/o/r").kind == "github"
+        assert forge_host("https://gitlab.com/o/r").kind == "gitlab"
+        assert forge_host("https://codeberg.org/o/r").kind == "gitea"
+        assert forge_host("https://git.example.org/o/r") is None
+
+    def test_enterprise_host_from_config(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _config(
+            tmp_path,
+            monkeypatch,
+            'github-host "GHE.example.com" api="https://ghe.example.com/api/v3"\n',
+        )
+        source = Source(
+            name="team", repo="https://ghe.example.com/team/skills", skills=["a"]
+        )
+        assert _is_forge(source)
+
+    def test_invalid_config(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _config(tmp_path, monkeypatch, 'github-host "ghe.example.com"\n')
+        with pytest.raises(ConfigError, match="ghe.example.com"):
+            forge_host("https://ghe.example.com/team/skills")
+
+
+class TestRouting:
+    @respx.mock
+    def test_sync_through_enterprise_api(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _config(
+            tmp_path,
+            monkeypatch,
+            'github-host "ghe.example.com" api="https://ghe.example.com/api/v3" '
+            'token-env="GHE_TOKEN"\n',
+        )
+        monkeypatch.setenv("GHE_TOKEN", "ghe-secret")
+        tarball = _mock_repo(GHE_API)
+
+        sync(_manifest(tmp_path, "https://ghe.example.com/team/skills"))
+
+        assert (tmp_path / "skills" / "my-skill" / "SKILL.md").is_file()
+        request = tarball.calls[0].request
+        assert request.headers["Authorization"] == "Bearer ghe-secret"
+
+    @respx.mock
+    def test_github_through_caching_proxy(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("QUIV_GITHUB_API", "http://proxy.local/api")
+        monkeypatch.setenv("QUIV_GITHUB_ARCHIVE", "http://proxy.local/archive/")
+        tarball = _mock_repo(
+            "http://proxy.local/api/repos/example/repo",
+            "http://proxy.local/archive/repos/example/repo",
+        )
+
+        sync(_manifest(tmp_path, "https://github.com/example/repo"))
+
+        assert tarball.call_count == 1
+        assert (tmp_path / "skills" / "my-skill" / "SKILL.md").is_file()
+
+
+GITLAB_API = "https://gitlab.com/api/v4/projects/group%2Fsub%2Fskills"
+GITEA_API = "https://git.example.com/api/v1/repos/team/skills"
+
+
+class TestGitLab:
+    @respx.mock
+    def test_sync_via_archive_endpoint(self, tmp_path: Path) -> None:
+        respx.get(f"{GITLAB_API}/repository/commits/main").mock(
+            return_value=httpx.Response(200, json={"id": "abc123"})
+        )
+        tarball = make_tarball({"skills/my-skill/SKILL.md": "# Content"})
+        respx.get(f"{GITLAB_API}/repository/archive.tar.gz?sha=abc123").mock(
+            return_value=httpx.Response(200, content=tarball)
+        )
+
+        sync(_manifest(tmp_path, "https://gitlab.com/group/sub/skills.git"))
+
+        assert (tmp_path / "skills" / "my-skill" / "SKILL.md").is_file()
+
+    @respx.mock
+    def test_listing_follows_pages(self) -> None:
+        tree = f"{GITLAB_API}/repository/tree"
+        respx.get(tree, params={"page_token": "2"}).mock(
+            return_value=httpx.Response(
+                200, json=[{"path": "skills/xlsx/SKILL.md", "type": "blob"}]
+            )
+        )
+        respx.get(tree).mock(
+            return_value=httpx.Response(
+                200,
+                json=[{"path": "skills/pdf/SKILL.md", "type": "blob"}],
+                headers={"Link": f'<{tree}?page_token=2>; rel="next"'},
+            )
+        )
+        source = Source(
+            name="team",
+            repo="https://gitlab.com/group/sub/skills",
+            path="skills",
+            skills=["*"],
+        )
+        with _make_client() as client:
+            names = list_skills(client, source, "abc123")
+        assert names == ["pdf", "xlsx"]
+
+
+class TestGitea:
+    @respx.mock
+    def test_sync_via_archive_endpoint(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _config(
+            tmp_path,
+            monkeypatch,
+            'gitea-host "git.example.com" api="https://git.example.com/api/v1"\n',
+        )
+        monkeypatch.setenv("GITEA_TOKEN", "gitea-secret")
+        respx.get(f"{GITEA_API}/commits?sha=main&limit=1&stat=false").mock(
+            return_value=httpx.Response(200, json=[{"sha": "abc123"}])
+        )
+        tarball = respx.get(f"{GITEA_API}/archive/abc123.tar.gz").mock(
+            return_value=httpx.Response(
+                200, content=make_tarball({"skills/my-skill/SKILL.md": "# Content"})
+            )
+        )
+
+        sync(_manifest(tmp_path, "https://git.example.com/team/skills"))
+
+        assert (tmp_path / "skills" / "my-skill" / "SKILL.md").is_file()
+        request = tarball.calls[0].request
+        assert request.headers["Authorization"] == "token gitea-secret"
@@ -0,0 +1,124 @@
+"""Tests for resuming interrupted syncs from the journal."""
+
+from contextlib import AbstractContextManager
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from skill_quiver import sync as sync_module
+from skill_quiver.cache import blob_store
+from skill_quiver.errors import SyncError
+from skill_quiver.journal import journal_path, load_journal, save_journal
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.provenance import read_provenance
+from skill_quiver.report import SyncOptions
+from skill_quiver.sync import sync
+
+
+def _manifest(tmp_path: Path, *names: str) -> Manifest:
+    sources = []
+    for name in names:
+        skill = tmp_path / "upstream" / name / name
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text(f"# {name}", encoding="utf-8")
+        sources.append(
+            Source(name=name, repo=str(skill.parent), skills=[name], license="MIT")
+        )
+    root = tmp_path / "project"
+    root.mkdir()
+    return Manifest(sources=sources, root=root)
+
+
+def _interrupt_on(name: str) -> AbstractContextManager[object]:
+    """Make sync_source fail for one source, as if the run were killed."""
+    real = sync_module.sync_source
+
+    def sync_source(
+        client: object, source: Source, *args: object, **kwargs: object
+    ) -> object:
+        if source.name == name:
+            raise SyncError("killed")
+        return real(client, source, *args, **kwargs)
+
+    return patch("skill_quiver.sync.sync_source", side_effect=sync_source)
+
+
+class TestResume:
+    def test_finished_sources_are_not_redone(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, "alpha", "beta", "gamma")
+
+        with _interrupt_on("beta"), pytest.raises(SyncError):
+            sync(manifest)
+        journal = load_journal(manifest.root, manifest.sources)
+        assert journal.done == ["alpha"]
+        assert journal.writing == {"beta": ["beta"]}
+
+        with (
+            patch(
+                "skill_quiver.sync.resolve_source_sha",
+                wraps=sync_module.resolve_source_sha,
+            ) as resolve,
+            patch(
+                "skill_quiver.sync.sync_source", wraps=sync_module.sync_source
+            ) as fetch,
+        ):
+            report = sync(manifest)
+
+        # beta's SHA came from the journal; only gamma was resolved
+        assert [c.args[1].name for c in resolve.call_args_list] == ["gamma"]
+        assert [c.args[1].name for c in fetch.call_args_list] == ["beta", "gamma"]
+        assert [s.status for s in report.sources] == ["up-to-date", "synced", "synced"]
+        assert not journal_path(manifest.root).exists()
+        for name in ("alpha", "beta", "gamma"):
+            assert read_provenance(manifest.root / "skills" / name) is not None
+
+    def test_half_written_skill_is_redone(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, "alpha")
+        sync(manifest)
+        skill = manifest.root / "skills" / "alpha"
+        extra = skill / "leftover.txt"
+        extra.write_text("from an interrupted write", encoding="utf-8")
+
+        # Provenance matches, but the journal says the skill was mid-write
+        journal = load_journal(manifest.root, manifest.sources)
+        journal.writing["alpha"] = ["alpha"]
+        save_journal(manifest.root, journal)
+
+        report = sync(manifest)
+        assert report.sources[0].status == "synced"
+        assert not extra.exists()
+
+    def test_changed_plan_starts_over(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, "alpha")
+        journal = load_journal(manifest.root, manifest.sources)
+        journal.done.append("alpha")
+        journal.shas["alpha"] = "0" * 40
+        save_journal(manifest.root, journal)
+
+        changed = [manifest.sources[0].model_copy(update={"license": "Apache-2.0"})]
+        assert load_journal(manifest.root, changed).done == []
+
+    def test_dry_run_leaves_no_journal(self, tmp_path: Path) -> None:
+        manifest = _manifest(tmp_path, "alpha")
+        sync(manifest, dry_run=True)
+        assert not journal_path(manifest.root).exists()
+
+    @pytest.mark.parametrize("dry_run", [False, True])
+    def test_writes_follow_dry_run_not_the_journal(
+        self, tmp_path: Path, dry_run: bool
+    ) -> None:
+        manifest = _manifest(tmp_path, "alpha")
+        with sync_module._make_client() as client:
+            entry = sync_module._sync_one(
+                client,
+                manifest.root,
+                manifest.sources[0],
+                SyncOptions(dry_run=dry_run),
+                None,
+                {},
+                blob_store(),
+            )
+        assert entry.status == ("pending" if dry_run else "synced")
+        written = (manifest.root / "skills" / "alpha" / "SKILL.md").exists()
+        assert written is not dry_run
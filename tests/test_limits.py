@@ -0,0 +1,190 @@
+"""Tests for deadlines, circuit breaking and --keep-going."""
+
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.cli import main
+from skill_quiver.errors import DeadlineError, SyncError, UnavailableError
+from skill_quiver.limits import CircuitBreaker, check_deadline, deadline, remaining
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.provenance import Provenance, read_provenance, write_provenance
+from skill_quiver.sync import sync
+from tests.conftest import make_tarball
+
+
+def _source(name: str, owner: str) -> Source:
+    return Source(
+        name=name, repo=f"https://github.com/{owner}/repo", path="skills", skills=[name]
+    )
+
+
+def _mock_ok(owner: str, skill: str) -> None:
+    api = f"https://api.github.com/repos/{owner}/repo"
+    respx.get(f"{api}/commits/main").mock(
+        return_value=httpx.Response(200, json={"sha": "new123"})
+    )
+    respx.get(f"{api}/tarball/new123").mock(
+        return_value=httpx.Response(
+            200, content=make_tarball({f"skills/{skill}/SKILL.md": "# new"})
+        )
+    )
+
+
+class TestDeadline:
+    def test_nested_keeps_earliest(self) -> None:
+        assert remaining() is None
+        with deadline(10):
+            with deadline(100):
+                left = remaining()
+                assert left is not None and left <= 10
+            with deadline(None):
+                assert remaining() is not None
+        assert remaining() is None
+
+    def test_expired(self) -> None:
+        with deadline(0.001):
+            time.sleep(0.01)
+            with pytest.raises(DeadlineError, match="resolve"):
+                check_deadline("resolve")
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_half_opens(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        now = [1000.0]
+        monkeypatch.setattr("skill_quiver.limits.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker(threshold=2, cooldown=30)
+
+        breaker.record("h", ok=False)
+        breaker.check("h")
+        breaker.record("h", ok=False)
+        with pytest.raises(UnavailableError, match="2 times"):
+            breaker.check("h")
+        breaker.check("other")
+
+        now[0] += 31
+        breaker.check("h")  # one trial after the cooldown
+        breaker.record("h", ok=False)
+        with pytest.raises(UnavailableError):
+            breaker.check("h")
+
+        now[0] += 31
+        breaker.check("h")
+        breaker.record("h", ok=True)
+        breaker.record("h", ok=False)
+        breaker.check("h")
+
+
+class TestKeepGoing:
+    @respx.mock
+    def test_failing_source_keeps_previous_skills(self, tmp_path: Path) -> None:
+        respx.get("https://api.github.com/repos/down/repo/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": "new123"})
+        )
+        respx.get("https://api.github.com/repos/down/repo/tarball/new123").mock(
+            return_value=httpx.Response(503)
+        )
+        _mock_ok("up", "beta")
+
+        old = tmp_path / "skills" / "alpha"
+        old.mkdir(parents=True)
+        (old / "SKILL.md").write_text("# old", encoding="utf-8")
+        write_provenance(
+            old,
+            Provenance(
+                repo="https://github.com/down/repo",
+                path="skills",
+                ref="main",
+                sha="old123",
+                fetched=datetime.now(timezone.utc),
+            ),
+        )
+        manifest = Manifest(
+            sources=[_source("alpha", "down"), _source("beta", "up")], root=tmp_path
+        )
+
+        report = sync(manifest, keep_going=True)
+
+        assert [s.status for s in report.sources] == ["failed", "synced"]
+        assert "HTTP 503" in (report.sources[0].error or "")
+        assert (old / "SKILL.md").read_text(encoding="utf-8") == "# old"
+        provenance = read_provenance(old)
+        assert provenance is not None and provenance.sha == "old123"
+        assert (tmp_path / "skills" / "beta" / "SKILL.md").is_file()
+        assert "1 of 2 sources failed" in report.failure_summary()
+
+    @respx.mock
+    def test_first_error_stops_without_keep_going(self, tmp_path: Path) -> None:
+        respx.get("https://api.github.com/repos/down/repo/commits/main").mock(
+            return_value=httpx.Response(404)
+        )
+        manifest = Manifest(
+            sources=[_source("alpha", "down"), _source("beta", "up")], root=tmp_path
+        )
+        with pytest.raises(SyncError, match="HTTP 404"):
+            sync(manifest)
+
+    @respx.mock
+    def test_breaker_stops_calling_dead_host(self, tmp_path: Path) -> None:
+        route = respx.get(url__regex=r"https://api\.github\.com/.*/commits/main").mock(
+            side_effect=httpx.ConnectError("connection refused")
+        )
+        names = ["one", "two", "three", "four", "five"]
+        manifest = Manifest(
+            sources=[_source(name, name) for name in names], root=tmp_path
+        )
+
+        report = sync(manifest, keep_going=True)
+
+        assert route.call_count == 3
+        assert all(s.status == "failed" for s in report.sources)
+        assert "Skipped: github.com" in (report.sources[3].error or "")
+
+    @respx.mock
+    def test_client_errors_do_not_open_the_circuit(self, tmp_path: Path) -> None:
+        route = respx.get(url__regex=r"https://api\.github\.com/.*/commits/main").mock(
+            return_value=httpx.Response(404)
+        )
+        names = ["one", "two", "three", "four"]
+        manifest = Manifest(
+            sources=[_source(name, name) for name in names], root=tmp_path
+        )
+        sync(manifest, keep_going=True)
+        assert route.call_count == 4
+
+    def test_run_deadline_fails_remaining_sources(self, tmp_path: Path) -> None:
+        manifest = Manifest(sources=[_source("alpha", "a")], root=tmp_path)
+        report = sync(manifest, keep_going=True, deadline=1e-9)
+        assert report.sources[0].status == "failed"
+        assert "Deadline exceeded" in (report.sources[0].error or "")
+
+    @respx.mock
+    def test_cli_exits_non_zero_with_summary(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        respx.get("https://api.github.com/repos/down/repo/commits/main").mock(
+            return_value=httpx.Response(500)
+        )
+        _mock_ok("up", "beta")
+        (tmp_path / "skills.kdl").write_text(
+            'source {\n    name "alpha"\n    repo "https://github.com/down/repo"\n'
+            '    path "skills"\n    skill "alpha"\n}\n'
+            'source {\n    name "beta"\n    repo "https://github.com/up/repo"\n'
+            '    path "skills"\n    skill "beta"\n}\n',
+            encoding="utf-8",
+        )
+
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--dir", str(tmp_path), "sync", "--keep-going"])
+
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert "alpha: failed" in captured.out
+        assert "1 of 2 sources failed" in captured.err
+        assert (tmp_path / "skills" / "beta" / "SKILL.md").is_file()
@@ -0,0 +1,180 @@
+"""Tests for local directory and file:// sources."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from skill_quiver.errors import ManifestError, SyncError
+from skill_quiver.local import is_settled, resolve_local_sha
+from skill_quiver.manifest import Manifest, Source, parse_manifest
+from skill_quiver.provenance import read_provenance
+from skill_quiver.sync import sync
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def _skill_tree(root: Path, *names: str) -> Path:
+    for name in names:
+        skill = root / "skills" / name
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text(f"# {name}", encoding="utf-8")
+    return root
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={
+            "GIT_AUTHOR_NAME": "t",
+            "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t",
+            "GIT_COMMITTER_EMAIL": "t@example.com",
+            "HOME": str(repo),
+        },
+    )
+    return result.stdout.strip()
+
+
+class TestLocalDirectory:
+    def test_relative_path_resolved_from_manifest(self, tmp_path: Path) -> None:
+        _skill_tree(tmp_path / "sibling", "pdf")
+        project = tmp_path / "project"
+        project.mkdir()
+        manifest_path = project / "skills.kdl"
+        manifest_path.write_text(
+            'source {\n    name "dev"\n    repo "../sibling"\n'
+            '    path "skills"\n    skill "pdf"\n}\n',
+            encoding="utf-8",
+        )
+
+        manifest = parse_manifest(manifest_path)
+        assert manifest.sources[0].repo == str((tmp_path / "sibling").resolve())
+
+        sync(manifest)
+        skill = project / "skills" / "pdf"
+        assert (skill / "SKILL.md").read_text(encoding="utf-8") == "# pdf"
+        provenance = read_provenance(skill)
+        assert provenance is not None
+        assert provenance.sha == resolve_local_sha(manifest.sources[0])
+
+    def test_unchanged_source_is_not_copied_again(self, tmp_path: Path) -> None:
+        upstream = _skill_tree(tmp_path / "upstream", "pdf", "xlsx")
+        source = Source(name="dev", repo=str(upstream), path="skills", skills=["*"])
+        manifest = Manifest(sources=[source], root=tmp_path)
+        sync(manifest)
+
+        with (
+            patch("skill_quiver.local.RACY_WINDOW_NS", -(10**18)),
+            patch("skill_quiver.sync.copy_checkout_skills") as copy,
+        ):
+            sync(manifest)
+        copy.assert_not_called()
+
+        (upstream / "skills" / "pdf" / "SKILL.md").write_text("# v2", encoding="utf-8")
+        sync(manifest)
+        assert (tmp_path / "skills" / "pdf" / "SKILL.md").read_text() == "# v2"
+        assert (tmp_path / "skills" / "xlsx" / "SKILL.md").is_file()
+
+    def test_executable_files_keep_their_mode(self, tmp_path: Path) -> None:
+        upstream = _skill_tree(tmp_path / "upstream", "pdf")
+        script = upstream / "skills" / "pdf" / "run.sh"
+        script.write_text("#!/bin/sh\n", encoding="utf-8")
+        script.chmod(0o755)
+        source = Source(name="dev", repo=str(upstream), path="skills", skills=["pdf"])
+        sync(Manifest(sources=[source], root=tmp_path))
+
+        vendored = tmp_path / "skills" / "pdf" / "run.sh"
+        assert os.access(vendored, os.X_OK)
+        assert os.access(vendored, os.W_OK)
+        assert not os.access(tmp_path / "skills" / "pdf" / "SKILL.md", os.X_OK)
+
+    def test_same_size_rewrite_keeping_mtime_is_synced(self, tmp_path: Path) -> None:
+        upstream = _skill_tree(tmp_path / "upstream", "pdf")
+        source = Source(name="dev", repo=str(upstream), path="skills", skills=["pdf"])
+        manifest = Manifest(sources=[source], root=tmp_path)
+        sync(manifest)
+
+        skill_md = upstream / "skills" / "pdf" / "SKILL.md"
+        st = skill_md.stat()
+        skill_md.write_text("# fdp", encoding="utf-8")
+        os.utime(skill_md, ns=(st.st_atime_ns, st.st_mtime_ns))
+        sync(manifest)
+        assert (tmp_path / "skills" / "pdf" / "SKILL.md").read_text() == "# fdp"
+
+    def test_fingerprint_is_stable_once_files_settle(self, tmp_path: Path) -> None:
+        upstream = _skill_tree(tmp_path / "upstream", "pdf")
+        source = Source(name="dev", repo=str(upstream), path="skills", skills=["pdf"])
+        recent = resolve_local_sha(source)
+        assert not is_settled(recent)
+
+        with patch("skill_quiver.local.RACY_WINDOW_NS", -(10**18)):
+            assert resolve_local_sha(source) == recent
+        assert is_settled(recent)
+
+    def test_missing_directory(self, tmp_path: Path) -> None:
+        source = Source(name="dev", repo=str(tmp_path / "nope"), skills=["pdf"])
+        with pytest.raises(SyncError, match="not found"):
+            sync(Manifest(sources=[source], root=tmp_path))
+
+    def test_bare_words_are_not_paths(self, tmp_path: Path) -> None:
+        manifest_path = tmp_path / "skills.kdl"
+        manifest_path.write_text(
+            'source {\n    name "dev"\n    repo "sibling"\n    skill "pdf"\n}\n',
+            encoding="utf-8",
+        )
+        with pytest.raises(ManifestError, match="local path starting with"):
+            parse_manifest(manifest_path)
+
+
+@requires_git
+class TestFileGitRepo:
+    def _repo(self, tmp_path: Path) -> Path:
+        repo = _skill_tree(tmp_path / "repo", "pdf")
+        _git(repo, "init", "-q", "-b", "main")
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-q", "-m", "init")
+        return repo
+
+    def test_sync_from_file_url(self, tmp_path: Path) -> None:
+        repo = self._repo(tmp_path)
+        source = Source(name="dev", repo=repo.as_uri(), path="skills", skills=["pdf"])
+        project = tmp_path / "project"
+        project.mkdir()
+        sync(Manifest(sources=[source], root=project))
+
+        provenance = read_provenance(project / "skills" / "pdf")
+        assert provenance is not None
+        assert provenance.sha == _git(repo, "rev-parse", "HEAD")
+
+    def test_resolves_packed_and_annotated_refs(self, tmp_path: Path) -> None:
+        repo = self._repo(tmp_path)
+        _git(repo, "tag", "-a", "v1", "-m", "v1")
+        _git(repo, "pack-refs", "--all")
+        head = _git(repo, "rev-parse", "HEAD")
+
+        for ref in ("main", "v1", "HEAD"):
+            source = Source(name="dev", repo=repo.as_uri(), ref=ref, skills=["pdf"])
+            with patch("skill_quiver.local.subprocess.run") as run:
+                assert resolve_local_sha(source) == head
+            run.assert_not_called()
+
+    def test_resolves_loose_annotated_tag_to_its_commit(self, tmp_path: Path) -> None:
+        repo = self._repo(tmp_path)
+        first = _git(repo, "rev-parse", "HEAD")
+        _git(repo, "tag", "-a", "v1", "-m", "v1")
+        # A branch of the same name loses to the tag, as in git
+        (repo / "skills" / "pdf" / "SKILL.md").write_text("# v2", encoding="utf-8")
+        _git(repo, "commit", "-q", "-am", "v2")
+        _git(repo, "branch", "v1")
+
+        source = Source(name="dev", repo=repo.as_uri(), ref="v1", skills=["pdf"])
+        with patch("skill_quiver.local.subprocess.run") as run:
+            assert resolve_local_sha(source) == first
+        run.assert_not_called()
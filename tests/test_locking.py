@@ -0,0 +1,144 @@
+"""Tests for cross-process locks on cache entries and projects."""
+
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.cache import BlobStore, CacheIndex, lock_path
+from skill_quiver.errors import DeadlineError
+from skill_quiver.limits import deadline
+from skill_quiver.locking import (
+    locked,
+    project_lock,
+    try_locked,
+    write_atomic,
+)
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.sync import _make_client, forge_archive, sync
+from skill_quiver.writer import SkillWriter
+from tests.conftest import make_tarball
+
+API = "https://api.github.com/repos/example/repo"
+
+SOURCE = Source(
+    name="s", repo="https://github.com/example/repo", path="skills", skills=["pdf"]
+)
+
+
+class TestLocks:
+    def test_try_locked_sees_holder(self, tmp_path: Path) -> None:
+        path = tmp_path / "entry.lock"
+        with locked(path, "the entry"):
+            with try_locked(path) as free:
+                assert not free
+        with try_locked(path) as free:
+            assert free
+
+    def test_shared_locks_coexist(self, tmp_path: Path) -> None:
+        path = tmp_path / "mirror"
+        path.mkdir()
+        with locked(path, "the mirror", shared=True):
+            with locked(path, "the mirror", shared=True):
+                with try_locked(path) as free:
+                    assert not free
+
+    def test_waiting_respects_deadline(self, tmp_path: Path) -> None:
+        path = tmp_path / "entry.lock"
+        with locked(path, "the entry"):
+            with deadline(0.05), pytest.raises(DeadlineError, match="the entry"):
+                with locked(path, "the entry"):
+                    pass
+
+    def test_write_atomic_leaves_no_temp_files(self, tmp_path: Path) -> None:
+        target = tmp_path / "index.json"
+        write_atomic(target, "old")
+        write_atomic(target, b"new")
+        assert target.read_text(encoding="utf-8") == "new"
+        assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+
+class TestCache:
+    def test_prune_skips_busy_entries(self, tmp_path: Path) -> None:
+        index = CacheIndex(tmp_path)
+        for key in ("archives/busy", "archives/idle"):
+            (tmp_path / key).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / key).write_bytes(b"x" * 10)
+            index.record(key, 10)
+
+        with locked(lock_path(tmp_path / "archives" / "busy", tmp_path), "busy"):
+            assert index.prune(max_size=0) == (1, 10)
+
+        assert (tmp_path / "archives" / "busy").exists()
+        assert not (tmp_path / "archives" / "idle").exists()
+
+    def test_blobs_are_not_evicted_during_an_extraction(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("QUIV_LINK_MODE", "hardlink")
+        index = CacheIndex(tmp_path)
+        store = BlobStore(tmp_path / "blobs", index)
+        materialize = store.materialize
+        pruned: list[tuple[int, int]] = []
+
+        def prune_first(digest: str, dest: Path, executable: bool = False) -> None:
+            # Another process's eviction, right after the blob was stored
+            index.flush()
+            pruned.append(index.prune(max_size=0))
+            materialize(digest, dest, executable)
+
+        monkeypatch.setattr(store, "materialize", prune_first)
+        with SkillWriter(store) as writer:
+            writer.write_bytes(tmp_path / "skills" / "pdf", "SKILL.md", b"# pdf")
+
+        dest = tmp_path / "skills" / "pdf" / "SKILL.md"
+        assert pruned == [(0, 0)]
+        assert dest.read_bytes() == b"# pdf"
+        # Once the writer is done, blobs are free to evict again
+        assert index.prune(max_size=0) == (1, 5)
+        assert dest.read_bytes() == b"# pdf"
+
+    @respx.mock
+    def test_concurrent_downloads_are_single_flight(self) -> None:
+        calls = 0
+
+        def slow_tarball(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            time.sleep(0.1)
+            return httpx.Response(
+                200, content=make_tarball({"skills/pdf/SKILL.md": "# pdf"})
+            )
+
+        respx.get(f"{API}/tarball/abc123").mock(side_effect=slow_tarball)
+        archives: list[Path] = []
+
+        def fetch() -> None:
+            with _make_client() as client:
+                archives.append(forge_archive(client, SOURCE, "abc123"))
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == 1
+        assert len(archives) == 4 and len(set(archives)) == 1
+
+
+class TestProjectLock:
+    def test_second_run_waits_for_the_first(self, tmp_path: Path) -> None:
+        manifest = Manifest(sources=[SOURCE], root=tmp_path)
+        with project_lock(tmp_path):
+            with pytest.raises(DeadlineError, match="another quiv run"):
+                sync(manifest, deadline=0.05)
+
+    def test_dry_run_does_not_wait(self, tmp_path: Path) -> None:
+        manifest = Manifest(sources=[], root=tmp_path)
+        with project_lock(tmp_path):
+            report = sync(manifest, dry_run=True, deadline=0.05)
+        assert report.sources == []
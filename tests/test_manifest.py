@@ -4,8 +4,14 @@ from pathlib import Path
 
 import pytest
 
+from skill_quiver import manifest as manifest_module
 from skill_quiver.errors import ManifestError
-from skill_quiver.manifest import Source, parse_manifest
+from skill_quiver.manifest import (
+    Source,
+    check_expanded_skills,
+    index_skills,
+    parse_manifest,
+)
 
 
 class TestParseManifest:
@@ -85,6 +91,41 @@ source {
         assert source.license is None
         assert source.attribution is None
 
+    def test_skill_globs_and_exclusions(self, tmp_path: Path) -> None:
+        kdl_content = """\
+source {
+    name "everything"
+    repo "https://github.com/example/repo"
+    skill "*"
+    exclude-skill "legacy-*"
+    exclude-skill "draft"
+}
+"""
+        manifest_path = tmp_path / "skills.kdl"
+        manifest_path.write_text(kdl_content, encoding="utf-8")
+        source = parse_manifest(manifest_path).sources[0]
+        assert source.skills == ["*"]
+        assert source.exclude_skills == ["legacy-*", "draft"]
+        assert source.is_wildcard
+
+    def test_literal_skills_are_not_wildcard(self, sample_manifest: Path) -> None:
+        source = parse_manifest(sample_manifest).sources[0]
+        assert not source.is_wildcard
+        assert source.exclude_skills == []
+
+    def test_invalid_skill_pattern(self, tmp_path: Path) -> None:
+        kdl_content = """\
+source {
+    name "bad-pattern"
+    repo "https://github.com/example/repo"
+    skill "Foo_*"
+}
+"""
+        manifest_path = tmp_path / "skills.kdl"
+        manifest_path.write_text(kdl_content, encoding="utf-8")
+        with pytest.raises(ManifestError, match="Invalid skill pattern"):
+            parse_manifest(manifest_path)
+
     def test_empty_manifest(self, tmp_path: Path) -> None:
         manifest_path = tmp_path / "skills.kdl"
         manifest_path.write_text("// empty manifest\n", encoding="utf-8")
@@ -92,6 +133,199 @@ source {
         assert manifest.sources == []
 
 
+class TestPreflight:
+    def _write(self, tmp_path: Path, content: str) -> Path:
+        manifest_path = tmp_path / "skills.kdl"
+        manifest_path.write_text(content, encoding="utf-8")
+        return manifest_path
+
+    def test_reports_every_invalid_source(self, tmp_path: Path) -> None:
+        path = self._write(
+            tmp_path,
+            """\
+source {
+    name "Bad One"
+    repo "https://github.com/example/repo"
+    skill "a"
+}
+source {
+    name "bad-two"
+    repo "not a url"
+    skill "b"
+}
+""",
+        )
+        with pytest.raises(ManifestError) as exc_info:
+            parse_manifest(path)
+        message = exc_info.value.message
+        assert "Invalid source 'Bad One'" in message
+        assert "Invalid source 'bad-two'" in message
+        assert "repo" in message
+
+    def test_duplicate_source_names(self, tmp_path: Path) -> None:
+        path = self._write(
+            tmp_path,
+            """\
+source {
+    name "same"
+    repo "https://github.com/example/one"
+    skill "a"
+}
+source {
+    name "same"
+    repo "https://github.com/example/two"
+    skill "b"
+}
+""",
+        )
+        with pytest.raises(ManifestError, match="Duplicate source name 'same'"):
+            parse_manifest(path)
+
+    def test_skill_name_collision(self, tmp_path: Path) -> None:
+        path = self._write(
+            tmp_path,
+            """\
+source {
+    name "first"
+    repo "https://github.com/example/one"
+    skill "pdf"
+}
+source {
+    name "second"
+    repo "https://github.com/example/two"
+    skill "pdf"
+    skill "xlsx"
+}
+""",
+        )
+        with pytest.raises(
+            ManifestError, match="'pdf' is declared by both 'first' and 'second'"
+        ):
+            parse_manifest(path)
+
+    def test_index_skips_globs(self) -> None:
+        sources = [
+            Source(name="a", repo="https://github.com/o/a", skills=["pdf", "x-*"]),
+            Source(name="b", repo="https://github.com/o/b", skills=["x-*", "xlsx"]),
+        ]
+        assert index_skills(sources) == {"pdf": 0, "xlsx": 1}
+
+    def test_expanded_collision(self) -> None:
+        sources = [
+            Source(name="a", repo="https://github.com/o/a", skills=["pdf"]),
+            Source(name="b", repo="https://github.com/o/b", skills=["pdf", "xlsx"]),
+            Source(name="c", repo="https://github.com/o/c", skills=["docx"]),
+        ]
+        with pytest.raises(
+            ManifestError, match="'pdf' is provided by both 'a' and 'b'"
+        ):
+            check_expanded_skills(sources)
+        check_expanded_skills(sources[1:])
+
+
+def _source(name: str, skill: str) -> str:
+    return f"""\
+source {{
+    name "{name}"
+    repo "https://github.com/example/{name}"
+    skill "{skill}"
+}}
+"""
+
+
+class TestIncludes:
+    @pytest.fixture
+    def parsed(self, monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+        """Record every file actually parsed, bypassing the in-process memo."""
+        calls: list[Path] = []
+        real = manifest_module._parse_kdl
+
+        def counting(content: str, path: Path) -> object:
+            calls.append(path)
+            return real(content, path)
+
+        monkeypatch.setattr(manifest_module, "_fragments", {})
+        monkeypatch.setattr(manifest_module, "_parse_kdl", counting)
+        return calls
+
+    def _tree(self, tmp_path: Path) -> Path:
+        teams = tmp_path / "teams"
+        teams.mkdir()
+        (teams / "b.kdl").write_text(_source("beta", "xlsx"), encoding="utf-8")
+        (teams / "a.kdl").write_text(_source("alpha", "pdf"), encoding="utf-8")
+        path = tmp_path / "skills.kdl"
+        path.write_text(
+            _source("root", "docx") + 'include "teams/*.kdl"\n', encoding="utf-8"
+        )
+        return path
+
+    def test_merges_fragments_in_order(self, tmp_path: Path) -> None:
+        path = self._tree(tmp_path)
+        manifest = parse_manifest(path)
+        assert [s.name for s in manifest.sources] == ["root", "alpha", "beta"]
+        assert manifest.fragments == [
+            tmp_path / "teams" / "a.kdl",
+            tmp_path / "teams" / "b.kdl",
+        ]
+
+    def test_only_edited_fragment_is_reparsed(
+        self, tmp_path: Path, parsed: list[Path]
+    ) -> None:
+        path = self._tree(tmp_path)
+        parse_manifest(path)
+        parsed.clear()
+
+        edited = tmp_path / "teams" / "b.kdl"
+        edited.write_text(_source("beta", "pptx"), encoding="utf-8")
+        manifest = parse_manifest(path)
+
+        assert parsed == [edited]
+        assert manifest.sources[2].skills == ["pptx"]
+
+    def test_parsed_fragments_persist_in_cache(
+        self, tmp_path: Path, parsed: list[Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = self._tree(tmp_path)
+        parse_manifest(path)
+        parsed.clear()
+        monkeypatch.setattr(manifest_module, "_fragments", {})
+
+        assert len(parse_manifest(path).sources) == 3
+        assert parsed == []
+
+    def test_collision_across_fragments(self, tmp_path: Path) -> None:
+        path = self._tree(tmp_path)
+        (tmp_path / "teams" / "c.kdl").write_text(
+            _source("gamma", "pdf"), encoding="utf-8"
+        )
+        with pytest.raises(
+            ManifestError, match="'pdf' is declared by both 'alpha' and 'gamma'"
+        ):
+            parse_manifest(path)
+
+    def test_invalid_fragment_names_its_file(self, tmp_path: Path) -> None:
+        path = self._tree(tmp_path)
+        (tmp_path / "teams" / "c.kdl").write_text(
+            _source("Bad", "pdf"), encoding="utf-8"
+        )
+        with pytest.raises(ManifestError, match="c.kdl"):
+            parse_manifest(path)
+
+    def test_nested_include_rejected(self, tmp_path: Path) -> None:
+        path = self._tree(tmp_path)
+        (tmp_path / "teams" / "c.kdl").write_text(
+            'include "other.kdl"\n', encoding="utf-8"
+        )
+        with pytest.raises(ManifestError, match="only the top-level manifest"):
+            parse_manifest(path)
+
+    def test_missing_literal_include(self, tmp_path: Path) -> None:
+        path = tmp_path / "skills.kdl"
+        path.write_text('include "teams/ops.kdl"\n', encoding="utf-8")
+        with pytest.raises(ManifestError, match="'teams/ops.kdl' not found"):
+            parse_manifest(path)
+
+
 class TestSourceModel:
     def test_valid_source(self) -> None:
         source = Source(
@@ -0,0 +1,99 @@
+"""Tests for quiv fetch cache warming."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.archive import verify_archive
+from skill_quiver.cache import archive_path
+from skill_quiver.errors import SyncError
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.prefetch import prefetch
+from skill_quiver.schedule import load_history
+from skill_quiver.sync import sync
+from tests.conftest import make_tarball
+
+COMMITS_URL = "https://api.github.com/repos/example/repo/commits/main"
+TARBALL_URL = "https://api.github.com/repos/example/repo/tarball/abc123"
+REPO = "https://github.com/example/repo"
+
+
+def _manifest(root: Path) -> Manifest:
+    source = Source(
+        name="test-source",
+        repo=REPO,
+        path="skills",
+        license="MIT",
+        skills=["my-skill"],
+    )
+    return Manifest(sources=[source], root=root)
+
+
+def _mock_upstream() -> respx.Route:
+    respx.get(COMMITS_URL).mock(
+        return_value=httpx.Response(200, json={"sha": "abc123"})
+    )
+    tarball = make_tarball({"skills/my-skill/SKILL.md": "# Content"})
+    return respx.get(TARBALL_URL).mock(
+        return_value=httpx.Response(200, content=tarball)
+    )
+
+
+class TestPrefetch:
+    @respx.mock
+    def test_warms_cache_only(self, tmp_path: Path) -> None:
+        _mock_upstream()
+        prefetch(_manifest(tmp_path))
+
+        assert verify_archive(archive_path(REPO, "abc123"))
+        assert not (tmp_path / "skills").exists()
+
+    @respx.mock
+    def test_later_sync_downloads_nothing(self, tmp_path: Path) -> None:
+        tarball_route = _mock_upstream()
+        manifest = _manifest(tmp_path)
+        prefetch(manifest)
+        sync(manifest)
+
+        assert tarball_route.call_count == 1
+        assert (tmp_path / "skills" / "my-skill" / "SKILL.md").is_file()
+
+    @respx.mock
+    def test_replaces_corrupt_archive(self, tmp_path: Path) -> None:
+        tarball_route = _mock_upstream()
+        prefetch(_manifest(tmp_path))
+        archive = archive_path(REPO, "abc123")
+        with open(archive, "r+b") as f:
+            f.seek(600)
+            f.write(b"corrupt")
+
+        prefetch(_manifest(tmp_path))
+
+        assert tarball_route.call_count == 2
+        assert verify_archive(archive)
+
+    @respx.mock
+    def test_records_history_and_critical_path(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        _mock_upstream()
+        prefetch(_manifest(tmp_path), byte_budget=1024)
+
+        record = load_history().repos[REPO]
+        assert record.bytes > 0
+        assert record.seconds >= 0
+        out = capsys.readouterr().out
+        assert f"Fetched {REPO} at abc123" in out
+        assert "Critical path: " in out
+        assert f"fetching {REPO} at abc123" in out
+
+    @respx.mock
+    def test_reports_every_failure(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        respx.get(COMMITS_URL).mock(return_value=httpx.Response(404))
+        with pytest.raises(SyncError, match="1 source"):
+            prefetch(_manifest(tmp_path))
+        assert "test-source" in capsys.readouterr().err
@@ -0,0 +1,128 @@
+"""Tests for size-aware fetch scheduling."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from skill_quiver.errors import SyncError
+from skill_quiver.schedule import (
+    FetchRecord,
+    Job,
+    Scheduler,
+    critical_path,
+    load_history,
+    record_fetch,
+)
+
+
+def _job(label: str, order: list[str], expected: FetchRecord | None) -> Job:
+    return Job(label, lambda: order.append(label), expected)
+
+
+class TestHistory:
+    def test_records_last_fetch_per_repo(self) -> None:
+        record_fetch("https://github.com/a/b", 100, 1.0)
+        record_fetch("https://github.com/a/b", 300, 2.5)
+        record_fetch("https://github.com/c/d", 10, 0.1)
+
+        repos = load_history().repos
+        assert repos["https://github.com/a/b"] == FetchRecord(bytes=300, seconds=2.5)
+        assert repos["https://github.com/c/d"].bytes == 10
+
+    def test_missing_history_is_empty(self) -> None:
+        assert load_history().repos == {}
+
+
+class TestScheduler:
+    def test_longest_first_unknown_before_known(self) -> None:
+        order: list[str] = []
+        jobs = [
+            _job("small", order, FetchRecord(bytes=1, seconds=1.0)),
+            _job("huge", order, FetchRecord(bytes=400, seconds=60.0)),
+            _job("new", order, None),
+            _job("medium", order, FetchRecord(bytes=50, seconds=10.0)),
+        ]
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            results = Scheduler(jobs).run(pool, 1)
+
+        assert order == ["new", "huge", "medium", "small"]
+        assert [result.job.label for result in results] == order
+
+    def test_byte_budget_limits_bytes_in_flight(self) -> None:
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def download(size: int) -> None:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += size
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= size
+
+        jobs = [
+            Job(
+                f"job-{i}",
+                lambda size=size: download(size),
+                FetchRecord(bytes=size, seconds=size),
+            )
+            for i, size in enumerate([300, 300, 300, 50, 50])
+        ]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = Scheduler(jobs, budget=400).run(pool, 4)
+
+        assert len(results) == 5
+        assert peak <= 400
+
+    def test_job_larger_than_budget_still_runs(self) -> None:
+        order: list[str] = []
+        jobs = [_job("huge", order, FetchRecord(bytes=1000, seconds=5.0))]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            Scheduler(jobs, budget=10).run(pool, 2)
+        assert order == ["huge"]
+
+    def test_failures_are_kept_per_job(self) -> None:
+        def fail() -> None:
+            raise SyncError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = Scheduler([Job("bad", fail, None)]).run(pool, 2)
+        assert results[0].error is not None
+        assert results[0].error.message == "boom"
+
+    def test_unexpected_errors_fail_only_their_job(self) -> None:
+        order: list[str] = []
+
+        def full_disk() -> None:
+            raise OSError(28, "No space left on device")
+
+        jobs = [Job("bad", full_disk, None), _job("good", order, None)]
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            results = Scheduler(jobs).run(pool, 1)
+        errors = {result.job.label: result.error for result in results}
+        assert order == ["good"]
+        assert errors["good"] is None
+        assert errors["bad"] is not None
+        assert "No space left" in errors["bad"].message
+        assert critical_path(results).startswith("Critical path:")
+
+
+class TestCriticalPath:
+    def test_names_the_last_job_to_finish(self) -> None:
+        order: list[str] = []
+        jobs = [
+            _job("repo-a", order, FetchRecord(bytes=2048, seconds=3.0)),
+            _job("repo-b", order, None),
+        ]
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            results = Scheduler(jobs).run(pool, 1)
+
+        line = critical_path(results, before=1.5)
+        assert line.startswith("Critical path: ")
+        assert "1.5s resolving" in line
+        assert "fetching repo-a, 2.0 KiB last time" in line
+
+    def test_no_jobs(self) -> None:
+        assert critical_path([], before=0.5) == "Critical path: 0.5s resolving"
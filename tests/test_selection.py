@@ -0,0 +1,157 @@
+"""Tests for sync selection."""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.errors import QuivError
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.provenance import Provenance, write_provenance
+from skill_quiver.selection import select_sources
+from skill_quiver.sync import sync
+from tests.conftest import make_tarball
+
+
+def _make_source(name: str, *skills: str, ref: str = "main") -> Source:
+    return Source.model_validate(
+        {
+            "name": name,
+            "repo": f"https://github.com/example/{name}",
+            "path": "skills",
+            "ref": ref,
+            "skills": list(skills),
+        }
+    )
+
+
+def _write_prov(root: Path, source: Source, skill: str) -> None:
+    skill_dir = root / "skills" / skill
+    skill_dir.mkdir(parents=True)
+    write_provenance(
+        skill_dir,
+        Provenance(
+            repo=str(source.repo),
+            path=source.path,
+            ref=source.ref,
+            sha="abc123",
+            fetched=datetime.now(timezone.utc),
+        ),
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path: Path) -> Manifest:
+    return Manifest(
+        sources=[
+            _make_source("alpha", "pdf-reader", "pdf-writer", "csv-tool"),
+            _make_source("beta", "pdf-viewer"),
+        ],
+        root=tmp_path,
+    )
+
+
+class TestSelectSources:
+    def test_no_selectors_keeps_everything(self, manifest: Manifest) -> None:
+        assert select_sources(manifest) == manifest.sources
+
+    def test_by_source_name(self, manifest: Manifest) -> None:
+        selected = select_sources(manifest, source_names=["beta"])
+        assert [s.name for s in selected] == ["beta"]
+
+    def test_unknown_source(self, manifest: Manifest) -> None:
+        with pytest.raises(QuivError, match="Unknown source"):
+            select_sources(manifest, source_names=["gamma"])
+
+    def test_skill_globs_narrow_each_source(self, manifest: Manifest) -> None:
+        selected = select_sources(manifest, skill_patterns=["pdf-*"])
+        assert [(s.name, s.skills) for s in selected] == [
+            ("alpha", ["pdf-reader", "pdf-writer"]),
+            ("beta", ["pdf-viewer"]),
+        ]
+        # The manifest itself is untouched
+        assert len(manifest.sources[0].skills) == 3
+
+    def test_source_and_skill_combined(self, manifest: Manifest) -> None:
+        selected = select_sources(
+            manifest, source_names=["alpha"], skill_patterns=["csv-*"]
+        )
+        assert [(s.name, s.skills) for s in selected] == [("alpha", ["csv-tool"])]
+
+    def test_wildcard_source_narrowed_after_expansion(self, tmp_path: Path) -> None:
+        manifest = Manifest(sources=[_make_source("gamma", "*")], root=tmp_path)
+        selected = select_sources(manifest, skill_patterns=["pdf-*"])
+        assert selected[0].skills == ["*"]
+        assert selected[0].only_skills == ["pdf-*"]
+
+    def test_no_match(self, manifest: Manifest) -> None:
+        with pytest.raises(QuivError, match="No sources or skills match"):
+            select_sources(manifest, skill_patterns=["nothing-*"])
+
+    def test_changed_only(self, manifest: Manifest, tmp_path: Path) -> None:
+        alpha, beta = manifest.sources
+        for skill in alpha.skills:
+            _write_prov(tmp_path, alpha, skill)
+        # beta's provenance was recorded against a different ref
+        _write_prov(
+            tmp_path, _make_source("beta", "pdf-viewer", ref="v1"), "pdf-viewer"
+        )
+
+        selected = select_sources(manifest, changed_only=True)
+        assert [(s.name, s.skills) for s in selected] == [("beta", ["pdf-viewer"])]
+
+    def test_changed_only_nothing_changed(
+        self, manifest: Manifest, tmp_path: Path
+    ) -> None:
+        for source in manifest.sources:
+            for skill in source.skills:
+                _write_prov(tmp_path, source, skill)
+        assert select_sources(manifest, changed_only=True) == []
+
+    def test_changed_only_ignores_trailing_slash_in_provenance(
+        self, manifest: Manifest, tmp_path: Path
+    ) -> None:
+        for source in manifest.sources:
+            legacy = source.model_copy(update={"repo": f"{source.repo}/"})
+            for skill in source.skills:
+                _write_prov(tmp_path, legacy, skill)
+        assert select_sources(manifest, changed_only=True) == []
+
+    def test_changed_only_picks_up_filter_edits(
+        self, manifest: Manifest, tmp_path: Path
+    ) -> None:
+        for source in manifest.sources:
+            for skill in source.skills:
+                _write_prov(tmp_path, source, skill)
+        alpha, beta = manifest.sources
+        filtered = beta.model_copy(update={"exclude": ["*.png"]})
+        edited = manifest.model_copy(update={"sources": [alpha, filtered]})
+
+        selected = select_sources(edited, changed_only=True)
+        assert [(s.name, s.skills) for s in selected] == [("beta", ["pdf-viewer"])]
+
+
+class TestSyncSelected:
+    @respx.mock
+    def test_only_selected_sources_resolved(
+        self, manifest: Manifest, tmp_path: Path
+    ) -> None:
+        respx.get("https://api.github.com/repos/example/beta/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": "sha-b"})
+        )
+        respx.get("https://api.github.com/repos/example/beta/tarball/sha-b").mock(
+            return_value=httpx.Response(
+                200, content=make_tarball({"skills/pdf-viewer/SKILL.md": "# v"})
+            )
+        )
+
+        sync(manifest, sources=select_sources(manifest, source_names=["beta"]))
+
+        assert len(respx.calls) == 2
+        assert (tmp_path / "skills" / "pdf-viewer" / "SKILL.md").is_file()
+        # License file still covers the whole manifest
+        license_text = (tmp_path / "THIRD_PARTY_LICENSES").read_text(encoding="utf-8")
+        assert "## alpha" in license_text
+        assert "## beta" in license_text
@@ -0,0 +1,149 @@
+"""Tests for sharded sync and fragment merging."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.errors import ManifestError, QuivError, SyncError
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.provenance import read_provenance
+from skill_quiver.shard import (
+    FRAGMENT_FILENAME,
+    Fragment,
+    merge_fragments,
+    parse_shard,
+    partition_sources,
+    read_fragment,
+    select_shard,
+    sync_shard,
+)
+from tests.conftest import make_tarball
+
+
+def _make_source(name: str, *skills: str) -> Source:
+    return Source.model_validate(
+        {
+            "name": name,
+            "repo": f"https://github.com/example/{name}",
+            "path": "skills",
+            "skills": list(skills) or [name],
+        }
+    )
+
+
+def _mock_source(name: str, sha: str, *skills: str) -> None:
+    respx.get(f"https://api.github.com/repos/example/{name}/commits/main").mock(
+        return_value=httpx.Response(200, json={"sha": sha})
+    )
+    files = {f"skills/{skill}/SKILL.md": f"# {skill}" for skill in skills or [name]}
+    respx.get(f"https://api.github.com/repos/example/{name}/tarball/{sha}").mock(
+        return_value=httpx.Response(200, content=make_tarball(files))
+    )
+
+
+class TestParseShard:
+    def test_valid(self) -> None:
+        assert parse_shard("2/4") == (2, 4)
+
+    @pytest.mark.parametrize("spec", ["0/4", "5/4", "1", "a/b", "1/0"])
+    def test_invalid(self, spec: str) -> None:
+        with pytest.raises(QuivError, match="Invalid shard"):
+            parse_shard(spec)
+
+
+class TestPartition:
+    def test_every_source_assigned_once(self) -> None:
+        sources = [_make_source(f"src-{i}") for i in range(10)]
+        shards = partition_sources(sources, 3, {})
+        names = sorted(s.name for shard in shards for s in shard)
+        assert names == sorted(s.name for s in sources)
+
+    def test_deterministic(self) -> None:
+        sources = [_make_source(f"src-{i}") for i in range(10)]
+        weights = {f"src-{i}": i * 100 for i in range(10)}
+        first = partition_sources(sources, 3, weights)
+        second = partition_sources(list(reversed(sources)), 3, weights)
+        assert [[s.name for s in shard] for shard in first] == [
+            [s.name for s in shard] for shard in second
+        ]
+
+    def test_balances_by_weight(self) -> None:
+        sources = [_make_source(n) for n in ("huge", "small-a", "small-b", "small-c")]
+        weights = {"huge": 1000, "small-a": 300, "small-b": 300, "small-c": 300}
+        shards = partition_sources(sources, 2, weights)
+        assert [s.name for s in shards[0]] == ["huge"]
+        assert len(shards[1]) == 3
+
+    def test_select_shard_uses_skills_on_disk(self, tmp_path: Path) -> None:
+        for name, size in (("big", 10_000), ("a", 100), ("b", 100)):
+            skill_dir = tmp_path / "skills" / name
+            skill_dir.mkdir(parents=True)
+            (skill_dir / "data.bin").write_bytes(b"x" * size)
+        manifest = Manifest(
+            sources=[_make_source("big"), _make_source("a"), _make_source("b")],
+            root=tmp_path,
+        )
+        assert [s.name for s in select_shard(manifest, 1, 2)] == ["big"]
+
+
+class TestShardAndMerge:
+    @respx.mock
+    def test_round_trip(self, tmp_path: Path) -> None:
+        project = tmp_path / "project"
+        project.mkdir()
+        manifest = Manifest(
+            sources=[_make_source("alpha"), _make_source("beta")], root=project
+        )
+        _mock_source("alpha", "sha-a")
+        _mock_source("beta", "sha-b")
+
+        fragments = [tmp_path / "frag-1", tmp_path / "frag-2"]
+        for i, out in enumerate(fragments, start=1):
+            sync_shard(manifest, i, 2, out)
+
+        # Workers never write to the project itself
+        assert not (project / "skills").exists()
+        synced = sorted(s for f in fragments for s in read_fragment(f).skills)
+        assert synced == ["alpha", "beta"]
+
+        merge_fragments(manifest, fragments)
+
+        for name, sha in (("alpha", "sha-a"), ("beta", "sha-b")):
+            prov = read_provenance(project / "skills" / name)
+            assert prov is not None
+            assert prov.sha == sha
+        license_text = (project / "THIRD_PARTY_LICENSES").read_text(encoding="utf-8")
+        assert "alpha" in license_text
+        assert "beta" in license_text
+
+    @respx.mock
+    def test_merge_requires_every_shard(self, tmp_path: Path) -> None:
+        manifest = Manifest(
+            sources=[_make_source("alpha"), _make_source("beta")], root=tmp_path
+        )
+        _mock_source("alpha", "sha-a")
+        _mock_source("beta", "sha-b")
+        sync_shard(manifest, 1, 2, tmp_path / "frag-1")
+
+        with pytest.raises(SyncError, match="Expected shards 1..2"):
+            merge_fragments(manifest, [tmp_path / "frag-1"])
+
+    def test_merge_rejects_skill_written_by_two_shards(self, tmp_path: Path) -> None:
+        manifest = Manifest(sources=[], root=tmp_path / "project")
+        fragments = []
+        for shard in (1, 2):
+            out = tmp_path / f"frag-{shard}"
+            (out / "skills" / "pdf").mkdir(parents=True)
+            fragment = Fragment(shard=shard, total=2, sources=[], skills=["pdf"])
+            (out / FRAGMENT_FILENAME).write_text(fragment.model_dump_json())
+            fragments.append(out)
+
+        with pytest.raises(ManifestError, match="'pdf' was written by shards 1 and 2"):
+            merge_fragments(manifest, fragments)
+        assert not (tmp_path / "project" / "skills").exists()
+
+    def test_missing_fragment_file(self, tmp_path: Path) -> None:
+        with pytest.raises(SyncError, match="Cannot read fragment"):
+            read_fragment(tmp_path)
@@ -0,0 +1,127 @@
+"""Tests for offline quiv status and quiv verify."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from skill_quiver.catalog import stamps_path
+from skill_quiver.cli import main
+from skill_quiver.errors import QuivError
+from skill_quiver.manifest import Manifest, Source
+from skill_quiver.status import check_skills
+from skill_quiver.sync import sync
+
+
+def _synced(tmp_path: Path) -> Manifest:
+    upstream = tmp_path / "upstream"
+    for name in ("pdf", "xlsx"):
+        (upstream / name / "scripts").mkdir(parents=True)
+        (upstream / name / "SKILL.md").write_text(f"# {name}\n", encoding="utf-8")
+        (upstream / name / "scripts" / "run.py").write_text(
+            "print('hi')\n", encoding="utf-8"
+        )
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "skills.kdl").write_text(
+        f'source {{\n    name "local"\n    repo "{upstream}"\n'
+        '    skill "pdf"\n    skill "xlsx"\n}\n',
+        encoding="utf-8",
+    )
+    source = Source(name="local", repo=str(upstream), skills=["pdf", "xlsx"])
+    manifest = Manifest(sources=[source], root=root)
+    sync(manifest)
+    return manifest
+
+
+def _rewrite(path: Path, text: str, keep_mtime: bool = False) -> None:
+    """Replace a skill file with new contents."""
+    st = path.stat()
+    path.unlink()
+    path.write_text(text, encoding="utf-8")
+    if keep_mtime:
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+class TestStatus:
+    def test_clean_after_sync_reads_nothing(self, tmp_path: Path) -> None:
+        manifest = _synced(tmp_path)
+        report = check_skills(manifest)
+        assert report.ok
+        assert report.checked == 2
+        assert report.hashed == 0
+
+    def test_modified_file(self, tmp_path: Path) -> None:
+        manifest = _synced(tmp_path)
+        _rewrite(manifest.root / "skills" / "pdf" / "SKILL.md", "# changed\n")
+
+        report = check_skills(manifest)
+        assert [p.render() for p in report.problems] == [
+            "modified: pdf (contents changed)"
+        ]
+        # Only the touched file was read
+        assert report.hashed == 1
+
+    def test_added_and_removed_files(self, tmp_path: Path) -> None:
+        manifest = _synced(tmp_path)
+        skills = manifest.root / "skills"
+        (skills / "pdf" / "notes.txt").write_text("x", encoding="utf-8")
+        (skills / "xlsx" / "scripts" / "run.py").unlink()
+
+        details = {p.name: p.detail for p in check_skills(manifest).problems}
+        assert details == {"pdf": "1 added file", "xlsx": "1 removed file"}
+
+    def test_missing_and_orphaned(self, tmp_path: Path) -> None:
+        manifest = _synced(tmp_path)
+        skills = manifest.root / "skills"
+        shutil.rmtree(skills / "xlsx")
+        (skills / "stray").mkdir()
+        (skills / "stray" / "SKILL.md").write_text("# stray", encoding="utf-8")
+
+        states = {p.name: p.state for p in check_skills(manifest).problems}
+        assert states == {"stray": "orphaned", "xlsx": "missing"}
+
+    def test_without_stamps_hashes_once(self, tmp_path: Path) -> None:
+        manifest = _synced(tmp_path)
+        stamps_path(manifest.root / "skills").unlink()
+
+        assert check_skills(manifest).hashed == 4
+        assert check_skills(manifest).hashed == 0
+
+    def test_missing_catalog(self, tmp_path: Path) -> None:
+        manifest = _synced(tmp_path)
+        (manifest.root / "skills" / "index.json").unlink()
+        with pytest.raises(QuivError, match="quiv sync"):
+            check_skills(manifest)
+
+
+class TestVerify:
+    def test_catches_edit_that_kept_size_and_mtime(self, tmp_path: Path) -> None:
+        manifest = _synced(tmp_path)
+        _rewrite(
+            manifest.root / "skills" / "pdf" / "SKILL.md", "# PDF\n", keep_mtime=True
+        )
+
+        # status trusts the unchanged stamp; verify re-reads everything
+        assert check_skills(manifest).ok
+        report = check_skills(manifest, full=True, jobs=2)
+        assert report.hashed == 4
+        assert [p.name for p in report.problems] == ["pdf"]
+
+
+class TestCli:
+    def test_status_and_verify(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        manifest = _synced(tmp_path)
+        main(["--dir", str(manifest.root), "status"])
+        assert "2 skills match skills/index.json" in capsys.readouterr().out
+
+        _rewrite(manifest.root / "skills" / "xlsx" / "SKILL.md", "# edited\n")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--dir", str(manifest.root), "verify", "--jobs", "2"])
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert "modified: xlsx (contents changed)" in captured.out
+        assert "1 of 2 skills differ" in captured.err
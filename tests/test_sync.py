@@ -1,6 +1,9 @@
 """Tests for the sync engine."""
 
+import asyncio
 import io
+import os
+import shutil
 import tarfile
 from datetime import datetime, timezone
 from pathlib import Path
@@ -10,16 +13,24 @@ import httpx
 import pytest
 import respx
 
-from skill_quiver.errors import SyncError
+from skill_quiver.archive import store_gzip_tarball
+from skill_quiver.cache import BlobStore
+from skill_quiver.errors import ManifestError, SyncError
 from skill_quiver.manifest import Manifest, Source
 from skill_quiver.provenance import Provenance, write_provenance
+from skill_quiver.report import SyncOptions, SyncReport
 from skill_quiver.sync import (
-    _is_github,
+    _is_forge,
     _make_client,
     _parse_github_repo,
+    expand_source,
+    extract_tarball,
+    find_stale_skills,
     generate_license_file,
     resolve_sha,
     sync,
+    sync_async,
+    sync_report,
 )
 
 
@@ -36,7 +47,11 @@ def _make_source(**kwargs: object) -> Source:
     return Source.model_validate(defaults)
 
 
-def _make_tarball(files: dict[str, str], top_dir: str = "example-repo-abc123") -> bytes:
+def _make_tarball(
+    files: dict[str, str],
+    top_dir: str = "example-repo-abc123",
+    executable: frozenset[str] = frozenset(),
+) -> bytes:
     """Create a tarball in-memory with the given files."""
     buf = io.BytesIO()
     with tarfile.open(fileobj=buf, mode="w:gz") as tar:
@@ -45,19 +60,24 @@ def _make_tarball(files: dict[str, str], top_dir: str = "example-repo-abc123") -
             info = tarfile.TarInfo(name=full_path)
             data = content.encode("utf-8")
             info.size = len(data)
+            info.mode = 0o755 if path in executable else 0o644
             tar.addfile(info, io.BytesIO(data))
     buf.seek(0)
     return buf.read()
 
 
-class TestIsGithub:
+class TestIsForge:
     def test_github_url(self) -> None:
         source = _make_source(repo="https://github.com/example/repo")
-        assert _is_github(source) is True
+        assert _is_forge(source) is True
 
-    def test_non_github_url(self) -> None:
+    def test_gitlab_url(self) -> None:
         source = _make_source(repo="https://gitlab.com/example/repo")
-        assert _is_github(source) is False
+        assert _is_forge(source) is True
+
+    def test_plain_git_url(self) -> None:
+        source = _make_source(repo="https://git.example.org/example/repo")
+        assert _is_forge(source) is False
 
 
 class TestParseGithubRepo:
@@ -130,6 +150,58 @@ class TestSync:
         assert (skill_dir / "SKILL.md").is_file()
         assert (skill_dir / ".source.kdl").is_file()
 
+    @respx.mock
+    def test_identical_files_stored_once(
+        self, tmp_path: Path, isolated_cache: Path
+    ) -> None:
+        """Identical files across skills share one blob in the cache."""
+        source = _make_source(path="skills", skills=["skill-a", "skill-b"])
+        manifest = Manifest(sources=[source], root=tmp_path)
+        sha = "abc123"
+
+        respx.get("https://api.github.com/repos/example/repo/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": sha})
+        )
+        tarball = _make_tarball(
+            {
+                "skills/skill-a/LICENSE": "shared license",
+                "skills/skill-b/LICENSE": "shared license",
+            }
+        )
+        respx.get(f"https://api.github.com/repos/example/repo/tarball/{sha}").mock(
+            return_value=httpx.Response(200, content=tarball)
+        )
+
+        sync(manifest)
+
+        for skill in ("skill-a", "skill-b"):
+            license_file = tmp_path / "skills" / skill / "LICENSE"
+            assert license_file.read_text(encoding="utf-8") == "shared license"
+        blobs = [p for p in (isolated_cache / "blobs").rglob("*") if p.is_file()]
+        assert len(blobs) == 1
+
+    @respx.mock
+    def test_archive_reused_from_cache(self, tmp_path: Path) -> None:
+        """A commit's tarball is downloaded once, even if skills/ is wiped."""
+        source = _make_source(path="skills")
+        manifest = Manifest(sources=[source], root=tmp_path)
+        sha = "abc123"
+
+        respx.get("https://api.github.com/repos/example/repo/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": sha})
+        )
+        tarball = _make_tarball({"skills/my-skill/SKILL.md": "# Content"})
+        route = respx.get(
+            f"https://api.github.com/repos/example/repo/tarball/{sha}"
+        ).mock(return_value=httpx.Response(200, content=tarball))
+
+        sync(manifest)
+        shutil.rmtree(tmp_path / "skills")
+        sync(manifest)
+
+        assert route.call_count == 1
+        assert (tmp_path / "skills" / "my-skill" / "SKILL.md").is_file()
+
     @respx.mock
     def test_skip_if_up_to_date(self, tmp_path: Path) -> None:
         source = _make_source(path="skills")
@@ -159,6 +231,25 @@ class TestSync:
         # Verify no tarball request was made
         assert len(respx.calls) == 1  # Only the SHA resolve call
 
+    def test_skill_from_another_repo_is_stale(self, tmp_path: Path) -> None:
+        skill_dir = tmp_path / "skills" / "my-skill"
+        skill_dir.mkdir(parents=True)
+        prov = Provenance(
+            repo="https://github.com/example/repo/",
+            path="skills",
+            ref="main",
+            sha="abc123",
+            fetched=datetime.now(timezone.utc),
+        )
+        write_provenance(skill_dir, prov)
+        skills_dir = tmp_path / "skills"
+
+        assert find_stale_skills(_make_source(), "abc123", skills_dir) == []
+        moved = _make_source(repo="https://github.com/example/fork")
+        assert find_stale_skills(moved, "abc123", skills_dir) == ["my-skill"]
+        repathed = _make_source(path="other")
+        assert find_stale_skills(repathed, "abc123", skills_dir) == ["my-skill"]
+
     @respx.mock
     def test_overwrites_stale_skills(self, tmp_path: Path) -> None:
         """Stale skills are deleted and re-extracted without warning."""
@@ -263,11 +354,265 @@ class TestSync:
 
     @respx.mock
     def test_github_auth_header(self) -> None:
-        """Test that GITHUB_TOKEN is included in requests."""
+        """Test that GITHUB_TOKEN is included in GitHub requests."""
+        route = respx.get(
+            "https://api.github.com/repos/example/repo/commits/main"
+        ).mock(return_value=httpx.Response(200, json={"sha": "abc123"}))
         with patch.dict("os.environ", {"GITHUB_TOKEN": "test-token"}):
-            client = _make_client()
-            assert "Bearer test-token" in client.headers.get("authorization", "")
-            client.close()
+            with _make_client() as client:
+                resolve_sha(client, _make_source())
+        assert route.calls[0].request.headers["authorization"] == "Bearer test-token"
+
+
+FULL_SHA = "a" * 40
+TREES_URL = (
+    f"https://api.github.com/repos/example/repo/git/trees/{FULL_SHA}?recursive=1"
+)
+
+
+def _tree(*paths: str, truncated: bool = False) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "truncated": truncated,
+            "tree": [{"path": path, "type": "blob"} for path in paths],
+        },
+    )
+
+
+class TestExtractTarball:
+    def test_root_path_and_nested_files(self, tmp_path: Path) -> None:
+        archive = tmp_path / "repo.tar.gz"
+        archive.write_bytes(
+            _make_tarball(
+                {
+                    "my-skill/SKILL.md": "# Skill",
+                    "my-skill/references/deep/doc.md": "doc",
+                    "other-skill/SKILL.md": "# Other",
+                    "README.md": "readme",
+                }
+            )
+        )
+        source = _make_source(path=".", skills=["my-skill", "missing-skill"])
+
+        extracted = extract_tarball(
+            archive, source, tmp_path / "skills", BlobStore(tmp_path / "blobs")
+        )
+
+        assert extracted == [tmp_path / "skills" / "my-skill"]
+        skill = tmp_path / "skills" / "my-skill"
+        assert (skill / "references" / "deep" / "doc.md").read_text() == "doc"
+        assert not (tmp_path / "skills" / "other-skill").exists()
+        assert not (tmp_path / "skills" / "missing-skill").exists()
+
+    @pytest.mark.parametrize("indexed", [False, True])
+    def test_keeps_exec_bit_and_writes_independent_files(
+        self, tmp_path: Path, indexed: bool
+    ) -> None:
+        gz = tmp_path / "repo.tar.gz"
+        gz.write_bytes(
+            _make_tarball(
+                {"my-skill/run.sh": "#!/bin/sh\n", "my-skill/SKILL.md": "# Skill"},
+                executable=frozenset({"my-skill/run.sh"}),
+            )
+        )
+        archive = gz
+        if indexed:
+            archive = tmp_path / "repo.tar"
+            store_gzip_tarball(gz, archive)
+        source = _make_source(path=".", skills=["my-skill"])
+
+        extract_tarball(
+            archive, source, tmp_path / "skills", BlobStore(tmp_path / "blobs")
+        )
+
+        script = tmp_path / "skills" / "my-skill" / "run.sh"
+        doc = tmp_path / "skills" / "my-skill" / "SKILL.md"
+        assert os.access(script, os.X_OK)
+        assert not os.access(doc, os.X_OK)
+        for path in (script, doc):
+            assert os.access(path, os.W_OK)
+            assert path.stat().st_nlink == 1
+
+
+class TestSyncReport:
+    @respx.mock
+    def test_report_fields(self, tmp_path: Path) -> None:
+        source = _make_source(path="skills")
+        manifest = Manifest(sources=[source], root=tmp_path)
+        respx.get("https://api.github.com/repos/example/repo/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": "abc123"})
+        )
+        respx.get("https://api.github.com/repos/example/repo/tarball/abc123").mock(
+            return_value=httpx.Response(
+                200, content=_make_tarball({"skills/my-skill/SKILL.md": "12345"})
+            )
+        )
+
+        report = sync_report(manifest)
+
+        (entry,) = report.sources
+        assert entry.status == "synced"
+        assert entry.old_sha is None
+        assert entry.new_sha == "abc123"
+        assert entry.skills == ["my-skill"]
+        assert entry.bytes >= 5
+        assert report.changed == [entry]
+
+        again = sync_report(manifest, SyncOptions(dry_run=True))
+        assert again.sources[0].status == "up-to-date"
+        assert again.changed == []
+
+    @respx.mock
+    def test_sync_async_runs_manifests_concurrently(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        respx.get("https://api.github.com/repos/example/repo/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": "abc123"})
+        )
+        respx.get("https://api.github.com/repos/example/repo/tarball/abc123").mock(
+            return_value=httpx.Response(
+                200, content=_make_tarball({"skills/my-skill/SKILL.md": "# A"})
+            )
+        )
+        manifests = [
+            Manifest(sources=[_make_source(path="skills")], root=tmp_path / name)
+            for name in ("a", "b")
+        ]
+        for manifest in manifests:
+            manifest.root.mkdir()
+
+        async def run() -> list[SyncReport]:
+            return await asyncio.gather(*(sync_async(m) for m in manifests))
+
+        reports = asyncio.run(run())
+
+        assert [r.root for r in reports] == [m.root for m in manifests]
+        assert all(r.sources[0].status == "synced" for r in reports)
+        assert capsys.readouterr().out == ""
+
+    def test_library_api_is_exported_lazily(self) -> None:
+        import skill_quiver
+
+        assert set(skill_quiver.__all__) == {"__version__", *skill_quiver._LAZY}
+        assert skill_quiver.SyncReport is SyncReport
+
+
+class TestExpandSource:
+    def test_literal_source_unchanged(self) -> None:
+        source = _make_source(skills=["my-skill"])
+        with _make_client() as client:
+            assert expand_source(client, source, FULL_SHA) is source
+
+    @respx.mock
+    def test_glob_expanded_from_tree(self) -> None:
+        source = _make_source(skills=["*"], exclude_skills=["legacy-*"])
+        respx.get(TREES_URL).mock(
+            return_value=_tree(
+                "README.md",
+                "skills/pdf-tool/SKILL.md",
+                "skills/pdf-tool/scripts/run.py",
+                "skills/csv-tool/SKILL.md",
+                "skills/legacy-tool/SKILL.md",
+                "skills/not-a-skill/notes.md",
+                "skills/nested/deeper/SKILL.md",
+                "other/elsewhere/SKILL.md",
+            )
+        )
+        with _make_client() as client:
+            expanded = expand_source(client, source, FULL_SHA)
+        assert expanded.skills == ["csv-tool", "pdf-tool"]
+        assert not expanded.is_wildcard
+
+    @respx.mock
+    def test_listing_cached_per_commit(self) -> None:
+        source = _make_source(skills=["pdf-*"])
+        route = respx.get(TREES_URL).mock(
+            return_value=_tree("skills/pdf-tool/SKILL.md", "skills/csv/SKILL.md")
+        )
+        with _make_client() as client:
+            first = expand_source(client, source, FULL_SHA)
+            second = expand_source(client, source, FULL_SHA)
+        assert first.skills == second.skills == ["pdf-tool"]
+        assert route.call_count == 1
+
+    @respx.mock
+    def test_truncated_tree_falls_back_to_contents(self) -> None:
+        source = _make_source(skills=["*"])
+        respx.get(TREES_URL).mock(return_value=_tree(truncated=True))
+        respx.get(
+            f"https://api.github.com/repos/example/repo/contents/skills?ref={FULL_SHA}"
+        ).mock(
+            return_value=httpx.Response(
+                200,
+                json=[
+                    {"name": "pdf-tool", "type": "dir"},
+                    {"name": "README.md", "type": "file"},
+                ],
+            )
+        )
+        with _make_client() as client:
+            assert expand_source(client, source, FULL_SHA).skills == ["pdf-tool"]
+
+    @respx.mock
+    def test_no_matches(self) -> None:
+        source = _make_source(skills=["pdf-*"])
+        respx.get(TREES_URL).mock(return_value=_tree("skills/csv/SKILL.md"))
+        with _make_client() as client, pytest.raises(SyncError, match="No skills"):
+            expand_source(client, source, FULL_SHA)
+
+    @respx.mock
+    def test_sync_wildcard_source(self, tmp_path: Path) -> None:
+        source = _make_source(skills=["*"])
+        manifest = Manifest(sources=[source], root=tmp_path)
+        respx.get("https://api.github.com/repos/example/repo/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": FULL_SHA})
+        )
+        respx.get(TREES_URL).mock(
+            return_value=_tree("skills/skill-a/SKILL.md", "skills/skill-b/SKILL.md")
+        )
+        respx.get(f"https://api.github.com/repos/example/repo/tarball/{FULL_SHA}").mock(
+            return_value=httpx.Response(
+                200,
+                content=_make_tarball(
+                    {
+                        "skills/skill-a/SKILL.md": "# a",
+                        "skills/skill-b/SKILL.md": "# b",
+                    }
+                ),
+            )
+        )
+
+        sync(manifest)
+
+        assert (tmp_path / "skills" / "skill-a" / ".source.kdl").is_file()
+        assert (tmp_path / "skills" / "skill-b" / ".source.kdl").is_file()
+        content = (tmp_path / "THIRD_PARTY_LICENSES").read_text(encoding="utf-8")
+        assert "  - skill-a" in content
+        assert "  - skill-b" in content
+        assert "  - *" not in content
+
+    @respx.mock
+    def test_glob_colliding_with_literal_fails_before_writing(
+        self, tmp_path: Path
+    ) -> None:
+        literal = _make_source(
+            name="one", repo="https://github.com/example/other", skills=["skill-a"]
+        )
+        wildcard = _make_source(name="two", skills=["*"])
+        manifest = Manifest(sources=[literal, wildcard], root=tmp_path)
+        respx.get("https://api.github.com/repos/example/repo/commits/main").mock(
+            return_value=httpx.Response(200, json={"sha": FULL_SHA})
+        )
+        respx.get(TREES_URL).mock(
+            return_value=_tree("skills/skill-a/SKILL.md", "skills/skill-b/SKILL.md")
+        )
+
+        with pytest.raises(
+            ManifestError, match="'skill-a' is provided by both 'one' and 'two'"
+        ):
+            sync(manifest)
+        assert not (tmp_path / "skills" / "skill-a").exists()
 
 
 class TestGenerateLicenseFile:
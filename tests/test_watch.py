@@ -0,0 +1,152 @@
+"""Tests for watch mode."""
+
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.errors import ManifestError
+from skill_quiver.sync import _make_client
+from skill_quiver.watch import Watcher
+from tests.conftest import make_tarball
+
+COMMITS_URL = "https://api.github.com/repos/example/repo/commits/main"
+
+MANIFEST = """\
+source {
+    name "test-source"
+    repo "https://github.com/example/repo"
+    path "skills"
+    skill "my-skill"
+}
+"""
+
+
+@pytest.fixture
+def manifest_path(tmp_path: Path) -> Path:
+    path = tmp_path / "skills.kdl"
+    path.write_text(MANIFEST, encoding="utf-8")
+    return path
+
+
+class TestLoadManifest:
+    def test_initial_load(self, manifest_path: Path) -> None:
+        watcher = Watcher(manifest_path)
+        assert watcher.load_manifest() is True
+        assert watcher.manifest is not None
+        assert watcher.provenance == {"my-skill": None}
+
+    def test_unchanged_content_not_reloaded(self, manifest_path: Path) -> None:
+        watcher = Watcher(manifest_path)
+        watcher.load_manifest()
+        manifest_path.write_text(MANIFEST, encoding="utf-8")
+        assert watcher.load_manifest() is False
+
+    def test_picks_up_edits(self, manifest_path: Path) -> None:
+        watcher = Watcher(manifest_path)
+        watcher.load_manifest()
+        manifest_path.write_text(
+            MANIFEST.replace('skill "my-skill"', 'skill "my-skill"\n    skill "new"'),
+            encoding="utf-8",
+        )
+        assert watcher.load_manifest() is True
+        assert set(watcher.provenance) == {"my-skill", "new"}
+
+    def test_picks_up_fragment_edits(self, manifest_path: Path) -> None:
+        teams = manifest_path.parent / "teams"
+        teams.mkdir()
+        fragment = teams / "ops.kdl"
+        fragment.write_text(
+            MANIFEST.replace("test-source", "ops").replace("my-skill", "ops-skill"),
+            encoding="utf-8",
+        )
+        manifest_path.write_text(MANIFEST + 'include "teams/*.kdl"\n', encoding="utf-8")
+        watcher = Watcher(manifest_path)
+        watcher.load_manifest()
+        assert set(watcher.provenance) == {"my-skill", "ops-skill"}
+
+        fragment.write_text(
+            MANIFEST.replace("test-source", "ops").replace("my-skill", "ops-two"),
+            encoding="utf-8",
+        )
+        assert watcher.load_manifest() is True
+        assert set(watcher.provenance) == {"my-skill", "ops-two"}
+
+    def test_invalid_edit_keeps_previous(
+        self, manifest_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        watcher = Watcher(manifest_path)
+        watcher.load_manifest()
+        previous = watcher.manifest
+        manifest_path.write_text("{{{ not kdl", encoding="utf-8")
+        assert watcher.load_manifest() is False
+        assert watcher.manifest is previous
+        assert "Invalid KDL syntax" in capsys.readouterr().err
+
+    def test_invalid_initial_manifest_raises(self, manifest_path: Path) -> None:
+        manifest_path.write_text("{{{ not kdl", encoding="utf-8")
+        with pytest.raises(ManifestError):
+            Watcher(manifest_path).load_manifest()
+
+
+class TestTick:
+    @respx.mock
+    def test_resyncs_only_when_upstream_moves(self, manifest_path: Path) -> None:
+        commits = respx.get(COMMITS_URL)
+        commits.side_effect = [
+            httpx.Response(200, json={"sha": "sha1"}, headers={"ETag": '"e1"'}),
+            httpx.Response(304),
+            httpx.Response(200, json={"sha": "sha2"}, headers={"ETag": '"e2"'}),
+        ]
+        tarball = make_tarball({"skills/my-skill/SKILL.md": "# v"})
+        tar1 = respx.get("https://api.github.com/repos/example/repo/tarball/sha1").mock(
+            return_value=httpx.Response(200, content=tarball)
+        )
+        tar2 = respx.get("https://api.github.com/repos/example/repo/tarball/sha2").mock(
+            return_value=httpx.Response(200, content=tarball)
+        )
+
+        watcher = Watcher(manifest_path)
+        watcher.load_manifest()
+        with _make_client() as client:
+            assert watcher.tick(client) == 1
+            assert watcher.tick(client) == 0
+            assert watcher.tick(client) == 1
+
+        assert tar1.call_count == 1
+        assert tar2.call_count == 1
+        # The poll after the first sync was conditional
+        assert commits.calls[1].request.headers["If-None-Match"] == '"e1"'
+        assert watcher.provenance["my-skill"] is not None
+        assert watcher.provenance["my-skill"].sha == "sha2"
+        assert (manifest_path.parent / "THIRD_PARTY_LICENSES").is_file()
+
+    @respx.mock
+    def test_source_error_does_not_stop_tick(
+        self, manifest_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        respx.get(COMMITS_URL).mock(return_value=httpx.Response(500))
+
+        watcher = Watcher(manifest_path)
+        watcher.load_manifest()
+        with _make_client() as client:
+            assert watcher.tick(client) == 0
+        assert "test-source" in capsys.readouterr().err
+
+
+class TestManifestPolling:
+    def test_poll_signals_change(self, manifest_path: Path) -> None:
+        watcher = Watcher(manifest_path)
+        watcher.load_manifest()
+        thread = threading.Thread(
+            target=watcher._poll_manifest, kwargs={"poll_interval": 0.01}
+        )
+        thread.start()
+        try:
+            manifest_path.write_text(MANIFEST + "\n// edited\n", encoding="utf-8")
+            assert watcher._changed.wait(timeout=5)
+        finally:
+            watcher.stop()
+            thread.join(timeout=5)
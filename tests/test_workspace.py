@@ -0,0 +1,148 @@
+"""Tests for workspace mode."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from skill_quiver.errors import ManifestError, QuivError
+from skill_quiver.workspace import (
+    discover_manifests,
+    load_workspace,
+    read_workspace_file,
+    sync_workspace,
+)
+from tests.conftest import make_tarball
+
+COMMITS_URL = "https://api.github.com/repos/example/repo/commits/main"
+TARBALL_URL = "https://api.github.com/repos/example/repo/tarball/abc123"
+
+
+def _write_manifest(project: Path, *skills: str) -> Path:
+    project.mkdir(parents=True, exist_ok=True)
+    skill_lines = "\n".join(f'    skill "{skill}"' for skill in skills)
+    path = project / "skills.kdl"
+    path.write_text(
+        f"""\
+source {{
+    name "shared-source"
+    repo "https://github.com/example/repo"
+    path "skills"
+{skill_lines}
+}}
+""",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestDiscoverManifests:
+    def test_finds_nested_manifests(self, tmp_path: Path) -> None:
+        a = _write_manifest(tmp_path / "team-a", "skill-a")
+        b = _write_manifest(tmp_path / "nested" / "team-b", "skill-b")
+        assert discover_manifests(tmp_path) == sorted([a, b])
+
+    def test_skips_output_and_hidden_dirs(self, tmp_path: Path) -> None:
+        _write_manifest(tmp_path / "skills" / "vendored", "x")
+        _write_manifest(tmp_path / ".git" / "hidden", "x")
+        _write_manifest(tmp_path / "node_modules" / "pkg", "x")
+        assert discover_manifests(tmp_path) == []
+
+
+class TestWorkspaceFile:
+    def test_reads_dirs_and_files(self, tmp_path: Path) -> None:
+        a = _write_manifest(tmp_path / "team-a", "skill-a")
+        b = _write_manifest(tmp_path / "team-b", "skill-b")
+        workspace = tmp_path / "quiv-workspace.kdl"
+        workspace.write_text(
+            'manifest "team-b/skills.kdl"\nmanifest "team-a"\n', encoding="utf-8"
+        )
+        assert read_workspace_file(workspace) == [b.resolve(), a.resolve()]
+
+    def test_missing_manifest(self, tmp_path: Path) -> None:
+        workspace = tmp_path / "quiv-workspace.kdl"
+        workspace.write_text('manifest "nope"\n', encoding="utf-8")
+        with pytest.raises(ManifestError, match="not found"):
+            read_workspace_file(workspace)
+
+    def test_workspace_file_overrides_discovery(self, tmp_path: Path) -> None:
+        _write_manifest(tmp_path / "team-a", "skill-a")
+        _write_manifest(tmp_path / "team-b", "skill-b")
+        (tmp_path / "quiv-workspace.kdl").write_text(
+            'manifest "team-a"\n', encoding="utf-8"
+        )
+        manifests = load_workspace(tmp_path)
+        assert [m.root.name for m in manifests] == ["team-a"]
+
+    def test_empty_workspace(self, tmp_path: Path) -> None:
+        with pytest.raises(QuivError, match="No skills.kdl manifests"):
+            load_workspace(tmp_path)
+
+
+class TestSyncWorkspace:
+    @respx.mock
+    def test_shared_upstream_fetched_once(self, tmp_path: Path) -> None:
+        _write_manifest(tmp_path / "team-a", "skill-a")
+        _write_manifest(tmp_path / "team-b", "skill-a", "skill-b")
+
+        commits = respx.get(COMMITS_URL).mock(
+            return_value=httpx.Response(200, json={"sha": "abc123"})
+        )
+        tarball = respx.get(TARBALL_URL).mock(
+            return_value=httpx.Response(
+                200,
+                content=make_tarball(
+                    {
+                        "skills/skill-a/SKILL.md": "# a",
+                        "skills/skill-b/SKILL.md": "# b",
+                    }
+                ),
+            )
+        )
+
+        sync_workspace(tmp_path, load_workspace(tmp_path))
+
+        assert commits.call_count == 1
+        assert tarball.call_count == 1
+        assert (tmp_path / "team-a" / "skills" / "skill-a" / "SKILL.md").is_file()
+        assert not (tmp_path / "team-a" / "skills" / "skill-b").exists()
+        assert (tmp_path / "team-b" / "skills" / "skill-b" / ".source.kdl").is_file()
+        for team in ("team-a", "team-b"):
+            assert (tmp_path / team / "THIRD_PARTY_LICENSES").is_file()
+
+    @respx.mock
+    def test_dry_run(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        _write_manifest(tmp_path / "team-a", "skill-a")
+        respx.get(COMMITS_URL).mock(
+            return_value=httpx.Response(200, json={"sha": "abc123"})
+        )
+
+        sync_workspace(tmp_path, load_workspace(tmp_path), dry_run=True)
+
+        assert "team-a: shared-source: none -> abc123" in capsys.readouterr().out
+        assert not (tmp_path / "team-a" / "skills").exists()
+        assert len(respx.calls) == 1
+
+    def test_local_sources_sharing_a_directory(self, tmp_path: Path) -> None:
+        upstream = tmp_path / "up"
+        for sub in ("a", "b"):
+            (upstream / sub / f"skill-{sub}").mkdir(parents=True)
+            (upstream / sub / f"skill-{sub}" / "SKILL.md").write_text(
+                f"# {sub}", encoding="utf-8"
+            )
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "skills.kdl").write_text(
+            "".join(
+                f'source {{\n    name "src-{sub}"\n    repo "../up"\n'
+                f'    path "{sub}"\n    skill "skill-{sub}"\n}}\n'
+                for sub in ("a", "b")
+            ),
+            encoding="utf-8",
+        )
+        sync_workspace(tmp_path, load_workspace(tmp_path))
+
+        (upstream / "b" / "skill-b" / "SKILL.md").write_text("# b2", encoding="utf-8")
+        sync_workspace(tmp_path, load_workspace(tmp_path))
+        assert (project / "skills" / "skill-b" / "SKILL.md").read_text() == "# b2"
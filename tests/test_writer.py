@@ -0,0 +1,98 @@
+"""Tests for the parallel skill writer."""
+
+from pathlib import Path
+
+import pytest
+
+from skill_quiver import writer as writer_module
+from skill_quiver.cache import BlobStore
+from skill_quiver.errors import SyncError
+from skill_quiver.writer import SkillWriter, write_jobs
+
+
+class TestSkillWriter:
+    def test_writes_nested_files(self, tmp_path: Path) -> None:
+        store = BlobStore(tmp_path / "blobs")
+        skill = tmp_path / "skills" / "pdf"
+        with SkillWriter(store, jobs=4) as writer:
+            for i in range(50):
+                writer.write_bytes(skill, f"refs/doc-{i}.md", f"doc {i}".encode())
+            writer.write_bytes(skill, "SKILL.md", b"# pdf")
+
+        assert (skill / "SKILL.md").read_bytes() == b"# pdf"
+        assert (skill / "refs" / "doc-49.md").read_text() == "doc 49"
+        assert writer.skill_dirs == [skill]
+
+    def test_hands_files_to_the_pool_in_batches(self, tmp_path: Path) -> None:
+        skill = tmp_path / "skills" / "pdf"
+        with SkillWriter(BlobStore(tmp_path / "blobs"), jobs=4) as writer:
+            for i in range(2 * writer_module.BATCH_FILES + 1):
+                writer.write_bytes(skill, f"{i}.md", b"x")
+        assert len(writer._futures) == 3
+
+    def test_single_job_writes_inline(self, tmp_path: Path) -> None:
+        skill = tmp_path / "skills" / "pdf"
+        with SkillWriter(BlobStore(tmp_path / "blobs"), jobs=1) as writer:
+            writer.write_bytes(skill, "SKILL.md", b"# pdf")
+            assert (skill / "SKILL.md").read_bytes() == b"# pdf"
+        assert writer._pool is None
+
+    def test_copy_file(self, tmp_path: Path) -> None:
+        src = tmp_path / "src.txt"
+        src.write_bytes(b"copied")
+        skill = tmp_path / "skills" / "pdf"
+        with SkillWriter(BlobStore(tmp_path / "blobs")) as writer:
+            writer.copy_file(skill, "a/b.txt", src)
+        assert (skill / "a" / "b.txt").read_bytes() == b"copied"
+
+    @pytest.mark.parametrize("jobs", [1, 4])
+    def test_errors_surface_by_close(self, tmp_path: Path, jobs: int) -> None:
+        blocker = tmp_path / "skills" / "pdf" / "SKILL.md"
+        blocker.parent.mkdir(parents=True)
+        blocker.mkdir()  # a directory where the file should go
+        writer = SkillWriter(BlobStore(tmp_path / "blobs"), jobs=jobs)
+        with pytest.raises(SyncError):
+            writer.write_bytes(blocker.parent, "SKILL.md", b"x")
+            writer.close()
+
+    @pytest.mark.parametrize("jobs", [1, 4])
+    def test_durable_flushes_each_skill_in_one_pass_on_close(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: int
+    ) -> None:
+        flushed: list[Path] = []
+        monkeypatch.setattr(
+            writer_module, "fsync_path", lambda path: flushed.append(Path(path))
+        )
+        store = BlobStore(tmp_path / "blobs")
+        skills_dir = tmp_path / "skills"
+        with SkillWriter(store, jobs=jobs, durable=True) as writer:
+            for skill in ("a", "b"):
+                for i in range(5):
+                    writer.write_bytes(skills_dir / skill, f"sub/{i}.txt", b"x")
+            assert flushed == []
+
+        expected = []
+        for s in "ab":
+            expected += [skills_dir / s / "sub" / f"{i}.txt" for i in range(5)]
+            expected += [skills_dir / s, skills_dir / s / "sub"]
+        assert flushed == [*expected, skills_dir]
+
+    def test_durable_from_env(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("QUIV_DURABLE", "1")
+        writer = SkillWriter(BlobStore(tmp_path / "blobs"))
+        writer.close()
+        assert writer.durable
+
+
+class TestWriteJobs:
+    def test_env_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("QUIV_WRITE_JOBS", "3")
+        assert write_jobs() == 3
+
+    @pytest.mark.parametrize("value", ["0", "many"])
+    def test_invalid(self, value: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("QUIV_WRITE_JOBS", value)
+        with pytest.raises(SyncError, match="QUIV_WRITE_JOBS"):
+            write_jobs()